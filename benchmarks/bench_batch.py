@@ -0,0 +1,59 @@
+"""Finds the batch size where rebuilding beats per-key updates for AvlTree.insert_many/delete_many/contains_many.
+
+Usage:
+    python benchmarks/bench_batch.py [--n 100000] [--fractions 0.01 0.05 0.1 0.25 0.5 1.0]
+
+Each batch is timed once forced through per-key operations and once forced through the merge and rebuild,
+by overriding BATCH_REBUILD_FRACTION/BATCH_SCAN_FRACTION on the tree instance.
+The crossover is the smallest batch fraction where the "rebuild" column wins. The class defaults
+in AvlTree are set from this.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+
+PER_KEY = float("inf")
+REBUILD = 0.0
+
+
+def timed(n: int, mode: float, operation: str, batch: list[int]) -> float:
+    # Even keys are in the tree, the batches mix hits and misses
+    tree = AvlTree.from_sorted(range(0, 2 * n, 2))
+    tree.BATCH_REBUILD_FRACTION = mode
+    tree.BATCH_SCAN_FRACTION = mode
+    method = getattr(tree, operation)
+    start = time.perf_counter()
+    method(batch)
+    return time.perf_counter() - start
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument(
+        "--fractions", type=float, nargs="+", default=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    print(f"{'operation':<16}{'batch/n':>8}{'per-key ms':>12}{'rebuild ms':>12}")
+    for operation in ("insert_many", "delete_many", "contains_many"):
+        for fraction in options.fractions:
+            size = max(1, int(fraction * options.n))
+            batch = [rng.randrange(2 * options.n) for _ in range(size)]
+            per_key = timed(options.n, PER_KEY, operation, batch)
+            rebuild = timed(options.n, REBUILD, operation, batch)
+            print(
+                f"{operation:<16}{fraction:>8}{per_key * 1000:>12.1f}{rebuild * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,90 @@
+"""Memory per key, lookup and update latency, and scan throughput of BPlusTree against AvlTree.
+
+Usage:
+    python benchmarks/bench_bplustree.py [--n 1000000] [--orders 16 64 256] [--lookups 200000]
+
+Every tree is bulk built from the same --n random int keys. Memory is what tracemalloc sees the build
+allocate, minus the keys themselves, which every tree shares. Lookups are random, about half of them
+misses. "update" is an insert of one of the missed keys followed by its delete. "scan" is full iteration, and "range"
+is irange() over --range-size consecutive keys from a random start.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from bplustree import BPlusTree  # noqa: E402
+
+
+def timed_s(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--ranges", type=int, default=2000)
+    parser.add_argument("--range-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = sorted(rng.sample(range(2 * options.n), options.n))
+    queries = [rng.randrange(2 * options.n) for _ in range(options.lookups)]
+    stored = set(keys)
+    fresh = [query for query in queries if query not in stored]
+    starts = [rng.choice(keys) for _ in range(options.ranges)]
+    builds = {"AvlTree": lambda: AvlTree.from_sorted(keys)}
+    for order in options.orders:
+        builds[f"BPlusTree {order}"] = lambda order=order: BPlusTree.from_sorted(
+            keys, order
+        )
+    print(
+        f"{'tree':<16}{'bytes/key':>10}{'lookup us':>11}{'update us':>11}{'scan M/s':>10}{'range M/s':>11}"
+    )
+    for name, build in builds.items():
+        tracemalloc.start()
+        tree = build()
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        search, insert, delete, irange = (
+            tree.search,
+            tree.insert,
+            tree.delete,
+            tree.irange,
+        )
+        lookup_s = timed_s(lambda: [search(query) for query in queries])
+
+        def update():
+            for key in fresh:
+                insert(key)
+                delete(key)
+
+        update_s = timed_s(update) * options.lookups / len(fresh)
+        scan_s = timed_s(lambda: sum(1 for _ in tree))
+        # The keys are about every other integer, so a range twice --range-size wide holds about --range-size
+        range_hi = options.range_size * 2
+        scanned = []
+        range_s = timed_s(
+            lambda: scanned.extend(
+                sum(1 for _ in irange(lo, lo + range_hi)) for lo in starts
+            )
+        )
+        print(
+            f"{name:<16}{allocated / options.n:>10.1f}{lookup_s / options.lookups * 1e6:>11.3f}"
+            f"{update_s / options.lookups * 1e6:>11.3f}{options.n / scan_s / 1e6:>10.2f}"
+            f"{sum(scanned) / range_s / 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,115 @@
+"""Throughput of a shared tree across thread counts: one global lock, ConcurrentAvlTree and StripedConcurrentTree.
+
+Usage:
+    python benchmarks/bench_concurrent.py [--n 200000] [--ops 200000] [--threads 1 2 4 8] [--reads 0.9]
+
+Every thread runs its share of --ops operations on the same tree of --n keys: searches with
+probability --reads, and otherwise an insert or delete of a random key. "global lock" is an AvlTree
+behind a single threading.Lock, which is what sharing a tree took before. The output says whether the
+GIL was enabled. On a free threaded build (python3.13t) the readers of the RWLock run in parallel; with
+the GIL they only overlap their lock handoffs, so expect the ops/sec to stay flat or drop as threads are
+added there. "avg batch" is how many queued writes each write lock acquisition applied on average.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from concurrent_tree import ConcurrentAvlTree, StripedConcurrentTree  # noqa: E402
+
+
+class GlobalLockTree:
+    def __init__(self, tree: AvlTree):
+        self.tree = tree
+        self.lock = threading.Lock()
+
+    def search(self, val: int) -> bool:
+        with self.lock:
+            return self.tree.search(val)
+
+    def insert(self, val: int) -> None:
+        with self.lock:
+            self.tree.insert(val)
+
+    def delete(self, val: int) -> None:
+        with self.lock:
+            self.tree.delete(val)
+
+
+def worker(tree, operations: list[tuple[int, int]], start: threading.Barrier) -> None:
+    search, insert, delete = tree.search, tree.insert, tree.delete
+    start.wait()
+    for kind, key in operations:
+        if kind == 0:
+            search(key)
+        elif kind == 1:
+            insert(key)
+        else:
+            delete(key)
+
+
+def run(tree, threads: int, operations: list[tuple[int, int]]) -> float:
+    start = threading.Barrier(threads + 1)
+    share = len(operations) // threads
+    pool = [
+        threading.Thread(
+            target=worker, args=(tree, operations[i * share : (i + 1) * share], start)
+        )
+        for i in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return share * threads / (time.perf_counter() - began)
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--reads", type=float, default=0.9)
+    parser.add_argument("--stripes", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = list(range(0, 2 * options.n, 2))
+    operations = [
+        (
+            0 if rng.random() < options.reads else rng.choice((1, 2)),
+            rng.randrange(2 * options.n),
+        )
+        for _ in range(options.ops)
+    ]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'tree':<16}{'threads':>8}{'ops/sec':>12}{'avg batch':>11}")
+    for threads in options.threads:
+        trees = {
+            "global lock": GlobalLockTree(AvlTree.from_sorted(keys)),
+            "rwlock": ConcurrentAvlTree.from_sorted(keys),
+            "striped": StripedConcurrentTree.from_sorted(keys, options.stripes),
+        }
+        for name, tree in trees.items():
+            throughput = run(tree, threads, operations)
+            stripes = [tree] if name == "rwlock" else getattr(tree, "stripes", [])
+            batches = sum(stripe.batches for stripe in stripes)
+            batch = (
+                f"{sum(stripe.batched_operations for stripe in stripes) / batches:.2f}"
+                if batches
+                else "-"
+            )
+            print(f"{name:<16}{threads:>8}{throughput:>12.0f}{batch:>11}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,82 @@
+"""Import time of the tree modules and the cost of creating many small trees.
+
+Usage:
+    python benchmarks/bench_construction.py [--trees 100000] [--imports 10]
+
+Import time is measured in fresh interpreters and reported on top of a bare `python -c pass`.
+The "eager" row builds a PrettyPrintTree next to every tree, which is what the tree constructors
+used to do, so it shows what lazy construction saves.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from avltree import AvlTree  # noqa: E402
+from rbtree import RedBlackTree  # noqa: E402
+
+
+def interpreter_seconds(code: str, repeat: int) -> float:
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def construction_seconds(make, trees: int) -> float:
+    start = time.perf_counter()
+    for i in range(trees):
+        tree = make()
+        tree.insert(i)
+    return time.perf_counter() - start
+
+
+def make_eager_avl() -> AvlTree:
+    from PrettyPrint import PrettyPrintTree
+
+    tree = AvlTree()
+    tree.printer = PrettyPrintTree(
+        lambda node: node.children(),
+        lambda node: node.val,
+        return_instead_of_print=True,
+    )
+    return tree
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trees", type=int, default=100_000)
+    parser.add_argument(
+        "--imports", type=int, default=10, help="interpreter launches per row"
+    )
+    options = parser.parse_args(args)
+
+    bare = interpreter_seconds("pass", options.imports)
+    print(f"{'import':<28}{'ms over bare python':>20}")
+    for code in ("import avltree", "import rbtree", "import PrettyPrint"):
+        seconds = interpreter_seconds(code, options.imports) - bare
+        print(f"{code:<28}{seconds * 1000:>20.2f}")
+
+    print()
+    print(f"{'construct + 1 insert':<28}{'us per tree':>20}")
+    rows = [
+        ("AvlTree", AvlTree),
+        ("RedBlackTree", RedBlackTree),
+        ("AvlTree + eager printer", make_eager_avl),
+    ]
+    for name, make in rows:
+        seconds = construction_seconds(make, options.trees)
+        print(f"{name:<28}{seconds / options.trees * 1e6:>20.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""sort_file() on a generated file of random numbers, with per phase timings.
+
+Usage:
+    python benchmarks/bench_external_sort.py [--n 10000000] [--dtype q] [--memory-limit-mb 16 64 256]
+
+The input file is written to --dir (a temporary directory by default) and every run sorts it into a
+fresh output file there. A memory limit below the input size forces a merge of several runs.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from external_sort import sort_file  # noqa: E402
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=10_000_000)
+    parser.add_argument("--dtype", default="q", choices=["q", "d"])
+    parser.add_argument(
+        "--memory-limit-mb", type=float, nargs="+", default=[16, 64, 256]
+    )
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    with tempfile.TemporaryDirectory(dir=options.dir) as directory:
+        in_path = os.path.join(directory, "in.bin")
+        out_path = os.path.join(directory, "out.bin")
+        with open(in_path, "wb") as out:
+            for start in range(0, options.n, 1_000_000):
+                count = min(1_000_000, options.n - start)
+                if options.dtype == "q":
+                    array(
+                        "q", (rng.randrange(-(2**63), 2**63) for _ in range(count))
+                    ).tofile(out)
+                else:
+                    array("d", (rng.random() for _ in range(count))).tofile(out)
+        size_mb = os.path.getsize(in_path) / 2**20
+        print(f"input {size_mb:,.0f} MB, {options.n:,} items")
+        print(
+            f"{'limit MB':>10}{'runs':>8}{'runs s':>10}{'merge s':>10}{'total s':>10}{'MB/s':>10}"
+        )
+        for limit_mb in options.memory_limit_mb:
+            start = time.perf_counter()
+            stats = sort_file(in_path, out_path, options.dtype, int(limit_mb * 2**20))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{limit_mb:>10g}{stats.runs:>8}{stats.phase_seconds['runs']:>10.2f}"
+                f"{stats.phase_seconds['merge']:>10.2f}{elapsed:>10.2f}{size_mb / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,79 @@
+"""Overlap and stabbing query latency of IntervalTree against a linear scan.
+
+Usage:
+    python benchmarks/bench_interval.py [--n 200000] [--queries 2000] [--points 20000]
+
+The tree holds --n random intervals with starts spread over [0, 10 * n) and lengths up to --max-length.
+"overlapping" runs --queries random range queries of width --width with IntervalTree.overlapping() and
+with a scan over a plain list of the intervals. "stab" answers --points random points one stab() at a
+time and then with a single stab_many() sweep. Every variant is checked to return the same intervals.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from interval_tree import IntervalTree  # noqa: E402
+
+
+def timed_s(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=20_000)
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--max-length", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    space = 10 * options.n
+    intervals = []
+    for _ in range(options.n):
+        lo = rng.randrange(space)
+        intervals.append((lo, lo + rng.randrange(options.max_length)))
+    build_s, tree = timed_s(lambda: IntervalTree.from_iterable(intervals))
+    intervals = list(tree)
+    ranges = [
+        (lo, lo + options.width)
+        for lo in (rng.randrange(space) for _ in range(options.queries))
+    ]
+    points = [rng.randrange(space) for _ in range(options.points)]
+    print(f"build {len(intervals)} intervals: {build_s:.2f} s")
+    print(f"{'query':<24}{'total s':>10}{'us/query':>11}{'results':>10}")
+
+    def report(name: str, seconds: float, count: int, results: int) -> None:
+        print(f"{name:<24}{seconds:>10.3f}{seconds / count * 1e6:>11.1f}{results:>10}")
+
+    scan_queries = ranges[: max(1, options.queries // 20)]
+    scan_s, scanned = timed_s(
+        lambda: [
+            [val for val in intervals if val[0] <= hi and lo <= val[1]]
+            for lo, hi in scan_queries
+        ]
+    )
+    tree_s, found = timed_s(
+        lambda: [list(tree.overlapping(lo, hi)) for lo, hi in ranges]
+    )
+    assert found[: len(scan_queries)] == scanned
+    report("overlapping: scan", scan_s, len(scan_queries), sum(map(len, scanned)))
+    report("overlapping: tree", tree_s, len(ranges), sum(map(len, found)))
+
+    stab_s, stabbed = timed_s(lambda: [tree.stab(point) for point in points])
+    sweep_s, swept = timed_s(lambda: tree.stab_many(points))
+    assert stabbed == swept
+    report("stab: one at a time", stab_s, len(points), sum(map(len, stabbed)))
+    report("stab: stab_many", sweep_s, len(points), sum(map(len, swept)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+"""Lookups per second of the iterative search against the old recursive closure based search.
+
+Usage:
+    python benchmarks/bench_lookup.py [--sizes 100000 1000000 10000000] [--lookups 200000]
+
+"recursive" is a copy of the search AvlTree and RedBlackTree used to have, which allocated a closure
+per call and recursed once per level. Trees are bulk built, so the large sizes only cost memory.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree, AvlTreeNode  # noqa: E402
+
+
+def recursive_search(tree: AvlTree, val: int) -> bool:
+    def search_from_node(val: int, node: AvlTreeNode | None) -> bool:
+        if node is None:
+            return False
+        elif node.val == val:
+            return True
+        elif val < node.val:
+            return search_from_node(val, node.left)
+        else:
+            return search_from_node(val, node.right)
+
+    return search_from_node(val, tree.root)
+
+
+def lookups_per_second(search, tree: AvlTree, queries: list[int]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(tree, query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    print(f"{'keys':>10}{'recursive/s':>16}{'iterative/s':>16}{'speedup':>10}")
+    for size in options.sizes:
+        # Even keys are stored, so about half of the queries miss
+        tree = AvlTree.from_sorted(range(0, 2 * size, 2))
+        queries = [rng.randrange(2 * size) for _ in range(options.lookups)]
+        before = lookups_per_second(recursive_search, tree, queries)
+        after = lookups_per_second(AvlTree.search, tree, queries)
+        print(f"{size:>10}{before:>16,.0f}{after:>16,.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
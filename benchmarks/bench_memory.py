@@ -0,0 +1,92 @@
+"""Bytes per key for the different tree node layouts.
+
+Usage:
+    python benchmarks/bench_memory.py [--n 200000]
+
+The keys are materialized before tracing starts, so the numbers only cover the structure itself.
+The "dict-node" row is a node class with a per-instance __dict__, which is how AvlTreeNode used
+to be laid out. It is allocated as a bare chain of nodes, as a reference point for the other rows.
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from compact_avltree import CompactAvlTree  # noqa: E402
+from compact_rbtree import CompactRedBlackTree  # noqa: E402
+from rbtree import RedBlackTree  # noqa: E402
+
+
+class DictNode:
+    def __init__(self, val, left=None, right=None):
+        self.left = left
+        self.right = right
+        self.val = val
+        self.height = 1
+
+
+def build_dict_nodes(keys: list[int]) -> object:
+    head = None
+    for key in keys:
+        head = DictNode(key, None, head)
+    return head
+
+
+def build_avl(keys: list[int]) -> object:
+    return AvlTree.from_sorted(keys)
+
+
+def build_compact_avl(keys: list[int]) -> object:
+    tree = CompactAvlTree()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def build_rb(keys: list[int]) -> object:
+    tree = RedBlackTree()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def build_compact_rb(keys: list[int]) -> object:
+    tree = CompactRedBlackTree()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def bytes_per_key(build, keys: list[int]) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    structure = build(keys)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return (after - before) / len(keys)
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000, help="number of keys")
+    options = parser.parse_args(args)
+    keys = list(range(options.n))
+    layouts = [
+        ("dict-node", build_dict_nodes),
+        ("avl-slots", build_avl),
+        ("avl-compact", build_compact_avl),
+        ("rb-slots", build_rb),
+        ("rb-compact", build_compact_rb),
+    ]
+    print(f"{'layout':<16}{'bytes/key':>12}")
+    for name, build in layouts:
+        print(f"{name:<16}{bytes_per_key(build, keys):>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
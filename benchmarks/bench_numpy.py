@@ -0,0 +1,59 @@
+"""The pure python partition, select and sort against the numpy backend on the same numbers.
+
+Usage:
+    python benchmarks/bench_numpy.py [--n 10000000] [--dtype float64]
+
+The list rows run the scalar loops, the ndarray rows the vectorized ones. array.array input takes the
+ndarray paths through a zero copy view. Pass a smaller --n to include the list rows
+in reasonable time; they are skipped above --max-list.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from hoare_partition import hoare_partition_var2  # noqa: E402
+from quickselect import select  # noqa: E402
+from quicksort import quicksort  # noqa: E402
+
+
+def timed_ms(run, nums) -> float:
+    start = time.perf_counter()
+    run(nums)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=10_000_000)
+    parser.add_argument("--dtype", default="float64", choices=["float64", "int64"])
+    parser.add_argument("--max-list", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = np.random.default_rng(options.seed)
+    if options.dtype == "float64":
+        data = rng.random(options.n)
+    else:
+        data = rng.integers(0, 2**62, options.n)
+    n = options.n
+    operations = {
+        "partition": lambda nums: hoare_partition_var2(nums, 0, n - 1, n // 2),
+        "select median": lambda nums: select(nums, n // 2),
+        "sort": quicksort,
+    }
+    print(f"{'operation':<16}{'list ms':>12}{'ndarray ms':>14}")
+    for name, run in operations.items():
+        list_ms = (
+            timed_ms(run, data.tolist()) if n <= options.max_list else float("nan")
+        )
+        ndarray_ms = timed_ms(run, data.copy())
+        print(f"{name:<16}{list_ms:>12.1f}{ndarray_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
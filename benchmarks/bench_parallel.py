@@ -0,0 +1,73 @@
+"""parallel_sort() and parallel_multiselect() scaling with the number of worker processes.
+
+Usage:
+    python benchmarks/bench_parallel.py [--n 2000000] [--workers 1 2 4 8] [--numpy]
+
+By default the input is a list of ints, which the workers sort with the pure python introsort.
+With --numpy it is an int64 ndarray, which the workers sort with numpy's sort. The times include
+starting the pool and copying the values into and out of shared memory.
+The "in process" row runs quicksort() and multiselect() without a pool. Speedups are relative to one
+worker, which pays the same copies, and above the number of cores (os.cpu_count()) are not to be expected.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from parallel_sort import parallel_multiselect, parallel_sort  # noqa: E402
+from quickselect import multiselect  # noqa: E402
+from quicksort import quicksort  # noqa: E402
+
+
+def timed_ms(run, nums) -> float:
+    start = time.perf_counter()
+    run(nums)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--numpy", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    data = [rng.randrange(2**62) for _ in range(options.n)]
+    if options.numpy:
+        import numpy as np
+
+        data = np.array(data, dtype=np.int64)
+    copy = data.copy
+    # 1000 evenly spaced ranks, like a fine grained latency histogram
+    ks = [k * (options.n - 1) // 999 for k in range(1000)]
+    print(
+        f"cpu_count={os.cpu_count()}  n={options.n:,}  input={'ndarray' if options.numpy else 'list'}"
+    )
+    print(
+        f"{'workers':>10}{'sort ms':>12}{'speedup':>10}{'select ms':>12}{'speedup':>10}"
+    )
+    sort_ms = timed_ms(quicksort, copy())
+    select_ms = timed_ms(lambda nums: multiselect(nums, ks), copy())
+    print(f"{'in process':>10}{sort_ms:>12.1f}{'':>10}{select_ms:>12.1f}")
+    base_sort = base_select = None
+    for workers in options.workers:
+        sort_ms = timed_ms(lambda nums: parallel_sort(nums, workers=workers), copy())
+        select_ms = timed_ms(
+            lambda nums: parallel_multiselect(nums, ks, workers=workers), copy()
+        )
+        base_sort = base_sort or sort_ms
+        base_select = base_select or select_ms
+        print(
+            f"{workers:>10}{sort_ms:>12.1f}{base_sort / sort_ms:>10.2f}"
+            f"{select_ms:>12.1f}{base_select / select_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
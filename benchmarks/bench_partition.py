@@ -0,0 +1,117 @@
+"""Swap counts and wall time of the partition schemes as the number of distinct keys varies.
+
+Usage:
+    python benchmarks/bench_partition.py [--n 200000] [--distinct 2 10 100 10000 1000000]
+
+For every number of distinct keys, the first table partitions the whole input once around the same
+pivot with each function in hoare_partition.py, and the second sorts it with each quicksort partition
+scheme. Swaps are counted as element writes / 2 on a list subclass, in a separate run from the timed
+one, so the counting does not skew the times. For the sorts the writes also include insertion sort and
+heapsort moves.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from hoare_partition import (  # noqa: E402
+    dual_pivot_partition,
+    hoare_partition_var1,
+    hoare_partition_var2,
+    partition_3way,
+)
+from quicksort import PARTITION_SCHEMES, quicksort  # noqa: E402
+
+
+class CountingList(list):
+    """A list that counts writes to its elements"""
+
+    writes = 0
+
+    def __setitem__(self, index, value):
+        self.writes += 1
+        super().__setitem__(index, value)
+
+
+PARTITIONS = {
+    "var1": lambda nums, pivot_index, _: hoare_partition_var1(
+        nums, 0, len(nums) - 1, pivot_index
+    ),
+    "var2": lambda nums, pivot_index, _: hoare_partition_var2(
+        nums, 0, len(nums) - 1, pivot_index
+    ),
+    "3way": lambda nums, pivot_index, _: partition_3way(
+        nums, 0, len(nums) - 1, pivot_index
+    ),
+    "dual_pivot": lambda nums, pivot_index, other_index: dual_pivot_partition(
+        nums, 0, len(nums) - 1, pivot_index, other_index
+    ),
+}
+
+
+def measure(run, nums: list[int]) -> tuple[float, float]:
+    """Returns (milliseconds, swaps) of run() on copies of {nums}"""
+    copy = list(nums)
+    start = time.perf_counter()
+    run(copy)
+    elapsed = time.perf_counter() - start
+    counting = CountingList(nums)
+    run(counting)
+    return elapsed * 1000, counting.writes / 2
+
+
+def print_table(title: str, names, rows: dict[int, list[tuple[float, float]]]) -> None:
+    print(title)
+    print(
+        f"{'distinct':>10}"
+        + "".join(f"{name + ' ms':>16}{name + ' swaps':>20}" for name in names)
+    )
+    for distinct, results in rows.items():
+        print(
+            f"{distinct:>10}"
+            + "".join(f"{ms:>16.1f}{swaps:>20,.0f}" for ms, swaps in results)
+        )
+    print()
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument(
+        "--distinct", type=int, nargs="+", default=[2, 10, 100, 10_000, 1_000_000]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    partition_rows = {}
+    sort_rows = {}
+    for distinct in options.distinct:
+        nums = [rng.randrange(distinct) for _ in range(options.n)]
+        # A pivot near the median, and a second one near the 2/3 point for dual_pivot
+        ordered = sorted(range(options.n), key=nums.__getitem__)
+        pivot_index, other_index = ordered[options.n // 2], ordered[2 * options.n // 3]
+        if pivot_index == other_index:
+            other_index = (pivot_index + 1) % options.n
+        partition_rows[distinct] = [
+            measure(
+                lambda copy, partition=partition: partition(
+                    copy, pivot_index, other_index
+                ),
+                nums,
+            )
+            for partition in PARTITIONS.values()
+        ]
+        sort_rows[distinct] = [
+            measure(lambda copy, scheme=scheme: quicksort(copy, partition=scheme), nums)
+            for scheme in PARTITION_SCHEMES
+        ]
+    print_table(f"One partition of n={options.n:,}", PARTITIONS, partition_rows)
+    print_table(f"quicksort of n={options.n:,}", PARTITION_SCHEMES, sort_rows)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
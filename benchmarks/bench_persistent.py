@@ -0,0 +1,94 @@
+"""Snapshot cost and per-update time and allocation of PersistentAvlTree against copy-on-snapshot AvlTree.
+
+Usage:
+    python benchmarks/bench_persistent.py [--n 200000] [--ops 20000] [--every 1000]
+
+"copy on snapshot" updates an AvlTree in place and takes a snapshot by copying it with
+AvlTree.from_sorted(tree), which is the cheapest full copy there is. "persistent" updates a
+PersistentAvlTree by path copying, and its snapshot() is O(1).
+
+Both trees are bulk built from the same --n random keys, then take --ops updates, alternating an
+insert of a new key and a delete of an existing one, with a snapshot every --every updates. The time per
+update includes the snapshots. The allocation per update is measured in a second run on a fresh tree with
+tracemalloc on, which slows everything down: it is the memory still allocated after the first --alloc-ops
+updates with every snapshot kept alive, divided by --alloc-ops. With --every 1 that is exactly what an
+update allocates.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from persistent_avltree import PersistentAvlTree  # noqa: E402
+
+
+def copy_on_snapshot(tree: AvlTree) -> AvlTree:
+    return AvlTree.from_sorted(tree)
+
+
+def persistent_snapshot(tree: PersistentAvlTree) -> PersistentAvlTree:
+    return tree.snapshot()
+
+
+def run(tree, snapshot, updates: list[tuple[bool, int]], every: int) -> list:
+    """
+    Applies {updates} with a snapshot every {every} of them. Returns the snapshots
+    """
+    snapshots = []
+    for i, (insert, key) in enumerate(updates, 1):
+        if insert:
+            tree.insert(key)
+        else:
+            tree.delete(key)
+        if i % every == 0:
+            snapshots.append(snapshot(tree))
+    return snapshots
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--every", type=int, default=1000)
+    parser.add_argument("--alloc-ops", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = rng.sample(range(4 * (options.n + options.ops)), options.n + options.ops)
+    initial, new_keys = sorted(keys[: options.n]), keys[options.n :]
+    deleted = rng.sample(keys[: options.n], options.ops // 2)
+    updates = [
+        (True, new_keys[i // 2]) if i % 2 == 0 else (False, deleted[i // 2])
+        for i in range(options.ops)
+    ]
+    print(f"{'tree':<20}{'snapshot us':>14}{'update us':>12}{'bytes/update':>14}")
+    for name, tree_type, snapshot in (
+        ("copy on snapshot", AvlTree, copy_on_snapshot),
+        ("persistent", PersistentAvlTree, persistent_snapshot),
+    ):
+        tree = tree_type.from_sorted(initial)
+        start = time.perf_counter()
+        snapshot(tree)
+        snapshot_us = (time.perf_counter() - start) * 1e6
+        start = time.perf_counter()
+        run(tree, snapshot, updates, options.every)
+        update_us = (time.perf_counter() - start) / options.ops * 1e6
+        tree = tree_type.from_sorted(initial)
+        tracemalloc.start()
+        snapshots = run(tree, snapshot, updates[: options.alloc_ops], options.every)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del snapshots
+        print(
+            f"{name:<20}{snapshot_us:>14.1f}{update_us:>12.2f}{allocated / options.alloc_ops:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
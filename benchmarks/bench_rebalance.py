@@ -0,0 +1,66 @@
+"""Per-insert and per-delete time of AvlTree with early-exit rebalancing against the full path walk.
+
+Usage:
+    python benchmarks/bench_rebalance.py [--n 1000000] [--ops 200000]
+
+"full path" is a copy of the _rebalance AvlTree used to have, which fixed heights and tried rotations
+on every node up to the root. Both trees are bulk built from the same --n random keys, then take the
+same --ops inserts of new keys followed by --ops deletes of those keys.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree, AvlTreeNode  # noqa: E402
+
+
+class FullPathAvlTree(AvlTree):
+    def _rebalance(self, path: list[AvlTreeNode], size_change: int) -> None:
+        fix_height = self._fix_height
+        apply_rotation = self._apply_rotation
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            fix_height(node)
+            new_node = apply_rotation(node)
+            if new_node is node:
+                continue
+            if i == 0:
+                self.root = new_node
+            else:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = new_node
+                else:
+                    parent.right = new_node
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = rng.sample(range(4 * (options.n + options.ops)), options.n + options.ops)
+    initial, updates = keys[: options.n], keys[options.n :]
+    print(f"{'rebalance':<12}{'insert us':>12}{'delete us':>12}")
+    for name, tree_type in (("full path", FullPathAvlTree), ("early exit", AvlTree)):
+        tree = tree_type.from_iterable(initial)
+        start = time.perf_counter()
+        for key in updates:
+            tree.insert(key)
+        insert_us = (time.perf_counter() - start) / options.ops * 1e6
+        start = time.perf_counter()
+        for key in updates:
+            tree.delete(key)
+        delete_us = (time.perf_counter() - start) / options.ops * 1e6
+        print(f"{name:<12}{insert_us:>12.2f}{delete_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+"""Per-search time of AvlTree against CachedAvlTree under Zipfian lookups.
+
+Usage:
+    python benchmarks/bench_search_cache.py [--n 1000000] [--ops 1000000] [--s 1.1] [--capacity 4096]
+
+The tree holds the keys 0 .. n-1. The lookups are drawn from a Zipf distribution with exponent --s over
+those keys in a random order, so a few thousand hot keys make up most of them. --write-fraction turns
+that share of the operations into an insert or delete of a drawn key, which invalidates its cached result.
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from search_cache import CACHE_POLICIES, CachedAvlTree  # noqa: E402
+
+
+def zipf_keys(n: int, ops: int, s: float, rng: random.Random) -> list[int]:
+    weights = list(accumulate(1 / rank**s for rank in range(1, n + 1)))
+    keys = list(range(n))
+    rng.shuffle(keys)
+    return rng.choices(keys, cum_weights=weights, k=ops)
+
+
+def run(tree: AvlTree, keys: list[int], writes: list[bool]) -> float:
+    search, insert, delete = tree.search, tree.insert, tree.delete
+    start = time.perf_counter()
+    for key, write in zip(keys, writes):
+        if not write:
+            search(key)
+        elif key & 1:
+            delete(key)
+        else:
+            insert(key)
+    return time.perf_counter() - start
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--s", type=float, default=1.1)
+    parser.add_argument("--capacity", type=int, nargs="+", default=[1024, 4096, 16384])
+    parser.add_argument("--write-fraction", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = zipf_keys(options.n, options.ops, options.s, rng)
+    writes = [rng.random() < options.write_fraction for _ in keys]
+    print(f"{'tree':<20}{'us/op':>10}{'hit rate':>10}")
+    plain = AvlTree.from_sorted(range(options.n))
+    print(
+        f"{'AvlTree':<20}{run(plain, keys, writes) / options.ops * 1e6:>10.3f}{'-':>10}"
+    )
+    for policy in CACHE_POLICIES:
+        for capacity in options.capacity:
+            tree = CachedAvlTree(plain.root, capacity, policy)
+            plain.root = None
+            seconds = run(tree, keys, writes)
+            info = tree.cache_info()
+            hit_rate = info.hits / max(1, info.hits + info.misses)
+            print(
+                f"{f'{policy} {capacity}':<20}{seconds / options.ops * 1e6:>10.3f}{hit_rate:>10.1%}"
+            )
+            plain = AvlTree(tree.root)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,59 @@
+"""Latency percentiles by full sort, by one select() per quantile and by a single quantiles() pass.
+
+Usage:
+    python benchmarks/bench_select.py [--n 1000000] [--quantiles 0.5 0.9 0.99 0.999]
+
+The input looks like request latencies: log-normal with a long tail.
+Every row works on a fresh copy of the same input.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from quickselect import quantiles, select  # noqa: E402
+
+
+def by_sorting(nums: list[float], qs: list[float]) -> list[float]:
+    ordered = sorted(nums)
+    return [ordered[int(q * (len(nums) - 1))] for q in qs]
+
+
+def by_select_each(nums: list[float], qs: list[float]) -> list[float]:
+    return [select(nums, int(q * (len(nums) - 1))) for q in qs]
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument(
+        "--quantiles", type=float, nargs="+", default=[0.5, 0.9, 0.99, 0.999]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    latencies = [rng.lognormvariate(0, 1) for _ in range(options.n)]
+    qs = options.quantiles
+
+    expected = None
+    print(f"{'method':<22}{'ms':>10}")
+    for name, method in (
+        ("sorted()", by_sorting),
+        ("select() per quantile", by_select_each),
+        ("quantiles()", quantiles),
+    ):
+        nums = list(latencies)
+        start = time.perf_counter()
+        result = method(nums, qs)
+        elapsed = time.perf_counter() - start
+        expected = expected or result
+        assert result == expected, f"{name} disagrees with sorted()"
+        print(f"{name:<22}{elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
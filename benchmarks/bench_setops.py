@@ -0,0 +1,106 @@
+"""Join based split/union/intersection/difference of AvlTree against re-inserting values one by one.
+
+Usage:
+    python benchmarks/bench_setops.py [--n 200000] [--m 100 1000 10000 100000]
+
+The trees are built before the clock starts, since the join based operations consume them.
+The naive versions are what callers had to write before: walk one tree and insert or delete into the other.
+The join based algorithms are forced for every size, so the crossover where AvlTree.SET_OPERATION_FRACTION
+switches to them can be read off the speedup column.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+
+
+def naive_union(big: AvlTree, small: AvlTree) -> AvlTree:
+    for val in small:
+        big.insert(val)
+    return big
+
+
+def naive_intersection(big: AvlTree, small: AvlTree) -> AvlTree:
+    result = AvlTree()
+    for val in small:
+        if big.search(val):
+            result.insert(val)
+    return result
+
+
+def naive_difference(big: AvlTree, small: AvlTree) -> AvlTree:
+    for val in small:
+        big.delete(val)
+    return big
+
+
+def naive_split(big: AvlTree, val: int) -> tuple[AvlTree, AvlTree]:
+    smaller, larger = AvlTree(), AvlTree()
+    for v in big:
+        if v < val:
+            smaller.insert(v)
+        elif val < v:
+            larger.insert(v)
+    return smaller, larger
+
+
+def timed(operation, *args) -> float:
+    start = time.perf_counter()
+    operation(*args)
+    return time.perf_counter() - start
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--n", type=int, default=200_000, help="size of the larger tree"
+    )
+    parser.add_argument(
+        "--m", type=int, nargs="+", default=[100, 1000, 10_000, 100_000]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    AvlTree.SET_OPERATION_FRACTION = 0.0
+    rng = random.Random(options.seed)
+    n = options.n
+    big_values = sorted(rng.sample(range(4 * n), n))
+
+    print(f"{'operation':<14}{'m':>8}{'join ms':>12}{'naive ms':>12}{'speedup':>10}")
+    for m in options.m:
+        small_values = sorted(rng.sample(range(4 * n), m))
+        rows = [
+            ("union", AvlTree.union, naive_union),
+            ("intersection", AvlTree.intersection, naive_intersection),
+            ("difference", AvlTree.difference, naive_difference),
+        ]
+        for name, join_based, naive in rows:
+            fast = timed(
+                join_based,
+                AvlTree.from_sorted(big_values),
+                AvlTree.from_sorted(small_values),
+            )
+            slow = timed(
+                naive,
+                AvlTree.from_sorted(big_values),
+                AvlTree.from_sorted(small_values),
+            )
+            print(
+                f"{name:<14}{m:>8}{fast * 1000:>12.2f}{slow * 1000:>12.2f}{slow / fast:>9.1f}x"
+            )
+
+    pivot = big_values[n // 3]
+    fast = timed(AvlTree.split, AvlTree.from_sorted(big_values), pivot)
+    slow = timed(naive_split, AvlTree.from_sorted(big_values), pivot)
+    print(
+        f"{'split':<14}{'-':>8}{fast * 1000:>12.2f}{slow * 1000:>12.2f}{slow / fast:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
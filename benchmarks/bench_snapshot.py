@@ -0,0 +1,72 @@
+"""Rebuilding a tree by inserting every key against saving it and loading it back from a snapshot.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--n 1000000]
+
+"insert" builds the tree one key at a time from the keys in random order, which is what a restart
+used to do. "load" is tree_type.load() of a snapshot written by save(), and "pickle" dumps and loads
+the node graph for comparison. --strings uses string keys, which are saved as pickled chunks instead
+of a raw array.
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from rbtree import RedBlackTree  # noqa: E402
+
+
+def timed_s(run) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--strings", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    keys = rng.sample(range(10 * options.n), options.n)
+    if options.strings:
+        keys = [f"key-{key:012}" for key in keys]
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    print(
+        f"{'tree':<8}{'insert s':>10}{'save s':>10}{'load s':>10}{'pickle s':>10}{'unpickle s':>12}{'MiB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tree.bin")
+        for name, tree_type in (("avl", AvlTree), ("rb", RedBlackTree)):
+
+            def insert_all(tree_type=tree_type):
+                tree = tree_type()
+                for key in keys:
+                    tree.insert(key)
+                return tree
+
+            insert_s, tree = timed_s(insert_all)
+            save_s, _ = timed_s(lambda: tree.save(path))
+            load_s, loaded = timed_s(lambda: tree_type.load(path))
+            assert len(loaded) == len(tree)
+            pickle_s, data = timed_s(
+                lambda: pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            unpickle_s, _ = timed_s(lambda: pickle.loads(data))
+            mib = os.path.getsize(path) / 2**20
+            print(
+                f"{name:<8}{insert_s:>10.2f}{save_s:>10.2f}{load_s:>10.2f}{pickle_s:>10.2f}{unpickle_s:>12.2f}{mib:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""quicksort() against sorted() and list.sort() on common input shapes.
+
+Usage:
+    python benchmarks/bench_sort.py [--n 100000] [--repeat 3]
+
+Every row sorts a fresh copy of the same input, and the best of --repeat runs is reported.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from quicksort import quicksort  # noqa: E402
+
+
+def make_inputs(n: int, rng: random.Random) -> dict[str, list[int]]:
+    return {
+        "random": [rng.randrange(n * 10) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "sawtooth": [i % 1000 for i in range(n)],
+        "many-duplicates": [rng.randrange(10) for _ in range(n)],
+    }
+
+
+def best_seconds(
+    sort: Callable[[list[int]], object], nums: list[int], repeat: int
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        copy = list(nums)
+        start = time.perf_counter()
+        sort(copy)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    sorts = {
+        "quicksort": quicksort,
+        "sorted": sorted,
+        "list.sort": list.sort,
+    }
+    print(f"{'input':<18}" + "".join(f"{name + ' ms':>16}" for name in sorts))
+    for name, nums in make_inputs(options.n, random.Random(options.seed)).items():
+        row = [
+            best_seconds(sort, nums, options.repeat) * 1000 for sort in sorts.values()
+        ]
+        print(f"{name:<18}" + "".join(f"{ms:>16.1f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
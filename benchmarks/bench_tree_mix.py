@@ -0,0 +1,75 @@
+"""Throughput of AvlTree against RedBlackTree under write-heavy and read-heavy operation mixes.
+
+Usage:
+    python benchmarks/bench_tree_mix.py [--n 100000] [--ops 200000]
+
+Each tree is first filled with --n random keys, then runs --ops operations drawn from the mix.
+Writes are split evenly between inserts and deletes so the tree size stays roughly constant.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from avltree import AvlTree  # noqa: E402
+from rbtree import RedBlackTree  # noqa: E402
+
+# name -> fraction of operations that are writes
+MIXES = {
+    "write-heavy": 0.9,
+    "balanced": 0.5,
+    "read-heavy": 0.1,
+}
+
+
+def make_operations(
+    rng: random.Random, write_fraction: float, ops: int, key_space: int
+) -> list[tuple[str, int]]:
+    operations = []
+    for _ in range(ops):
+        key = rng.randrange(key_space)
+        if rng.random() < write_fraction:
+            operations.append(("insert" if rng.random() < 0.5 else "delete", key))
+        else:
+            operations.append(("search", key))
+    return operations
+
+
+def run(tree_type, initial: list[int], operations: list[tuple[str, int]]) -> float:
+    tree = tree_type()
+    for key in initial:
+        tree.insert(key)
+    methods = {
+        "insert": tree.insert,
+        "delete": tree.delete,
+        "search": tree.search,
+    }
+    start = time.perf_counter()
+    for name, key in operations:
+        methods[name](key)
+    return len(operations) / (time.perf_counter() - start)
+
+
+def main(args: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000, help="initial number of keys")
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(args)
+    rng = random.Random(options.seed)
+    key_space = 2 * options.n
+    initial = [rng.randrange(key_space) for _ in range(options.n)]
+    print(f"{'mix':<14}{'AvlTree ops/s':>16}{'RedBlackTree ops/s':>20}")
+    for mix, write_fraction in MIXES.items():
+        operations = make_operations(rng, write_fraction, options.ops, key_space)
+        avl = run(AvlTree, initial, operations)
+        rb = run(RedBlackTree, initial, operations)
+        print(f"{mix:<14}{avl:>16,.0f}{rb:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+"""The benchmark suite: every tree operation under every key stream, and partition and sort throughput.
+
+Usage:
+    python benchmarks/suite [--n 20000] [--repeat 3] [--filter avl/] [--output results.json]
+                            [--baseline baseline.json [--threshold 0.25] | --update-baseline baseline.json]
+
+Records ops/sec, p50/p99 latency per operation and peak memory of every case, prints them, and writes
+them as JSON to --output. With --baseline the results are compared to an earlier --output or
+--update-baseline file, and the exit status is 1 if any metric got more than --threshold worse.
+A baseline is only meaningful on the machine and with the --n it was recorded with.
+See workloads.py for the cases and harness.py for the metrics.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from harness import measure, regressions  # noqa: E402
+from workloads import cases  # noqa: E402
+
+
+def main(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks/suite", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--filter", default="", help="Only run the cases whose name contains this"
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--update-baseline", type=Path)
+    options = parser.parse_args(args)
+
+    report = {
+        "meta": {
+            "n": options.n,
+            "seed": options.seed,
+            "repeat": options.repeat,
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {},
+    }
+    print(f"{'case':<34}{'ops/sec':>14}{'p50 ns':>10}{'p99 ns':>10}{'peak KiB':>12}")
+    for name, case in cases(options.n, options.seed).items():
+        if options.filter not in name:
+            continue
+        result = report["results"][name] = measure(case, options.repeat)
+        print(
+            f"{name:<34}{result['ops_per_sec']:>14,.0f}{result['p50_ns']:>10,}"
+            f"{result['p99_ns']:>10,}{result['peak_bytes'] / 1024:>12,.0f}"
+        )
+    for path in (options.output, options.update_baseline):
+        if path is not None:
+            path.write_text(json.dumps(report, indent=2) + "\n")
+    if options.baseline is None:
+        return 0
+    baseline = json.loads(options.baseline.read_text())
+    if baseline["meta"]["n"] != options.n:
+        print(
+            f"The baseline was recorded with --n {baseline['meta']['n']}, not {options.n}",
+            file=sys.stderr,
+        )
+        return 2
+    found = regressions(report["results"], baseline["results"], options.threshold)
+    if found:
+        print(f"\n{len(found)} regressions of more than {options.threshold:.0%}:")
+        print("\n".join(found))
+        return 1
+    print(
+        f"\nNo regressions of more than {options.threshold:.0%} against {options.baseline}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""Measuring cases, and comparing the results against a baseline.
+
+A result is a dict of
+    - ops: How many operations the case timed.
+    - ops_per_sec: ops divided by the summed latencies, from the median of --repeat runs.
+    - p50_ns, p99_ns: Latency percentiles of a single operation in that run.
+    - peak_bytes: The peak of memory allocated by python while the case ran, setup included, from a
+      separate run under tracemalloc, which slows everything down too much to time at the same time.
+"""
+
+import gc
+import tracemalloc
+from typing import Callable
+
+# Metrics where a larger value is better. For all others smaller is better
+HIGHER_IS_BETTER = {"ops_per_sec"}
+METRICS = ("ops_per_sec", "p50_ns", "p99_ns", "peak_bytes")
+
+
+def percentile(ordered: list[int], q: float) -> int:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def measure(case: Callable[[], list[int]], repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        latencies = sorted(case())
+        runs.append((sum(latencies), latencies))
+    runs.sort(key=lambda run: run[0])
+    total_ns, latencies = runs[len(runs) // 2]
+    gc.collect()
+    tracemalloc.start()
+    case()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / max(total_ns, 1) * 1e9,
+        "p50_ns": percentile(latencies, 0.5),
+        "p99_ns": percentile(latencies, 0.99),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def regressions(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """
+    Returns a line for every metric of every case that is more than {threshold} (a fraction) worse than
+    in {baseline}. Cases missing from either side are skipped
+    """
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            if not base.get(metric):
+                continue
+            change = result[metric] / base[metric] - 1
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > threshold:
+                found.append(
+                    f"{name} {metric}: {base[metric]:,.0f} -> {result[metric]:,.0f} ({change:+.0%})"
+                )
+    return found
@@ -0,0 +1,138 @@
+"""The cases the benchmark suite runs.
+
+Every case is a function without arguments that sets up its own input from a fixed seed, runs the
+operations it measures, and returns the latency of each operation in nanoseconds. Setup is not timed.
+
+Key streams, each n keys long:
+    - uniform: Keys drawn uniformly from [0, 4n).
+    - sorted: 0, 1, 2, ... The worst case for an unbalanced tree, and a steady stream of rotations for
+      a balanced one.
+    - zipfian: Keys drawn from a Zipf distribution with exponent ZIPF_EXPONENT over n distinct keys, so
+      a few hot keys make up most of the stream, like real caches and indexes see.
+    - adversarial: 0, n-1, 1, n-2, ... Alternating from both ends toward the middle, so every insert
+      lands at the bottom of the inner spine and the trees rebalance near the root again and again.
+"""
+
+import random
+import time
+from itertools import accumulate
+from typing import Callable
+
+from avltree import AvlTree
+from hoare_partition import (
+    dual_pivot_partition,
+    hoare_partition_var1,
+    hoare_partition_var2,
+    partition_3way,
+)
+from quicksort import PARTITION_SCHEMES, quicksort
+from rbtree import RedBlackTree
+
+ZIPF_EXPONENT = 1.1
+TREES = {"avl": AvlTree, "rb": RedBlackTree}
+STREAMS = ("uniform", "sorted", "zipfian", "adversarial")
+# How many times partition and sort cases run over their input
+SORT_CALLS = 5
+
+
+def key_stream(kind: str, n: int, rng: random.Random) -> list[int]:
+    if kind == "uniform":
+        return [rng.randrange(4 * n) for _ in range(n)]
+    if kind == "sorted":
+        return list(range(n))
+    if kind == "zipfian":
+        weights = accumulate(1 / rank**ZIPF_EXPONENT for rank in range(1, n + 1))
+        keys = list(range(n))
+        rng.shuffle(keys)
+        return rng.choices(keys, cum_weights=list(weights), k=n)
+    if kind == "adversarial":
+        return [i // 2 if i % 2 == 0 else n - 1 - i // 2 for i in range(n)]
+    raise ValueError(f"Unknown key stream {kind!r}")
+
+
+def _timed(operation: Callable[[int], object], keys: list[int]) -> list[int]:
+    clock = time.perf_counter_ns
+    latencies = []
+    for key in keys:
+        start = clock()
+        operation(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _tree_case(
+    tree_type: type, operation: str, stream: str, n: int, seed: int
+) -> Callable[[], list[int]]:
+    def run() -> list[int]:
+        rng = random.Random(seed)
+        keys = key_stream(stream, n, rng)
+        tree = tree_type()
+        if operation == "insert":
+            return _timed(tree.insert, keys)
+        for key in keys:
+            tree.insert(key)
+        if operation == "search":
+            return _timed(tree.search, key_stream(stream, n, rng))
+        # Delete in the stream's own order. Duplicate keys in the stream miss the second time
+        return _timed(tree.delete, keys)
+
+    return run
+
+
+def _list_inputs(n: int, rng: random.Random) -> dict[str, list[int]]:
+    return {
+        "random": [rng.randrange(n * 10) for _ in range(n)],
+        "few_distinct": [rng.randrange(8) for _ in range(n)],
+        "sorted": list(range(n)),
+    }
+
+
+def _calls_case(
+    call: Callable[[list[int]], object], nums: list[int]
+) -> Callable[[], list[int]]:
+    def run() -> list[int]:
+        clock = time.perf_counter_ns
+        latencies = []
+        for _ in range(SORT_CALLS):
+            copy = list(nums)
+            start = clock()
+            call(copy)
+            latencies.append(clock() - start)
+        return latencies
+
+    return run
+
+
+PARTITIONS = {
+    "var1": lambda nums: hoare_partition_var1(nums, 0, len(nums) - 1, len(nums) // 2),
+    "var2": lambda nums: hoare_partition_var2(nums, 0, len(nums) - 1, len(nums) // 2),
+    "3way": lambda nums: partition_3way(nums, 0, len(nums) - 1, len(nums) // 2),
+    "dual_pivot": lambda nums: dual_pivot_partition(
+        nums, 0, len(nums) - 1, len(nums) // 3, 2 * len(nums) // 3
+    ),
+}
+
+
+def cases(n: int, seed: int) -> dict[str, Callable[[], list[int]]]:
+    """
+    Returns every case of the suite by name. Tree cases run n operations, partition and sort cases
+    SORT_CALLS calls over n values
+    """
+    suite = {}
+    for tree_name, tree_type in TREES.items():
+        for operation in ("insert", "search", "delete"):
+            for stream in STREAMS:
+                suite[f"{tree_name}/{operation}/{stream}"] = _tree_case(
+                    tree_type, operation, stream, n, seed
+                )
+    inputs = _list_inputs(n, random.Random(seed))
+    for input_name, nums in inputs.items():
+        for partition_name, partition in PARTITIONS.items():
+            suite[f"partition/{partition_name}/{input_name}"] = _calls_case(
+                partition, nums
+            )
+        for scheme in PARTITION_SCHEMES:
+            suite[f"sort/{scheme}/{input_name}"] = _calls_case(
+                lambda nums, scheme=scheme: quicksort(nums, partition=scheme), nums
+            )
+    return suite
@@ -9,14 +9,19 @@ everytime I invoke node.left.insert() or node.right.search().
 
 In python an empty tree is represented by None. 
 With a wrapper class, I can still define insert() and search()
-on the AVLTree class and have inner closure methods that operate on Optional[AVLTreeNode]
+on the AVLTree class and have them walk an Optional[AVLTreeNode] cursor down the tree.
+They are loops rather than recursive closures, so a lookup costs no closure allocation and
+no Python frame per level. insert() and delete() remember the nodes they walked through in
+a path list and rebalance bottom-up along it, which is what the recursion used to unwind.
 
 Some good things to know:
 A "rotation" (single or double) happens only once per insert. It is at the lowest node in the ancestor
 chain that has it's balance factor violated. After "rotations", the height of the node with the violation
-is the same as it was prior to violation. Thus we theoretically can stop fixing up the ancestor chain from this node.
-In the algorithm below, we do call _apply_rotation all the way to the top for simplicity. We'd just be nooping after
-the node with the first rotation
+is the same as it was prior to violation. Thus we can stop fixing up the ancestor chain from this node.
+More generally, once any subtree on the path has the same height it had before the update, no ancestor's
+height or balance can change. _rebalance() stops there, which on insert is usually within the bottom two
+or three levels, and on delete wherever the shrinking stops. The only thing left to update above that point
+is the size of each ancestor, which is one more (insert) or one less (delete) than before.
 
 References:
 https://www.cs.cmu.edu/~rjsimmon/15122-m15/lec/16-avl.pdf
@@ -24,8 +29,11 @@ https://www.youtube.com/watch?v=Jj9Mit24CWk&list=PLlsmxlJgn1HJRYU7YIf8DSEg8_DGwS
 
 """
 
-from PrettyPrint import PrettyPrintTree
-from typing import Generic, TypeVar
+import os
+from typing import Generic, Iterable, Iterator, TypeVar
+
+import bst
+import snapshot
 
 T = TypeVar("T")
 
@@ -35,6 +43,8 @@ class AvlTreeNode(Generic[T]):
     Represents a node in an AVL Tree
     """
 
+    __slots__ = ("left", "right", "val", "height", "size")
+
     def __init__(
         self,
         val: T,
@@ -45,6 +55,8 @@ class AvlTreeNode(Generic[T]):
         self.right = right
         self.val = val
         self.height = 1
+        # Number of nodes in the subtree rooted here. Kept up to date together with height
+        self.size = 1
 
     def children(self) -> list["AvlTreeNode"]:
         """
@@ -73,13 +85,26 @@ class AvlTree(Generic[T]):
     An AVL Tree is a Binary Search Tree that is height balanced. It performs rotations on insertions and deletions
     """
 
+    # Built on the first call to __str__ and shared by every tree. See pretty_printer
+    _pretty_printer = None
+
+    # The batch operations rebuild the whole tree in O(n + m) once a batch of m values is at least this
+    # fraction of the n values in the tree. Smaller batches go through insert() and delete() one value at
+    # a time in O(m log n). See benchmarks/bench_batch.py for how the crossover was measured
+    BATCH_REBUILD_FRACTION = 0.2
+    # Same for contains_many(), which switches from one search per value to a single merge walk over the tree
+    BATCH_SCAN_FRACTION = 0.75
+    # union(), intersection() and difference() run the join based algorithms once the smaller tree is at
+    # least this fraction of the larger one, and per-key operations on the larger tree below that.
+    # See benchmarks/bench_setops.py
+    SET_OPERATION_FRACTION = 0.2
+    # The node class every build, batch operation and join creates. The rotations, builds and joins are
+    # classmethods that fix heights through cls._fix_height, so a subclass can augment its nodes with more
+    # subtree data by overriding both. See interval_tree.py
+    _node_type = AvlTreeNode
+
     def __init__(self, root: "AvlTreeNode | None" = None):
         self.root = root
-        self.pretty_printer = PrettyPrintTree(
-            lambda node: node.children(),
-            lambda node: node.val,
-            return_instead_of_print=True,
-        )
 
     def __str__(self) -> str:
         if self.root:
@@ -87,8 +112,107 @@ class AvlTree(Generic[T]):
         else:
             return f"Empty-Tree"
 
-    @staticmethod
-    def _left_rotate(node: AvlTreeNode) -> AvlTreeNode:
+    @property
+    def pretty_printer(self):
+        """
+        The PrettyPrintTree used by __str__.
+        The PrettyPrint package is only imported once a tree is actually printed
+        """
+        if AvlTree._pretty_printer is None:
+            from PrettyPrint import PrettyPrintTree
+
+            AvlTree._pretty_printer = PrettyPrintTree(
+                lambda node: node.children(),
+                lambda node: node.val,
+                return_instead_of_print=True,
+            )
+        return AvlTree._pretty_printer
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[T]) -> "AvlTree[T]":
+        """
+        Builds a height balanced tree from an iterable of values in ascending order in O(n).
+        Duplicate values are dropped. Raises ValueError if the values are not sorted.
+
+        The iterable is consumed exactly once, so it can be a generator. The nodes are first
+        threaded into a chain through their right pointers, which means no intermediate list
+        is ever built. The chain is then folded into a tree where the sizes of the left and
+        right subtrees of every node differ by at most one. That is always a valid AVL tree
+        so no rotations are needed.
+        """
+        head: AvlTreeNode | None = None
+        tail: AvlTreeNode | None = None
+        count = 0
+        for val in iterable:
+            if tail is not None:
+                if val == tail.val:
+                    continue
+                if val < tail.val:
+                    raise ValueError(
+                        f"from_sorted() expects values in ascending order, but got {val!r} after {tail.val!r}"
+                    )
+            node = cls._node_type(val)
+            if tail is None:
+                head = node
+            else:
+                tail.right = node
+            tail = node
+            count += 1
+        return cls(cls._build_from_chain(head, count))
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> "AvlTree[T]":
+        """
+        Builds a height balanced tree from an iterable of values in any order.
+        The values are sorted first, so this costs O(n log n) for the sort and O(n) for the build.
+        """
+        return cls.from_sorted(sorted(iterable))
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the values of the tree to the file {path} in ascending order. See snapshot.py for the format
+        """
+        snapshot.write_snapshot(path, self)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "AvlTree[T]":
+        """
+        Builds a height balanced tree from a file written by save() in O(n), with no inserts or rotations.
+        Numeric values are read through a memory map of the file.
+        Raises ValueError if the file is not a snapshot or its values are not sorted
+        """
+        with snapshot.paused_gc():
+            return cls.from_sorted(snapshot.read_snapshot(path))
+
+    @classmethod
+    def _build_from_chain(
+        cls, head: AvlTreeNode | None, count: int
+    ) -> AvlTreeNode | None:
+        """
+        Turns a chain of {count} nodes linked in ascending order through their right pointers
+        into a balanced tree and returns its root.
+        The chain is consumed in order, like an in-order traversal, so each node is visited once.
+        The recursion is only O(log n) deep.
+        """
+        cursor = head
+
+        def build(n: int) -> AvlTreeNode | None:
+            nonlocal cursor
+            if n == 0:
+                return None
+            left = build(n // 2)
+            node = cursor
+            assert node is not None
+            cursor = node.right
+            node.left = left
+            node.right = build(n - n // 2 - 1)
+            cls._fix_height(node)
+            return node
+
+        return build(count)
+
+    @classmethod
+    def _left_rotate(cls, node: AvlTreeNode) -> AvlTreeNode:
         r"""
             C                                A
            /  \     left Rotation at C      / \   
@@ -104,12 +228,12 @@ class AvlTree(Generic[T]):
         right_childs_left_child = right_child.left
         node.right = right_childs_left_child
         right_child.left = node
-        AvlTree._fix_height(node)
-        AvlTree._fix_height(right_child)
+        cls._fix_height(node)
+        cls._fix_height(right_child)
         return right_child
 
-    @staticmethod
-    def _right_rotate(node: AvlTreeNode) -> AvlTreeNode:
+    @classmethod
+    def _right_rotate(cls, node: AvlTreeNode) -> AvlTreeNode:
         r"""
             C                                A
            /  \     right Rotation at C      / \   
@@ -125,29 +249,33 @@ class AvlTree(Generic[T]):
         left_childs_right_child = left_child.right
         node.left = left_childs_right_child
         left_child.right = node
-        AvlTree._fix_height(node)
-        AvlTree._fix_height(left_child)
+        cls._fix_height(node)
+        cls._fix_height(left_child)
         return left_child
 
-    @staticmethod
-    def _apply_rotation(node: AvlTreeNode) -> AvlTreeNode:
+    @classmethod
+    def _apply_rotation(cls, node: AvlTreeNode) -> AvlTreeNode:
         balance = node.balance()
         if balance > 1:  # right heavy
             if node.right and node.right.balance() < 0:
-                node.right = AvlTree._right_rotate(node.right)
-            return AvlTree._left_rotate(node)
+                node.right = cls._right_rotate(node.right)
+            return cls._left_rotate(node)
         elif balance < -1:  # left heavy:
             if node.left and node.left.balance() > 0:
-                node.left = AvlTree._left_rotate(node.left)
-            return AvlTree._right_rotate(node)
+                node.left = cls._left_rotate(node.left)
+            return cls._right_rotate(node)
         return node
 
     @staticmethod
     def _fix_height(node: AvlTreeNode) -> None:
-        height = 1 + max(
-            node.left.height if node.left else 0, node.right.height if node.right else 0
-        )
+        """
+        Recomputes the height and the size of {node} from its children.
+        Every rotation and every node on an update path goes through here, which keeps both fields correct
+        """
+        left, right = node.left, node.right
+        height = 1 + max(left.height if left else 0, right.height if right else 0)
         node.height = height
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
 
     @staticmethod
     def _find_max(node: AvlTreeNode):
@@ -162,71 +290,548 @@ class AvlTree(Generic[T]):
         """
         return self.root is None
 
+    def __len__(self) -> int:
+        return bst.size(self.root)
+
+    def rank(self, val: T) -> int:
+        """
+        Returns the number of values in the tree smaller than {val} in O(log n).
+        {val} does not need to be in the tree
+        """
+        return bst.rank(self.root, val)
+
+    def select(self, k: int) -> T:
+        """
+        Returns the {k}th smallest value in the tree, counting from 0, in O(log n).
+        Raises IndexError if k is out of range
+        """
+        return bst.select(self.root, k)
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """
+        Returns the number of values {v} in the tree with lo <= v <= hi in O(log n)
+        """
+        if hi < lo:
+            return 0
+        return bst.rank(self.root, hi, inclusive=True) - bst.rank(self.root, lo)
+
+    def __iter__(self) -> Iterator[T]:
+        return bst.iter_values(self.root)
+
+    def __reversed__(self) -> Iterator[T]:
+        return bst.iter_values(self.root, reverse=True)
+
+    def irange(
+        self,
+        lo: T | None = None,
+        hi: T | None = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Yields the values {v} with lo <= v <= hi in ascending order, or descending if {reverse}, in O(log n + k).
+        {inclusive} says whether each bound is included, and a bound of None leaves that side open
+        """
+        return bst.irange(self.root, lo, hi, inclusive, reverse)
+
+    def cursor(self) -> bst.Cursor:
+        """
+        Returns an unpositioned cursor over the tree. See bst.Cursor
+        """
+        return bst.Cursor(self.root)
+
+    def _rebalance(self, path: list[AvlTreeNode], size_change: int) -> None:
+        """
+        Walks {path} (root first) bottom-up, fixing heights and applying rotations, after one node was
+        added ({size_change} = 1) or removed ({size_change} = -1) below its last node.
+        A subtree that got rotated is relinked into its parent, or becomes the new root.
+        Stops at the first subtree whose height did not change and only adjusts the sizes above it
+        """
+        fix_height = self._fix_height
+        apply_rotation = self._apply_rotation
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            fix_height(node)
+            new_node = apply_rotation(node)
+            if new_node is not node:
+                if i == 0:
+                    self.root = new_node
+                else:
+                    parent = path[i - 1]
+                    if parent.left is node:
+                        parent.left = new_node
+                    else:
+                        parent.right = new_node
+            if new_node.height == old_height:
+                for j in range(i):
+                    path[j].size += size_change
+                return
+
     def search(self, val: T) -> bool:
         """
         Search for a key with {val} in the Tree
         """
-
-        def search_from_node(val: T, node: AvlTreeNode | None) -> bool:
-            if node is None:
-                return False
-            elif node.val == val:
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
                 return True
-            elif val < node.val:
-                return search_from_node(val, node.left)
-            else:
-                return search_from_node(val, node.right)
-
-        return search_from_node(val, self.root)
+            node = node.left if val < node_val else node.right
+        return False
 
     def insert(self, val: T) -> None:
         """
         Inserts a value {val} into the tree. If the value already exists, this is a noop
         """
+        self._find_or_insert(val, self._node_type)
 
-        def insert_from_node(node: AvlTreeNode | None) -> AvlTreeNode:
-            if node is None:
-                return AvlTreeNode(val, None, None)
-            elif node.val == val:
-                return node
-            elif node.val > val:
-                node.left = insert_from_node(node.left)
-            else:
-                node.right = insert_from_node(node.right)
-            AvlTree._fix_height(node)
-            return AvlTree._apply_rotation(node)
-
-        tree_after_insertion = insert_from_node(self.root)
-        self.root = tree_after_insertion
+    def _find_or_insert(self, val: T, node_type: type) -> tuple[AvlTreeNode, bool]:
+        """
+        Returns the node holding {val} and False if there is one.
+        Otherwise inserts node_type(val) and returns it and True. Done in a single descent
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                return node, False
+            path.append(node)
+            node = node.left if val < node_val else node.right
+        new_node = node_type(val)
+        if not path:
+            self.root = new_node
+            return new_node, True
+        parent = path[-1]
+        if val < parent.val:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance(path, 1)
+        return new_node, True
 
     def delete(self, val: T) -> None:
         """
         Delete a value {val} from the Tree
         """
+        self._delete(val)
 
-        def delete_node(node: AvlTreeNode | None, key: T) -> AvlTreeNode | None:
-            if not node:
-                return None
-            new_root = node
-            if node.val > key:
-                node.left = delete_node(node.left, key)
-            elif node.val < key:
-                node.right = delete_node(node.right, key)
+    def _delete(self, val: T) -> AvlTreeNode | None:
+        """
+        Unlinks the node holding {val} and returns it, or returns None if there is none.
+        Nodes are moved rather than having their values copied, so every other node keeps its value
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                break
+            path.append(node)
+            node = node.left if val < node_val else node.right
+        if node is None:
+            return None
+        parent = path[-1] if path else None
+        if node.left is not None and node.right is not None:
+            # The max of the left subtree takes the place of node. It has no right child,
+            # so unlinking it from where it is now only means hoisting its left child
+            index = len(path)
+            path.append(node)
+            replacement = node.left
+            while replacement.right is not None:
+                path.append(replacement)
+                replacement = replacement.right
+            if path[-1] is node:
+                node.left = replacement.left
             else:
-                # remove root
-                if node.left is None:
-                    new_root = node.right
-                    node.right = None
-                elif node.right is None:
-                    new_root = node.left
-                    node.left = None
-                else:
-                    node.val = AvlTree._find_max(node.left)
-                    node.left = delete_node(node.left, node.val)
-                    new_root = node
-            if new_root:
-                self._fix_height(new_root)
-                new_root = self._apply_rotation(new_root)
-            return new_root
-
-        self.root = delete_node(self.root, val)
+                path[-1].right = replacement.left
+            replacement.left = node.left
+            replacement.right = node.right
+            # From here on replacement is an ancestor that lost one node, like the others on the path
+            replacement.height = node.height
+            replacement.size = node.size
+            path[index] = replacement
+            subtree = replacement
+        else:
+            subtree = node.left if node.left is not None else node.right
+        if parent is None:
+            self.root = subtree
+        elif parent.left is node:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+        node.left = node.right = None
+        self._rebalance(path, -1)
+        return node
+
+    @staticmethod
+    def _iter_nodes(root: AvlTreeNode | None) -> Iterator[AvlTreeNode]:
+        """
+        Yields the nodes of the tree in order. Each node's right pointer is read before the node is
+        yielded, so the caller is free to relink it into a chain
+        """
+        stack = []
+        node = root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            right = node.right
+            yield node
+            node = right
+
+    def _rebuild_pays_off(self, batch_size: int, fraction: float) -> bool:
+        return batch_size >= fraction * len(self)
+
+    def insert_many(self, vals: Iterable[T]) -> None:
+        """
+        Inserts every value in {vals}. Values already in the tree are skipped.
+        A large batch is sorted and merged with the tree, and the result is rebuilt in O(n + m)
+        reusing the existing nodes. A small batch is inserted one value at a time
+        """
+        batch = sorted(vals)
+        if not self._rebuild_pays_off(len(batch), self.BATCH_REBUILD_FRACTION):
+            for val in batch:
+                self.insert(val)
+            return
+        head = tail = None
+        count = 0
+
+        def append(node: AvlTreeNode) -> None:
+            nonlocal head, tail, count
+            if tail is None:
+                head = node
+            else:
+                tail.right = node
+            tail = node
+            count += 1
+
+        i = 0
+        for node in AvlTree._iter_nodes(self.root):
+            node_val = node.val
+            while i < len(batch) and batch[i] < node_val:
+                val = batch[i]
+                i += 1
+                if tail is None or tail.val < val:
+                    append(self._node_type(val))
+            while i < len(batch) and batch[i] == node_val:
+                i += 1
+            append(node)
+        for val in batch[i:]:
+            if tail is None or tail.val < val:
+                append(self._node_type(val))
+        self.root = self._build_from_chain(head, count)
+
+    def delete_many(self, vals: Iterable[T]) -> None:
+        """
+        Deletes every value in {vals}. Values not in the tree are skipped.
+        A large batch is sorted and merged with the tree, and the remaining nodes are rebuilt in O(n + m).
+        A small batch is deleted one value at a time
+        """
+        batch = sorted(vals)
+        if not self._rebuild_pays_off(len(batch), self.BATCH_REBUILD_FRACTION):
+            for val in batch:
+                self.delete(val)
+            return
+        head = tail = None
+        count = 0
+        i = 0
+        for node in AvlTree._iter_nodes(self.root):
+            node_val = node.val
+            while i < len(batch) and batch[i] < node_val:
+                i += 1
+            if i < len(batch) and batch[i] == node_val:
+                node.left = node.right = None
+                continue
+            if tail is None:
+                head = node
+            else:
+                tail.right = node
+            tail = node
+            count += 1
+        self.root = self._build_from_chain(head, count)
+
+    def contains_many(self, vals: Iterable[T]) -> list[bool]:
+        """
+        Returns a list with, for each value in {vals}, whether it is in the tree.
+        A large batch is answered by one merge walk over the tree in O(n + m log m),
+        a small one by a search per value
+        """
+        batch = list(vals)
+        if not self._rebuild_pays_off(len(batch), self.BATCH_SCAN_FRACTION):
+            search = self.search
+            return [search(val) for val in batch]
+        found = [False] * len(batch)
+        order = sorted(range(len(batch)), key=batch.__getitem__)
+        i = 0
+        for node_val in bst.iter_values(self.root):
+            while i < len(order) and batch[order[i]] < node_val:
+                i += 1
+            while i < len(order) and batch[order[i]] == node_val:
+                found[order[i]] = True
+                i += 1
+            if i == len(order):
+                break
+        return found
+
+    @staticmethod
+    def _height(node: AvlTreeNode | None) -> int:
+        return node.height if node is not None else 0
+
+    @classmethod
+    def _join(
+        cls, left: AvlTreeNode | None, node: AvlTreeNode, right: AvlTreeNode | None
+    ) -> AvlTreeNode:
+        """
+        Returns the root of a balanced tree with the values of {left}, {node} and {right},
+        where every value in left is smaller than node.val and every value in right is larger.
+        Costs O(|height(left) - height(right)| + 1): the shorter tree is hung off the spine of the taller one
+        at the level where the heights match, and rotations fix the balance on the way back up.
+        """
+        left_height = cls._height(left)
+        right_height = cls._height(right)
+        if left_height > right_height + 1:
+            assert left is not None
+            return cls._join_right(left, node, right)
+        if right_height > left_height + 1:
+            assert right is not None
+            return cls._join_left(left, node, right)
+        node.left = left
+        node.right = right
+        cls._fix_height(node)
+        return node
+
+    @classmethod
+    def _join_right(
+        cls, left: AvlTreeNode, node: AvlTreeNode, right: AvlTreeNode | None
+    ) -> AvlTreeNode:
+        """
+        _join() when {left} is the taller tree. Walks down the right spine of left
+        """
+        spine_child = left.right
+        if cls._height(spine_child) <= cls._height(right) + 1:
+            node.left = spine_child
+            node.right = right
+            cls._fix_height(node)
+            if node.height <= cls._height(left.left) + 1:
+                left.right = node
+                cls._fix_height(left)
+                return left
+            left.right = cls._right_rotate(node)
+            cls._fix_height(left)
+            return cls._left_rotate(left)
+        assert spine_child is not None
+        joined = cls._join_right(spine_child, node, right)
+        left.right = joined
+        cls._fix_height(left)
+        if joined.height <= cls._height(left.left) + 1:
+            return left
+        return cls._left_rotate(left)
+
+    @classmethod
+    def _join_left(
+        cls, left: AvlTreeNode | None, node: AvlTreeNode, right: AvlTreeNode
+    ) -> AvlTreeNode:
+        """
+        Mirror image of _join_right() for when {right} is the taller tree
+        """
+        spine_child = right.left
+        if cls._height(spine_child) <= cls._height(left) + 1:
+            node.left = left
+            node.right = spine_child
+            cls._fix_height(node)
+            if node.height <= cls._height(right.right) + 1:
+                right.left = node
+                cls._fix_height(right)
+                return right
+            right.left = cls._left_rotate(node)
+            cls._fix_height(right)
+            return cls._right_rotate(right)
+        assert spine_child is not None
+        joined = cls._join_left(left, node, spine_child)
+        right.left = joined
+        cls._fix_height(right)
+        if joined.height <= cls._height(right.right) + 1:
+            return right
+        return cls._right_rotate(right)
+
+    @classmethod
+    def _split(
+        cls, node: AvlTreeNode | None, val: T
+    ) -> tuple[AvlTreeNode | None, AvlTreeNode | None, AvlTreeNode | None]:
+        """
+        Splits the tree rooted at {node} into the values smaller than {val}, the node holding {val}
+        (or None) and the values larger than {val}, in O(log n). The nodes are reused
+        """
+        if node is None:
+            return None, None, None
+        left, right = node.left, node.right
+        node.left = node.right = None
+        if val == node.val:
+            cls._fix_height(node)
+            return left, node, right
+        if val < node.val:
+            smaller, found, larger = cls._split(left, val)
+            return smaller, found, cls._join(larger, node, right)
+        smaller, found, larger = cls._split(right, val)
+        return cls._join(left, node, smaller), found, larger
+
+    @classmethod
+    def _split_last(cls, node: AvlTreeNode) -> tuple[AvlTreeNode | None, AvlTreeNode]:
+        """
+        Detaches the node with the largest value. Returns the root of the rest and that node
+        """
+        left, right = node.left, node.right
+        node.left = node.right = None
+        if right is None:
+            cls._fix_height(node)
+            return left, node
+        rest, last = cls._split_last(right)
+        return cls._join(left, node, rest), last
+
+    @classmethod
+    def _join2(
+        cls, left: AvlTreeNode | None, right: AvlTreeNode | None
+    ) -> AvlTreeNode | None:
+        """
+        _join() without a middle node: the largest node of {left} takes that place
+        """
+        if left is None:
+            return right
+        rest, last = cls._split_last(left)
+        return cls._join(rest, last, right)
+
+    @classmethod
+    def _union(
+        cls, first: AvlTreeNode | None, second: AvlTreeNode | None
+    ) -> AvlTreeNode | None:
+        if first is None:
+            return second
+        if second is None:
+            return first
+        left, right = second.left, second.right
+        smaller, _, larger = cls._split(first, second.val)
+        return cls._join(cls._union(smaller, left), second, cls._union(larger, right))
+
+    @classmethod
+    def _intersection(
+        cls, first: AvlTreeNode | None, second: AvlTreeNode | None
+    ) -> AvlTreeNode | None:
+        if first is None or second is None:
+            return None
+        left, right = second.left, second.right
+        smaller, found, larger = cls._split(first, second.val)
+        joined_left = cls._intersection(smaller, left)
+        joined_right = cls._intersection(larger, right)
+        if found is None:
+            return cls._join2(joined_left, joined_right)
+        return cls._join(joined_left, found, joined_right)
+
+    @classmethod
+    def _difference(
+        cls, first: AvlTreeNode | None, second: AvlTreeNode | None
+    ) -> AvlTreeNode | None:
+        if first is None or second is None:
+            return first
+        left, right = second.left, second.right
+        smaller, _, larger = cls._split(first, second.val)
+        return cls._join2(
+            cls._difference(smaller, left), cls._difference(larger, right)
+        )
+
+    @classmethod
+    def join(cls, left: "AvlTree[T]", val: T, right: "AvlTree[T]") -> "AvlTree[T]":
+        """
+        Returns a tree with the values of {left}, {val} and {right} in O(|height(left) - height(right)| + 1).
+        Every value in left must be smaller than {val} and every value in right larger, otherwise ValueError is raised.
+        The nodes of both trees are reused, so both are left empty
+        """
+        if left.root is not None and not AvlTree._find_max(left.root) < val:
+            raise ValueError(f"Every value in 'left' must be smaller than {val!r}")
+        if right.root is not None:
+            smallest = right.root
+            while smallest.left is not None:
+                smallest = smallest.left
+            if not val < smallest.val:
+                raise ValueError(f"Every value in 'right' must be larger than {val!r}")
+        root = cls._join(left.root, cls._node_type(val), right.root)
+        left.root = right.root = None
+        return cls(root)
+
+    def split(self, val: T) -> tuple["AvlTree[T]", bool, "AvlTree[T]"]:
+        """
+        Splits the tree into a tree of the values smaller than {val}, whether {val} was in the tree,
+        and a tree of the values larger than {val}, in O(log n). This tree is left empty
+        """
+        smaller, found, larger = self._split(self.root, val)
+        self.root = None
+        return type(self)(smaller), found is not None, type(self)(larger)
+
+    def union(self, other: "AvlTree[T]") -> "AvlTree[T]":
+        """
+        Returns a tree with the values in either tree, in O(m log(n/m + 1)) for trees of sizes m <= n.
+        The nodes of both trees are reused, so both are left empty
+        """
+        self._check_distinct(other)
+        if self._prefer_per_key(other):
+            larger, smaller = (
+                (self, other) if len(self) >= len(other) else (other, self)
+            )
+            for val in smaller:
+                larger.insert(val)
+            root = larger.root
+        else:
+            root = self._union(self.root, other.root)
+        self.root = other.root = None
+        return type(self)(root)
+
+    def intersection(self, other: "AvlTree[T]") -> "AvlTree[T]":
+        """
+        Returns a tree with the values in both trees, in O(m log(n/m + 1)) for trees of sizes m <= n.
+        The nodes of both trees are reused, so both are left empty
+        """
+        self._check_distinct(other)
+        if self._prefer_per_key(other):
+            larger, smaller = (
+                (self, other) if len(self) >= len(other) else (other, self)
+            )
+            result = type(self).from_sorted(
+                val for val in smaller if larger.search(val)
+            )
+        else:
+            result = type(self)(self._intersection(self.root, other.root))
+        self.root = other.root = None
+        return result
+
+    def difference(self, other: "AvlTree[T]") -> "AvlTree[T]":
+        """
+        Returns a tree with the values in this tree but not in {other}, in O(m log(n/m + 1)) for trees of
+        sizes m <= n. The nodes of both trees are reused, so both are left empty
+        """
+        self._check_distinct(other)
+        if not self._prefer_per_key(other):
+            result = type(self)(self._difference(self.root, other.root))
+        elif len(other) <= len(self):
+            for val in other:
+                self.delete(val)
+            result = type(self)(self.root)
+        else:
+            result = type(self).from_sorted(
+                val for val in self if not other.search(val)
+            )
+        self.root = other.root = None
+        return result
+
+    def _check_distinct(self, other: "AvlTree[T]") -> None:
+        if other is self:
+            raise ValueError("Set operations need two distinct trees")
+
+    def _prefer_per_key(self, other: "AvlTree[T]") -> bool:
+        """
+        The join based algorithms only pay off once both trees are of comparable size.
+        Below that the per-key operations on the larger tree are cheaper, even though both are O(m log n)
+        """
+        smaller, larger = sorted((len(self), len(other)))
+        return smaller < self.SET_OPERATION_FRACTION * larger
@@ -0,0 +1,401 @@
+"""A B+ Tree keeps its values in sorted lists in the leaves, and only separator keys in the internal nodes.
+
+Every node holds up to {order} keys (leaves) or children (internal nodes) in plain lists, so a search
+does one bisect per level instead of one Python loop iteration per level, and there are only about
+log_order(n) levels instead of the log_2(n) of an AvlTree. A million keys at the default order of 64 are
+four levels deep. The lists are also much more compact than a node object per value: a key in a leaf
+costs one 8 byte slot of a list, where an AvlTreeNode costs a whole object with five attributes.
+
+The leaves are linked in both directions, so a range scan finds its first leaf in O(log n) and then
+just walks the leaf lists. Iterating the whole tree never goes through an internal node at all.
+
+Some invariants:
+    - Every leaf is at the same depth, {_depth} internal levels below the root.
+    - The children of an internal node are separated by its keys: every value in children[i] is
+      smaller than keys[i], and every value in children[i + 1] is larger or equal. A separator is not
+      necessarily still in the tree: deleting the smallest value of a leaf leaves its separator as is,
+      which still separates the two sides correctly.
+    - Every node except the root holds at least order // 2 keys (leaves) or children (internal nodes).
+      An insert that overflows a node splits it in half and adds a separator to its parent. A delete that
+      underflows a node borrows a value from a sibling, or merges with it if the sibling has none to spare
+      and takes the separator out of the parent. Either can cascade up to the root, which is the only
+      place the tree gets taller or shorter.
+
+References:
+https://en.wikipedia.org/wiki/B%2B_tree
+Introduction to Algorithms (CLRS), chapter 18
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Large enough that a search is a few bisects, small enough that the list inserts and deletes in a
+# leaf stay cheap. See benchmarks/bench_bplustree.py
+DEFAULT_ORDER = 64
+
+
+class BPlusTreeLeaf(Generic[T]):
+    """
+    Represents a leaf in a B+ Tree: a sorted list of values and the neighboring leaves
+    """
+
+    __slots__ = ("keys", "next", "prev")
+
+    def __init__(self, keys: list[T] | None = None):
+        self.keys = keys if keys is not None else []
+        self.next: BPlusTreeLeaf | None = None
+        self.prev: BPlusTreeLeaf | None = None
+
+
+class BPlusTreeInternal(Generic[T]):
+    """
+    Represents an internal node in a B+ Tree: len(keys) separators between len(keys) + 1 children
+    """
+
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys: list[T], children: list):
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree(Generic[T]):
+    """
+    A B+ Tree is a search tree of sorted lists. It has the same interface as AvlTree
+    """
+
+    def __init__(self, order: int = DEFAULT_ORDER):
+        if order < 4:
+            raise ValueError(f"'order' must be at least 4, but got order={order}")
+        self.order = order
+        self.root: BPlusTreeLeaf | BPlusTreeInternal = BPlusTreeLeaf()
+        self._depth = 0
+        self._size = 0
+
+    @classmethod
+    def from_sorted(
+        cls, iterable: Iterable[T], order: int = DEFAULT_ORDER
+    ) -> "BPlusTree[T]":
+        """
+        Builds a tree from an iterable of values in ascending order in O(n), with every node as full as
+        possible. Duplicate values are dropped. Raises ValueError if the values are not sorted.
+        """
+        tree = cls(order)
+        values: list[T] = []
+        for val in iterable:
+            if values:
+                last = values[-1]
+                if val == last:
+                    continue
+                if val < last:
+                    raise ValueError(
+                        f"from_sorted() expects values in ascending order, but got {val!r} after {last!r}"
+                    )
+            values.append(val)
+        if not values:
+            return tree
+        leaves = [BPlusTreeLeaf(keys) for keys in BPlusTree._even_chunks(values, order)]
+        for left, right in zip(leaves, leaves[1:]):
+            left.next = right
+            right.prev = left
+        # Each level is built from the one below, with the smallest value under every node
+        level = leaves
+        smallest = [leaf.keys[0] for leaf in leaves]
+        while len(level) > 1:
+            parents, parent_smallest = [], []
+            start = 0
+            for children in BPlusTree._even_chunks(level, order):
+                end = start + len(children)
+                parents.append(BPlusTreeInternal(smallest[start + 1 : end], children))
+                parent_smallest.append(smallest[start])
+                start = end
+            level, smallest = parents, parent_smallest
+            tree._depth += 1
+        tree.root = level[0]
+        tree._size = len(values)
+        return tree
+
+    @classmethod
+    def from_iterable(
+        cls, iterable: Iterable[T], order: int = DEFAULT_ORDER
+    ) -> "BPlusTree[T]":
+        return cls.from_sorted(sorted(iterable), order)
+
+    @staticmethod
+    def _even_chunks(items: list, order: int) -> list[list]:
+        """
+        Splits {items} into as few chunks of at most {order} items as possible, with sizes that differ by
+        at most one. With more than one chunk, each has more than order / 2 items
+        """
+        count = -(-len(items) // order)
+        return [
+            items[i * len(items) // count : (i + 1) * len(items) // count]
+            for i in range(count)
+        ]
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the tree is empty
+        """
+        return self._size == 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _first_leaf(self) -> BPlusTreeLeaf:
+        node = self.root
+        for _ in range(self._depth):
+            node = node.children[0]
+        return node
+
+    def _last_leaf(self) -> BPlusTreeLeaf:
+        node = self.root
+        for _ in range(self._depth):
+            node = node.children[-1]
+        return node
+
+    def _find_leaf(self, val: T) -> BPlusTreeLeaf:
+        node = self.root
+        for _ in range(self._depth):
+            node = node.children[bisect_right(node.keys, val)]
+        return node
+
+    def __iter__(self) -> Iterator[T]:
+        leaf = self._first_leaf()
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __reversed__(self) -> Iterator[T]:
+        leaf = self._last_leaf()
+        while leaf is not None:
+            yield from reversed(leaf.keys)
+            leaf = leaf.prev
+
+    def irange(
+        self,
+        lo: T | None = None,
+        hi: T | None = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Yields the values {v} with lo <= v <= hi in ascending order, or descending if {reverse}, in O(log n + k).
+        {inclusive} says whether each bound is included, and a bound of None leaves that side open
+        """
+        lower = bisect_left if inclusive[0] else bisect_right
+        upper = bisect_right if inclusive[1] else bisect_left
+        if not reverse:
+            leaf = self._first_leaf() if lo is None else self._find_leaf(lo)
+            start = 0 if lo is None else lower(leaf.keys, lo)
+            while leaf is not None:
+                keys = leaf.keys
+                end = len(keys) if hi is None else upper(keys, hi)
+                yield from keys[start:end]
+                if end < len(keys):
+                    return
+                leaf = leaf.next
+                start = 0
+        else:
+            leaf = self._last_leaf() if hi is None else self._find_leaf(hi)
+            end = len(leaf.keys) if hi is None else upper(leaf.keys, hi)
+            while leaf is not None:
+                keys = leaf.keys
+                start = 0 if lo is None else lower(keys, lo, 0, end)
+                yield from reversed(keys[start:end])
+                if start > 0:
+                    return
+                leaf = leaf.prev
+                end = len(leaf.keys) if leaf is not None else 0
+
+    def search(self, val: T) -> bool:
+        """
+        Search for a key with {val} in the Tree
+        """
+        node = self.root
+        for _ in range(self._depth):
+            node = node.children[bisect_right(node.keys, val)]
+        keys = node.keys
+        i = bisect_left(keys, val)
+        return i < len(keys) and keys[i] == val
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree. If the value already exists, this is a noop
+        """
+        path = []
+        node = self.root
+        for _ in range(self._depth):
+            i = bisect_right(node.keys, val)
+            path.append((node, i))
+            node = node.children[i]
+        keys = node.keys
+        i = bisect_left(keys, val)
+        if i < len(keys) and keys[i] == val:
+            return
+        keys.insert(i, val)
+        self._size += 1
+        if len(keys) > self.order:
+            self._split(path, node)
+
+    def _split(
+        self, path: list[tuple[BPlusTreeInternal, int]], leaf: BPlusTreeLeaf
+    ) -> None:
+        """
+        Splits the overflowing {leaf} in half, and every ancestor on {path} (root first, each with the
+        index of the child the path goes through) that overflows in turn
+        """
+        half = len(leaf.keys) // 2
+        right = BPlusTreeLeaf(leaf.keys[half:])
+        del leaf.keys[half:]
+        right.prev = leaf
+        right.next = leaf.next
+        if leaf.next is not None:
+            leaf.next.prev = right
+        leaf.next = right
+        separator = right.keys[0]
+        new_node: BPlusTreeLeaf | BPlusTreeInternal = right
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new_node)
+            if len(parent.children) <= self.order:
+                return
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            new_node = BPlusTreeInternal(
+                parent.keys[mid + 1 :], parent.children[mid + 1 :]
+            )
+            del parent.keys[mid:]
+            del parent.children[mid + 1 :]
+        self.root = BPlusTreeInternal([separator], [self.root, new_node])
+        self._depth += 1
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree
+        """
+        path = []
+        node = self.root
+        for _ in range(self._depth):
+            i = bisect_right(node.keys, val)
+            path.append((node, i))
+            node = node.children[i]
+        keys = node.keys
+        i = bisect_left(keys, val)
+        if i == len(keys) or keys[i] != val:
+            return
+        del keys[i]
+        self._size -= 1
+        if path and len(keys) < self.order // 2:
+            self._fix_underflow(path, node)
+
+    def _fix_underflow(
+        self, path: list[tuple[BPlusTreeInternal, int]], node: BPlusTreeLeaf
+    ) -> None:
+        """
+        Refills the underflowing {node} from a sibling, or merges the two, going up {path} as long as
+        merges make the parents underflow too
+        """
+        minimum = self.order // 2
+        while path:
+            parent, i = path.pop()
+            is_leaf = type(node) is BPlusTreeLeaf
+            if len(node.keys if is_leaf else node.children) >= minimum:
+                return
+            # The separator between left and right is parent.keys[i - 1] or parent.keys[i]
+            if i > 0:
+                left, right, s = parent.children[i - 1], node, i - 1
+                sibling = left
+            else:
+                left, right, s = node, parent.children[i + 1], i
+                sibling = right
+            if len(sibling.keys if is_leaf else sibling.children) > minimum:
+                if is_leaf:
+                    if sibling is left:
+                        right.keys.insert(0, left.keys.pop())
+                    else:
+                        left.keys.append(right.keys.pop(0))
+                    parent.keys[s] = right.keys[0]
+                elif sibling is left:
+                    right.keys.insert(0, parent.keys[s])
+                    right.children.insert(0, left.children.pop())
+                    parent.keys[s] = left.keys.pop()
+                else:
+                    left.keys.append(parent.keys[s])
+                    left.children.append(right.children.pop(0))
+                    parent.keys[s] = right.keys.pop(0)
+                return
+            if is_leaf:
+                left.keys.extend(right.keys)
+                left.next = right.next
+                if right.next is not None:
+                    right.next.prev = left
+            else:
+                left.keys.append(parent.keys[s])
+                left.keys.extend(right.keys)
+                left.children.extend(right.children)
+            del parent.keys[s]
+            del parent.children[s + 1]
+            node = parent
+        if len(self.root.children) == 1:
+            self.root = self.root.children[0]
+            self._depth -= 1
+
+    def check_invariants(self) -> int:
+        """
+        Verifies the order of the keys, the separators, the node fill, the leaf depth, the leaf links
+        and the size. Raises AssertionError on the first violation and returns the depth of the tree otherwise.
+        Meant for tests and debugging, it visits every node.
+        """
+        minimum = self.order // 2
+        leaves = []
+
+        def check(node, depth: int, lo, hi) -> None:
+            keys = node.keys
+            if any(not a < b for a, b in zip(keys, keys[1:])):
+                raise AssertionError(f"Keys out of order in {keys!r}")
+            if keys and (
+                (lo is not None and keys[0] < lo)
+                or (hi is not None and not keys[-1] < hi)
+            ):
+                raise AssertionError(
+                    f"Keys {keys!r} outside of their separators {lo!r} and {hi!r}"
+                )
+            if depth == self._depth:
+                if type(node) is not BPlusTreeLeaf:
+                    raise AssertionError("An internal node at the depth of the leaves")
+                if node is not self.root and not minimum <= len(keys) <= self.order:
+                    raise AssertionError(f"A leaf with {len(keys)} keys")
+                leaves.append(node)
+                return
+            if (
+                type(node) is not BPlusTreeInternal
+                or len(node.children) != len(keys) + 1
+            ):
+                raise AssertionError(
+                    "An internal node without one more child than keys"
+                )
+            if (
+                not (2 if node is self.root else minimum)
+                <= len(node.children)
+                <= self.order
+            ):
+                raise AssertionError(
+                    f"An internal node with {len(node.children)} children"
+                )
+            bounds = [lo] + keys + [hi]
+            for child, child_lo, child_hi in zip(node.children, bounds, bounds[1:]):
+                check(child, depth + 1, child_lo, child_hi)
+
+        check(self.root, 0, None, None)
+        for left, right in zip(leaves, leaves[1:]):
+            if left.next is not right or right.prev is not left:
+                raise AssertionError("Broken leaf links")
+        if leaves[0].prev is not None or leaves[-1].next is not None:
+            raise AssertionError("The leaf chain has loose ends")
+        if self._size != sum(len(leaf.keys) for leaf in leaves):
+            raise AssertionError(f"Size {self._size} does not match the leaves")
+        return self._depth
@@ -0,0 +1,312 @@
+"""Helpers shared by the binary search trees in this repo.
+
+AvlTree and RedBlackTree balance themselves differently, but once a tree is built, reading it is the same
+walk down left and right pointers. The functions here only rely on nodes having left, right and val
+attributes, plus a size attribute (the number of nodes in the subtree) for the order statistics.
+
+The traversals are generators over an explicit stack of the nodes still to visit. The stack never holds
+more than one root to leaf path, so a scan costs O(height) memory no matter how many values it yields,
+and a range scan of k values costs O(height + k) time.
+Like iterators over a dict, they must not be resumed after the tree was modified.
+"""
+
+from operator import attrgetter
+from typing import Any, Iterator
+
+_get_val = attrgetter("val")
+
+
+def size(node: Any) -> int:
+    """
+    Number of values in the subtree rooted at {node}. An empty subtree has size 0
+    """
+    return node.size if node is not None else 0
+
+
+def rank(root: Any, val: Any, inclusive: bool = False) -> int:
+    """
+    Number of values in the tree that are smaller than {val}, or smaller or equal if {inclusive}.
+    Costs O(height): every time the walk goes right, the left subtree and the node are counted in one step
+    """
+    count = 0
+    node = root
+    while node is not None:
+        node_val = node.val
+        if val < node_val:
+            node = node.left
+        elif node_val < val:
+            count += size(node.left) + 1
+            node = node.right
+        else:
+            return count + size(node.left) + (1 if inclusive else 0)
+    return count
+
+
+def select(root: Any, k: int) -> Any:
+    """
+    Returns the {k}th smallest value in the tree, counting from 0. Raises IndexError if k is out of range
+    """
+    if not 0 <= k < size(root):
+        raise IndexError(f"'k' must satisfy 0 <= k < {size(root)}, but got k={k}")
+    node = root
+    while True:
+        left_size = size(node.left)
+        if k < left_size:
+            node = node.left
+        elif k == left_size:
+            return node.val
+        else:
+            k -= left_size + 1
+            node = node.right
+
+
+def iter_values(root: Any, reverse: bool = False) -> Iterator[Any]:
+    """
+    Yields the values of the tree in ascending order, or descending order if {reverse}
+    """
+    return map(_get_val, iter_nodes(root, reverse))
+
+
+def irange(
+    root: Any,
+    lo: Any = None,
+    hi: Any = None,
+    inclusive: tuple[bool, bool] = (True, True),
+    reverse: bool = False,
+) -> Iterator[Any]:
+    """
+    Yields the values {v} of the tree with lo <= v <= hi in ascending order, or descending order if {reverse}.
+    {inclusive} says whether each bound is included. A bound of None means the range is open on that side
+    """
+    return map(_get_val, irange_nodes(root, lo, hi, inclusive, reverse))
+
+
+def iter_nodes(root: Any, reverse: bool = False) -> Iterator[Any]:
+    """
+    Yields the nodes of the tree in order of their values, ascending or descending if {reverse}.
+    Same walk as irange_nodes() without the bound checks, since full scans are the common case
+    """
+    stack = []
+    node = root
+    if reverse:
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node
+            node = node.left
+    else:
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+
+def irange_nodes(
+    root: Any,
+    lo: Any = None,
+    hi: Any = None,
+    inclusive: tuple[bool, bool] = (True, True),
+    reverse: bool = False,
+) -> Iterator[Any]:
+    """
+    Yields the nodes whose values are in the range, see irange()
+    """
+    include_lo, include_hi = inclusive
+    if reverse:
+        lo, hi = hi, lo
+        include_lo, include_hi = include_hi, include_lo
+
+    def before_start(val: Any) -> bool:
+        if lo is None:
+            return False
+        if reverse:
+            return lo < val or (val == lo and not include_lo)
+        return val < lo or (val == lo and not include_lo)
+
+    def after_end(val: Any) -> bool:
+        if hi is None:
+            return False
+        if reverse:
+            return val < hi or (val == hi and not include_hi)
+        return hi < val or (val == hi and not include_hi)
+
+    # near/far are the children towards smaller/larger values in the direction of the scan
+    near, far = ("right", "left") if reverse else ("left", "right")
+    # Seek: keep every node on the search path for lo that is inside the range, they are visited in stack order
+    stack = []
+    node = root
+    while node is not None:
+        if before_start(node.val):
+            node = getattr(node, far)
+        else:
+            stack.append(node)
+            node = getattr(node, near)
+    while stack:
+        node = stack.pop()
+        if after_end(node.val):
+            return
+        yield node
+        node = getattr(node, far)
+        while node is not None:
+            stack.append(node)
+            node = getattr(node, near)
+
+
+def floor_node(root: Any, val: Any, inclusive: bool = True) -> Any:
+    """
+    Returns the node with the largest value <= {val}, or < {val} if not {inclusive}. None if there is none
+    """
+    best = None
+    node = root
+    while node is not None:
+        node_val = node.val
+        if node_val < val or (inclusive and node_val == val):
+            best = node
+            node = node.right
+        else:
+            node = node.left
+    return best
+
+
+def ceiling_node(root: Any, val: Any, inclusive: bool = True) -> Any:
+    """
+    Returns the node with the smallest value >= {val}, or > {val} if not {inclusive}. None if there is none
+    """
+    best = None
+    node = root
+    while node is not None:
+        node_val = node.val
+        if val < node_val or (inclusive and node_val == val):
+            best = node
+            node = node.left
+        else:
+            node = node.right
+    return best
+
+
+class Cursor:
+    """
+    A position in a tree that can be moved to any value and stepped in both directions.
+
+        cursor = tree.cursor()
+        cursor.seek(100)
+        while cursor.valid and page_not_full:
+            use(cursor.value)
+            cursor.next()
+
+    The cursor keeps the path from the root to the current node, so it uses O(height) memory
+    and next()/prev() cost O(1) amortized. It is invalidated by any change to the tree.
+    """
+
+    def __init__(self, root: Any):
+        self._root = root
+        self._path: list[Any] = []
+
+    @property
+    def valid(self) -> bool:
+        """
+        True if the cursor points at a value. It does not after stepping off either end of the tree
+        """
+        return bool(self._path)
+
+    @property
+    def node(self) -> Any:
+        """
+        The node the cursor points at. Raises IndexError if the cursor is not valid
+        """
+        if not self._path:
+            raise IndexError("The cursor does not point at a node")
+        return self._path[-1]
+
+    @property
+    def value(self) -> Any:
+        """
+        The value the cursor points at. Raises IndexError if the cursor is not valid
+        """
+        if not self._path:
+            raise IndexError("The cursor does not point at a value")
+        return self._path[-1].val
+
+    def seek(self, val: Any) -> bool:
+        """
+        Moves to the smallest value >= {val}. Returns False, leaving the cursor invalid, if there is none
+        """
+        path = self._path
+        path.clear()
+        # Length of the path up to the best candidate seen so far
+        keep = 0
+        node = self._root
+        while node is not None:
+            path.append(node)
+            if node.val < val:
+                node = node.right
+            else:
+                keep = len(path)
+                if node.val == val:
+                    break
+                node = node.left
+        del path[keep:]
+        return keep > 0
+
+    def seek_first(self) -> bool:
+        """
+        Moves to the smallest value. Returns False if the tree is empty
+        """
+        return self._seek_end("left")
+
+    def seek_last(self) -> bool:
+        """
+        Moves to the largest value. Returns False if the tree is empty
+        """
+        return self._seek_end("right")
+
+    def next(self) -> bool:
+        """
+        Moves to the next larger value. Returns False, leaving the cursor invalid, if there is none
+        """
+        return self._step("left", "right")
+
+    def prev(self) -> bool:
+        """
+        Moves to the next smaller value. Returns False, leaving the cursor invalid, if there is none
+        """
+        return self._step("right", "left")
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the values from the current position onwards, leaving the cursor after the last one
+        """
+        while self._path:
+            yield self._path[-1].val
+            self.next()
+
+    def _seek_end(self, side: str) -> bool:
+        path = self._path
+        path.clear()
+        node = self._root
+        while node is not None:
+            path.append(node)
+            node = getattr(node, side)
+        return bool(path)
+
+    def _step(self, near: str, far: str) -> bool:
+        path = self._path
+        if not path:
+            return False
+        node = getattr(path[-1], far)
+        if node is not None:
+            # The next value is the nearest one in the far subtree
+            while node is not None:
+                path.append(node)
+                node = getattr(node, near)
+            return True
+        # Otherwise climb until we leave a subtree through its near side
+        child = path.pop()
+        while path and getattr(path[-1], far) is child:
+            child = path.pop()
+        return bool(path)
@@ -0,0 +1,223 @@
+"""A memory compact AVL Tree.
+
+AvlTree allocates one Python object per key. Even with __slots__, every node carries an object
+header plus a pointer for each field, and every small int height is a pointer to a shared int.
+At tens of millions of keys that overhead dominates.
+
+CompactAvlTree stores the same tree as a struct of arrays. A node is just an index.
+The links live in array('i') columns and the heights in an array('b') column
+(an AVL tree with 2^31 nodes is at most ~45 levels tall, so a byte is plenty).
+The keys live in a parallel list, which is the only per-node cost that still is a Python pointer.
+Deleted slots are chained into a free list through the left column and reused by later inserts.
+
+The public insert()/search()/delete()/is_empty() API mirrors AvlTree. The rebalancing logic is the same
+as AvlTree, rotations are just done by rewriting indices instead of attributes.
+compact_rbtree.py lays out a RedBlackTree the same way.
+"""
+
+from array import array
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+NIL = -1
+
+
+class CompactAvlTree(Generic[T]):
+    """
+    An AVL Tree whose nodes are stored column-wise in arrays and addressed by index
+    """
+
+    def __init__(self) -> None:
+        self.root = NIL
+        self.keys: list[T | None] = []
+        self.left = array("i")
+        self.right = array("i")
+        self.height = array("b")
+        self._free = NIL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __str__(self) -> str:
+        if self.root == NIL:
+            return "Empty-Tree"
+        return f"CompactAvlTree({self._size} keys)"
+
+    def _new_node(self, val: T) -> int:
+        index = self._free
+        if index != NIL:
+            self._free = self.left[index]
+            self.keys[index] = val
+            self.left[index] = NIL
+            self.right[index] = NIL
+            self.height[index] = 1
+        else:
+            index = len(self.keys)
+            self.keys.append(val)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.height.append(1)
+        return index
+
+    def _free_node(self, index: int) -> None:
+        self.keys[index] = None
+        self.left[index] = self._free
+        self._free = index
+
+    def _fix_height(self, index: int) -> None:
+        height = self.height
+        left = self.left[index]
+        right = self.right[index]
+        left_height = height[left] if left != NIL else 0
+        right_height = height[right] if right != NIL else 0
+        height[index] = 1 + (
+            left_height if left_height > right_height else right_height
+        )
+
+    def _balance(self, index: int) -> int:
+        height = self.height
+        left = self.left[index]
+        right = self.right[index]
+        left_height = height[left] if left != NIL else 0
+        right_height = height[right] if right != NIL else 0
+        return right_height - left_height
+
+    def _left_rotate(self, index: int) -> int:
+        """
+        Same transformation as AvlTree._left_rotate. Returns the index of the new subtree root
+        """
+        right_child = self.right[index]
+        self.right[index] = self.left[right_child]
+        self.left[right_child] = index
+        self._fix_height(index)
+        self._fix_height(right_child)
+        return right_child
+
+    def _right_rotate(self, index: int) -> int:
+        """
+        Same transformation as AvlTree._right_rotate. Returns the index of the new subtree root
+        """
+        left_child = self.left[index]
+        self.left[index] = self.right[left_child]
+        self.right[left_child] = index
+        self._fix_height(index)
+        self._fix_height(left_child)
+        return left_child
+
+    def _apply_rotation(self, index: int) -> int:
+        balance = self._balance(index)
+        if balance > 1:  # right heavy
+            if self._balance(self.right[index]) < 0:
+                self.right[index] = self._right_rotate(self.right[index])
+            return self._left_rotate(index)
+        elif balance < -1:  # left heavy
+            if self._balance(self.left[index]) > 0:
+                self.left[index] = self._left_rotate(self.left[index])
+            return self._right_rotate(index)
+        return index
+
+    def _rebalance(self, path: list[int]) -> None:
+        """
+        Fixes heights bottom-up along {path} (root first) and relinks any subtree that got rotated.
+        Stops at the first subtree whose height did not change, like AvlTree._rebalance
+        """
+        left, height = self.left, self.height
+        for i in range(len(path) - 1, -1, -1):
+            index = path[i]
+            old_height = height[index]
+            self._fix_height(index)
+            new_index = self._apply_rotation(index)
+            if new_index != index:
+                if i == 0:
+                    self.root = new_index
+                else:
+                    parent = path[i - 1]
+                    if left[parent] == index:
+                        left[parent] = new_index
+                    else:
+                        self.right[parent] = new_index
+            if height[new_index] == old_height:
+                return
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the tree is empty
+        """
+        return self.root == NIL
+
+    def search(self, val: T) -> bool:
+        """
+        Search for a key with {val} in the Tree
+        """
+        keys, left, right = self.keys, self.left, self.right
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                return True
+            index = left[index] if val < key else right[index]
+        return False
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree. If the value already exists, this is a noop
+        """
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                return
+            path.append(index)
+            index = left[index] if val < key else right[index]
+        new_index = self._new_node(val)
+        if not path:
+            self.root = new_index
+        else:
+            parent = path[-1]
+            if val < keys[parent]:
+                left[parent] = new_index
+            else:
+                right[parent] = new_index
+        self._size += 1
+        self._rebalance(path)
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree
+        """
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                break
+            path.append(index)
+            index = left[index] if val < key else right[index]
+        if index == NIL:
+            return
+        if left[index] != NIL and right[index] != NIL:
+            # Like AvlTree, replace the value with the max of the left subtree and unlink that node instead
+            target = index
+            path.append(index)
+            index = left[index]
+            while right[index] != NIL:
+                path.append(index)
+                index = right[index]
+            keys[target] = keys[index]
+        child = left[index] if left[index] != NIL else right[index]
+        if not path:
+            self.root = child
+        else:
+            parent = path[-1]
+            if left[parent] == index:
+                left[parent] = child
+            else:
+                right[parent] = child
+        self._free_node(index)
+        self._size -= 1
+        self._rebalance(path)
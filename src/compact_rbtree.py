@@ -0,0 +1,282 @@
+"""A memory compact Red Black Tree.
+
+The RedBlackTree counterpart of CompactAvlTree, see compact_avltree.py for why a struct of arrays.
+A node is an index. Its links, including the parent link the fixups walk up along, live in array('i')
+columns and its color in an array('b') column, so a color costs one byte instead of a pointer to an
+Enum member. The keys live in a parallel list. Deleted slots are chained into a free list through the
+left column and reused by later inserts.
+
+The public insert()/search()/delete()/is_empty() API mirrors RedBlackTree, and the fixups are the same
+as RedBlackTree's, with rotations rewriting indices instead of attributes. Unlike RedBlackTree, a delete
+of a node with two children copies the key of its predecessor into it, like CompactAvlTree, as an index
+has no identity worth keeping.
+"""
+
+from array import array
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+NIL = -1
+RED = 0
+BLACK = 1
+
+
+class CompactRedBlackTree(Generic[T]):
+    """
+    A Red Black Tree whose nodes are stored column-wise in arrays and addressed by index
+    """
+
+    def __init__(self) -> None:
+        self.root = NIL
+        self.keys: list[T | None] = []
+        self.left = array("i")
+        self.right = array("i")
+        self.parent = array("i")
+        self.color = array("b")
+        self._free = NIL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __str__(self) -> str:
+        if self.root == NIL:
+            return "Empty-Tree"
+        return f"CompactRedBlackTree({self._size} keys)"
+
+    def _new_node(self, val: T, parent: int) -> int:
+        index = self._free
+        if index != NIL:
+            self._free = self.left[index]
+            self.keys[index] = val
+            self.left[index] = NIL
+            self.right[index] = NIL
+            self.parent[index] = parent
+            self.color[index] = RED
+        else:
+            index = len(self.keys)
+            self.keys.append(val)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.parent.append(parent)
+            self.color.append(RED)
+        return index
+
+    def _free_node(self, index: int) -> None:
+        self.keys[index] = None
+        self.left[index] = self._free
+        self._free = index
+
+    def _is_red(self, index: int) -> bool:
+        return index != NIL and self.color[index] == RED
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        """
+        Hangs {new} from {parent} where {old} was, or makes it the root if {parent} is NIL
+        """
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _left_rotate(self, index: int) -> None:
+        """
+        Same transformation as RedBlackTree._left_rotate
+        """
+        left, right, parent = self.left, self.right, self.parent
+        right_child = right[index]
+        moved = left[right_child]
+        right[index] = moved
+        if moved != NIL:
+            parent[moved] = index
+        self._replace_child(parent[index], index, right_child)
+        parent[right_child] = parent[index]
+        left[right_child] = index
+        parent[index] = right_child
+
+    def _right_rotate(self, index: int) -> None:
+        """
+        Same transformation as RedBlackTree._right_rotate
+        """
+        left, right, parent = self.left, self.right, self.parent
+        left_child = left[index]
+        moved = right[left_child]
+        left[index] = moved
+        if moved != NIL:
+            parent[moved] = index
+        self._replace_child(parent[index], index, left_child)
+        parent[left_child] = parent[index]
+        right[left_child] = index
+        parent[index] = left_child
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the tree is empty
+        """
+        return self.root == NIL
+
+    def search(self, val: T) -> bool:
+        """
+        Search for a key with {val} in the Tree
+        """
+        keys, left, right = self.keys, self.left, self.right
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                return True
+            index = left[index] if val < key else right[index]
+        return False
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree. If the value already exists, this is a noop
+        """
+        keys, left, right = self.keys, self.left, self.right
+        parent = NIL
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                return
+            parent = index
+            index = left[index] if val < key else right[index]
+        new_index = self._new_node(val, parent)
+        if parent == NIL:
+            self.root = new_index
+        elif val < keys[parent]:
+            left[parent] = new_index
+        else:
+            right[parent] = new_index
+        self._size += 1
+        self._insert_fixup(new_index)
+
+    def _insert_fixup(self, index: int) -> None:
+        """
+        Same as RedBlackTree._insert_fixup: resolves a red node with a red parent bottom-up
+        """
+        left, parent_of, color = self.left, self.parent, self.color
+        parent = parent_of[index]
+        while parent != NIL and color[parent] == RED:
+            # parent is red, so it is not the root and grandparent exists
+            grandparent = parent_of[parent]
+            if parent == left[grandparent]:
+                uncle = self.right[grandparent]
+                if self._is_red(uncle):
+                    color[parent] = BLACK
+                    color[uncle] = BLACK
+                    color[grandparent] = RED
+                    index = grandparent
+                else:
+                    if index == self.right[parent]:
+                        index = parent
+                        self._left_rotate(index)
+                        parent = parent_of[index]
+                    color[parent] = BLACK
+                    color[grandparent] = RED
+                    self._right_rotate(grandparent)
+            else:
+                uncle = left[grandparent]
+                if self._is_red(uncle):
+                    color[parent] = BLACK
+                    color[uncle] = BLACK
+                    color[grandparent] = RED
+                    index = grandparent
+                else:
+                    if index == left[parent]:
+                        index = parent
+                        self._right_rotate(index)
+                        parent = parent_of[index]
+                    color[parent] = BLACK
+                    color[grandparent] = RED
+                    self._left_rotate(grandparent)
+            parent = parent_of[index]
+        color[self.root] = BLACK
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree
+        """
+        keys, left, right = self.keys, self.left, self.right
+        index = self.root
+        while index != NIL:
+            key = keys[index]
+            if key == val:
+                break
+            index = left[index] if val < key else right[index]
+        if index == NIL:
+            return
+        if left[index] != NIL and right[index] != NIL:
+            # Replace the value with the max of the left subtree and unlink that node instead
+            target = index
+            index = left[index]
+            while right[index] != NIL:
+                index = right[index]
+            keys[target] = keys[index]
+        # index has at most one child, which moves up into its place
+        child = left[index] if left[index] != NIL else right[index]
+        child_parent = self.parent[index]
+        self._replace_child(child_parent, index, child)
+        if child != NIL:
+            self.parent[child] = child_parent
+        if self.color[index] == BLACK:
+            self._delete_fixup(child, child_parent)
+        self._free_node(index)
+        self._size -= 1
+
+    def _delete_fixup(self, index: int, parent: int) -> None:
+        """
+        Same as RedBlackTree._delete_fixup: every path through {index} is one black short.
+        {index} can be NIL, which is why its parent is passed in explicitly
+        """
+        left, right, color = self.left, self.right, self.color
+        while index != self.root and not self._is_red(index):
+            if index == left[parent]:
+                sibling = right[parent]
+                if color[sibling] == RED:
+                    color[sibling] = BLACK
+                    color[parent] = RED
+                    self._left_rotate(parent)
+                    sibling = right[parent]
+                if not self._is_red(left[sibling]) and not self._is_red(right[sibling]):
+                    color[sibling] = RED
+                    index = parent
+                    parent = self.parent[index]
+                else:
+                    if not self._is_red(right[sibling]):
+                        color[left[sibling]] = BLACK
+                        color[sibling] = RED
+                        self._right_rotate(sibling)
+                        sibling = right[parent]
+                    color[sibling] = color[parent]
+                    color[parent] = BLACK
+                    color[right[sibling]] = BLACK
+                    self._left_rotate(parent)
+                    index = self.root
+            else:
+                sibling = left[parent]
+                if color[sibling] == RED:
+                    color[sibling] = BLACK
+                    color[parent] = RED
+                    self._right_rotate(parent)
+                    sibling = left[parent]
+                if not self._is_red(left[sibling]) and not self._is_red(right[sibling]):
+                    color[sibling] = RED
+                    index = parent
+                    parent = self.parent[index]
+                else:
+                    if not self._is_red(left[sibling]):
+                        color[right[sibling]] = BLACK
+                        color[sibling] = RED
+                        self._left_rotate(sibling)
+                        sibling = left[parent]
+                    color[sibling] = color[parent]
+                    color[parent] = BLACK
+                    color[left[sibling]] = BLACK
+                    self._right_rotate(parent)
+                    index = self.root
+        if index != NIL:
+            color[index] = BLACK
@@ -0,0 +1,351 @@
+"""Thread safe wrappers around AvlTree and RedBlackTree.
+
+Nothing in AvlTree or RedBlackTree is safe to use from several threads at once: an insert relinks nodes
+that a concurrent search may be walking through. A single lock around the tree is safe, but it also
+makes every reader wait for every other reader.
+
+ConcurrentTree guards the tree with an RWLock instead, so any number of searches run at the same time
+and only updates are exclusive. On a build with the GIL the readers still take turns running bytecode,
+so what this buys there is mostly that readers don't queue behind each other's lock handoffs. On a free
+threaded build (3.13t and later) they actually run in parallel.
+
+Updates go through a write queue with flat combining. insert() and delete() append the operation to a
+queue and then wait for the combiner lock. Whichever writer gets it takes every operation queued so far
+and applies them all under a single write lock acquisition, so the writers that queued behind it find
+their operation already applied and return without touching the tree. Under contention the readers are
+blocked once per batch instead of once per update. Within a batch only the last operation on each value
+matters, so the batch is sorted, reduced to one insert or delete per value, and applied with
+delete_many() and insert_many() where the tree has them, which rebuild the tree in O(n + m) for a large
+batch. Either way, an update is visible to every reader by the time insert() or delete() returns.
+If applying a batch raises, nothing in it counts as applied yet. The combiner applies its operations
+again one at a time in queue order, which ends in the same tree as the batch would have, and an operation
+that raises on its own hands its exception to the writer that queued it. The other writers return normally.
+A BaseException like KeyboardInterrupt puts the batch back at the front of the queue for the next combiner.
+
+StripedConcurrentTree shards the values by key range into several ConcurrentTrees, each with its own
+locks, so updates to different ranges don't wait for each other at all.
+
+Classes:
+    - RWLock: A writer preferring readers-writer lock.
+    - ConcurrentTree, ConcurrentAvlTree, ConcurrentRedBlackTree: A tree behind an RWLock with batched writes.
+    - StripedConcurrentTree: ConcurrentTrees sharded by key range.
+
+Notes:
+    - The RWLock is not reentrant. A thread holding it must not acquire it again.
+    - Iterating a ConcurrentTree copies its values under the read lock first. Iterating a
+      StripedConcurrentTree does the same one stripe at a time, so it is not an atomic snapshot across
+      stripes. See persistent_avltree.py for a tree whose readers need no lock at all.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Any, Generic, Iterable, Iterator, Sequence, TypeVar
+
+from avltree import AvlTree
+from rbtree import RedBlackTree
+
+T = TypeVar("T")
+
+_INSERT = True
+_DELETE = False
+
+
+class RWLock:
+    """
+    Any number of readers or one writer at a time. A waiting writer keeps new readers out, so a steady
+    stream of readers can't starve the writers
+    """
+
+    def __init__(self):
+        # The readers only ever enter the mutex directly, which is cheaper than entering the condition.
+        # They wait on the condition only while a writer holds or wants the lock
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._mutex:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._mutex:
+            self._readers -= 1
+            if self._readers == 0 and self._waiting_writers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._mutex:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._mutex:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentTree(Generic[T]):
+    """
+    A tree that any number of threads can search and update at once. See the module docstring
+    """
+
+    tree_type: type = AvlTree
+
+    def __init__(self, tree: AvlTree[T] | RedBlackTree[T] | None = None):
+        self.tree = tree if tree is not None else self.tree_type()
+        self.lock = RWLock()
+        # The write queue. Operations get consecutive tickets, and every ticket up to _applied is in the tree
+        self._pending: list[tuple[bool, T]] = []
+        self._pending_lock = threading.Lock()
+        self._combiner_lock = threading.Lock()
+        self._enqueued = 0
+        self._applied = 0
+        # Exceptions of operations that failed, by ticket, until their writer picks them up
+        self._errors: dict[int, Exception] = {}
+        # How many batches were applied, and how many operations they held. For tests and benchmarks
+        self.batches = 0
+        self.batched_operations = 0
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[T]) -> "ConcurrentTree[T]":
+        return cls(cls.tree_type.from_sorted(iterable))
+
+    def search(self, val: T) -> bool:
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return self.tree.search(val)
+        finally:
+            lock.release_read()
+
+    def __contains__(self, val: T) -> bool:
+        return self.search(val)
+
+    def contains_many(self, vals: Iterable[T]) -> list[bool]:
+        """
+        Whether each value in {vals} is in the tree, all under one read lock
+        """
+        vals = list(vals)
+        with self.lock.read():
+            search = self.tree.search
+            return [search(val) for val in vals]
+
+    def __len__(self) -> int:
+        with self.lock.read():
+            return len(self.tree)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates a copy of the values, taken under the read lock
+        """
+        with self.lock.read():
+            values = list(self.tree)
+        return iter(values)
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts {val}. Returns once it is in the tree, possibly inserted by another writer's batch
+        """
+        self._write(_INSERT, val)
+
+    def delete(self, val: T) -> None:
+        """
+        Deletes {val}. Returns once it is gone from the tree, possibly deleted by another writer's batch
+        """
+        self._write(_DELETE, val)
+
+    def insert_many(self, vals: Iterable[T]) -> None:
+        self._write_many(_INSERT, vals)
+
+    def delete_many(self, vals: Iterable[T]) -> None:
+        self._write_many(_DELETE, vals)
+
+    def _write(self, operation: bool, val: T) -> None:
+        with self._pending_lock:
+            self._pending.append((operation, val))
+            self._enqueued += 1
+            ticket = self._enqueued
+        self._combine(ticket, ticket)
+
+    def _write_many(self, operation: bool, vals: Iterable[T]) -> None:
+        operations = [(operation, val) for val in vals]
+        with self._pending_lock:
+            self._pending.extend(operations)
+            self._enqueued += len(operations)
+            ticket = self._enqueued
+        self._combine(ticket - len(operations) + 1, ticket)
+
+    def _combine(self, first: int, ticket: int) -> None:
+        """
+        Waits until the operations with tickets {first} to {ticket} are applied, applying everything queued
+        if no one else has. Raises the exception of the first of them that failed
+        """
+        with self._combiner_lock:
+            if self._applied < ticket:
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                    last = self._enqueued
+                self.lock.acquire_write()
+                try:
+                    try:
+                        self._apply(batch)
+                    except Exception:
+                        self._apply_one_at_a_time(batch, last - len(batch) + 1)
+                except BaseException:
+                    # Interrupted, e.g. by KeyboardInterrupt. Put the batch back in front of what was
+                    # queued since, so its writers keep waiting for it instead of returning as if it was
+                    # applied. Applying it again ends in the same tree
+                    with self._pending_lock:
+                        self._pending[:0] = batch
+                    for failed in range(last - len(batch) + 1, last + 1):
+                        self._errors.pop(failed, None)
+                    raise
+                finally:
+                    self.lock.release_write()
+                self._applied = last
+                self.batches += 1
+                self.batched_operations += len(batch)
+            if self._errors:
+                failed = sorted(t for t in self._errors if first <= t <= ticket)
+                errors = [self._errors.pop(t) for t in failed]
+                if errors:
+                    raise errors[0]
+
+    def _apply_one_at_a_time(self, batch: list[tuple[bool, T]], first: int) -> None:
+        """
+        Applies {batch}, whose first operation has ticket {first}, in queue order and records the
+        exception of every operation that raises
+        """
+        tree = self.tree
+        for ticket, (operation, val) in enumerate(batch, first):
+            try:
+                if operation is _INSERT:
+                    tree.insert(val)
+                else:
+                    tree.delete(val)
+            except Exception as error:
+                self._errors[ticket] = error
+
+    def _apply(self, batch: list[tuple[bool, T]]) -> None:
+        tree = self.tree
+        if len(batch) == 1:
+            operation, val = batch[0]
+            if operation is _INSERT:
+                tree.insert(val)
+            else:
+                tree.delete(val)
+            return
+        # The sort is stable, so the last of a run of equal values is the last operation on that value.
+        # It sorts a copy, as the batch is applied again in queue order if this raises
+        batch = sorted(batch, key=itemgetter(1))
+        inserts, deletes = [], []
+        for i, (operation, val) in enumerate(batch):
+            if i + 1 < len(batch) and batch[i + 1][1] == val:
+                continue
+            (inserts if operation is _INSERT else deletes).append(val)
+        if hasattr(tree, "delete_many"):
+            tree.delete_many(deletes)
+            tree.insert_many(inserts)
+            return
+        for val in deletes:
+            tree.delete(val)
+        for val in inserts:
+            tree.insert(val)
+
+
+class ConcurrentAvlTree(ConcurrentTree[T]):
+    tree_type = AvlTree
+
+
+class ConcurrentRedBlackTree(ConcurrentTree[T]):
+    tree_type = RedBlackTree
+
+
+class StripedConcurrentTree(Generic[T]):
+    """
+    ConcurrentTrees for consecutive key ranges. Stripe i holds the values v with
+    boundaries[i - 1] <= v < boundaries[i]
+    """
+
+    def __init__(self, boundaries: Sequence[T], tree_type: type = AvlTree):
+        boundaries = list(boundaries)
+        for lower, upper in zip(boundaries, boundaries[1:]):
+            if not lower < upper:
+                raise ValueError(
+                    f"'boundaries' must be strictly ascending, but got {upper!r} after {lower!r}"
+                )
+        self.boundaries = boundaries
+        self.stripes = [ConcurrentTree(tree_type()) for _ in range(len(boundaries) + 1)]
+
+    @classmethod
+    def from_sorted(
+        cls, values: Sequence[T], stripes: int = 8, tree_type: type = AvlTree
+    ) -> "StripedConcurrentTree[T]":
+        """
+        Builds {stripes} stripes holding about the same number of the ascending {values} each
+        """
+        if stripes < 1:
+            raise ValueError(f"'stripes' must be at least 1, but got stripes={stripes}")
+        values = list(values)
+        cuts = sorted(
+            {values[i * len(values) // stripes] for i in range(1, stripes)}
+            if values
+            else ()
+        )
+        striped = cls(cuts, tree_type)
+        start = 0
+        for stripe, cut in zip(striped.stripes, cuts + [None]):
+            end = len(values) if cut is None else bisect_left(values, cut, start)
+            stripe.tree = tree_type.from_sorted(values[start:end])
+            start = end
+        return striped
+
+    def _stripe(self, val: T) -> ConcurrentTree[T]:
+        return self.stripes[bisect_right(self.boundaries, val)]
+
+    def search(self, val: T) -> bool:
+        return self._stripe(val).search(val)
+
+    def __contains__(self, val: T) -> bool:
+        return self._stripe(val).search(val)
+
+    def insert(self, val: T) -> None:
+        self._stripe(val).insert(val)
+
+    def delete(self, val: T) -> None:
+        self._stripe(val).delete(val)
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self.stripes)
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterates the stripes in order, each one copied under its own read lock
+        """
+        for stripe in self.stripes:
+            yield from stripe
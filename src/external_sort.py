@@ -0,0 +1,232 @@
+"""
+external_sort.py
+
+Sorts binary files of fixed width numbers that are larger than memory.
+
+sort_file() is a two phase external merge sort:
+    - runs: The input file is memory mapped and cut into chunks of {memory_limit} bytes. Each chunk is
+      copied out once into an array.array, sorted in place with quicksort() (numpy's sort, through a
+      zero copy view, when numpy is installed) and appended to a temporary runs file next to the output.
+    - merge: The sorted runs are merged with heapq.merge. Every run is read through its own buffer of
+      about memory_limit / (runs + 1) bytes and the output is written through one more, so the memory
+      used stays around {memory_limit} and the disk only sees large sequential reads and writes.
+When the whole input fits in one chunk there is nothing to merge and the runs file becomes the output.
+
+Functions:
+    - sort_file: Sorts a binary file of numbers into another file.
+
+Notes:
+    - The numbers are in native byte order, as written by array.tofile() or ndarray.tofile().
+    - The runs file is as large as the input, so the output directory needs room for twice the input
+      until the merge is done.
+    - This lives in its own module rather than in hoare_partition.py because it sorts with quicksort(),
+      which itself imports hoare_partition.py.
+"""
+
+import heapq
+import mmap
+import os
+import secrets
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from quicksort import quicksort
+
+DEFAULT_MEMORY_LIMIT = 64 * 2**20
+# No read or write buffer is made smaller than this, however many runs there are
+MIN_BUFFER_BYTES = 64 * 2**10
+# struct format characters of the numbers that can be sorted
+_TYPECODES = "bBhHiIlLqQfd"
+
+
+@dataclass
+class ExternalSortStats:
+    """
+    What sort_file() did, and how long each phase took in seconds
+    """
+
+    items: int = 0
+    runs: int = 0
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+
+
+def sort_file(
+    in_path: str | os.PathLike,
+    out_path: str | os.PathLike,
+    dtype: str = "q",
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    progress: Callable[[str, int, int], None] | None = None,
+) -> ExternalSortStats:
+    """
+    Sorts the numbers in the binary file {in_path} in ascending order into {out_path}, using about
+    {memory_limit} bytes of memory. The input file is not modified.
+
+    Args:
+        in_path (PathLike): The file to sort. Its size must be a multiple of the item size.
+        out_path (PathLike): Where to write the sorted numbers. Replaced if it exists.
+        dtype (str): The array.array typecode of the numbers, e.g. "q" for int64 or "d" for float64.
+        memory_limit (int): How many bytes of numbers to hold in memory at once. Must hold at least one number.
+        progress (Callable | None): Called as progress(phase, done, total) after every chunk in the "runs"
+            phase and every output buffer in the "merge" phase, with done and total in bytes.
+
+    Returns:
+        ExternalSortStats: The number of items and runs, and the seconds spent in each phase.
+
+    Raises:
+        ValueError: If `dtype` is not a numeric typecode, `memory_limit` is smaller than one item,
+            or the size of the input is not a multiple of the item size.
+
+    Examples:
+        >>> array("q", [3, 1, 2]).tofile(open("in.bin", "wb"))
+        >>> sort_file("in.bin", "out.bin", "q").runs
+        1
+    """
+    if dtype not in _TYPECODES:
+        raise ValueError(
+            f"'dtype' must be one of the typecodes {_TYPECODES!r}, but got dtype={dtype!r}"
+        )
+    itemsize = array(dtype).itemsize
+    chunk_bytes = memory_limit // itemsize * itemsize
+    if chunk_bytes == 0:
+        raise ValueError(
+            f"'memory_limit' must hold at least one item of {itemsize} bytes, but got {memory_limit}"
+        )
+    total = os.path.getsize(in_path)
+    if total % itemsize:
+        raise ValueError(
+            f"The size of {in_path} ({total} bytes) is not a multiple of the item size {itemsize}"
+        )
+    stats = ExternalSortStats(items=total // itemsize)
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    runs_fd, runs_path = _create_runs_file(out_dir)
+    try:
+        start = time.perf_counter()
+        with os.fdopen(runs_fd, "wb") as runs_file:
+            runs = _write_runs(in_path, runs_file, dtype, chunk_bytes, total, progress)
+        stats.runs = len(runs)
+        stats.phase_seconds["runs"] = time.perf_counter() - start
+        start = time.perf_counter()
+        if len(runs) <= 1:
+            os.replace(runs_path, out_path)
+        else:
+            buffer_bytes = max(MIN_BUFFER_BYTES, memory_limit // (len(runs) + 1))
+            _merge_runs(runs_path, runs, out_path, dtype, buffer_bytes, total, progress)
+        stats.phase_seconds["merge"] = time.perf_counter() - start
+    finally:
+        if os.path.exists(runs_path):
+            os.remove(runs_path)
+    return stats
+
+
+def _create_runs_file(out_dir: str) -> tuple[int, str]:
+    """
+    Creates a new file with a unique name in {out_dir} and returns its descriptor and path.
+    Unlike tempfile.mkstemp() it is created with the mode the umask gives a new file, as it
+    becomes the output when there is only one run
+    """
+    while True:
+        path = os.path.join(out_dir, f".sort_file-{secrets.token_hex(8)}.runs")
+        try:
+            return (
+                os.open(
+                    path,
+                    os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                    0o666,
+                ),
+                path,
+            )
+        except FileExistsError:
+            continue
+
+
+def _write_runs(
+    in_path: str | os.PathLike,
+    runs_file,
+    dtype: str,
+    chunk_bytes: int,
+    total: int,
+    progress: Callable[[str, int, int], None] | None,
+) -> list[tuple[int, int]]:
+    """
+    Sorts {in_path} chunk by chunk into {runs_file}. Returns the (start, end) byte offsets of the runs
+    """
+    runs = []
+    if total == 0:
+        return runs
+    with open(in_path, "rb") as source, mmap.mmap(
+        source.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        with memoryview(mapped) as whole:
+            for start in range(0, total, chunk_bytes):
+                end = min(start + chunk_bytes, total)
+                chunk = array(dtype)
+                chunk.frombytes(whole[start:end])
+                quicksort(chunk)
+                runs_file.write(chunk)
+                runs.append((start, end))
+                if progress is not None:
+                    progress("runs", end, total)
+    return runs
+
+
+def _read_run(
+    runs_file, start: int, end: int, dtype: str, buffer_bytes: int
+) -> Iterator:
+    """
+    Yields the numbers in runs_file[start:end], reading {buffer_bytes} at a time.
+    An unbuffered read may return fewer bytes than asked for, so a block is read until it is complete.
+    Raises EOFError if the file ends before the run does
+    """
+    itemsize = array(dtype).itemsize
+    buffer_bytes = max(itemsize, buffer_bytes // itemsize * itemsize)
+    while start < end:
+        size = min(buffer_bytes, end - start)
+        runs_file.seek(start)
+        data = runs_file.read(size)
+        while len(data) < size:
+            more = runs_file.read(size - len(data))
+            if not more:
+                raise EOFError(
+                    f"The runs file ends at byte {start + len(data)}, inside the run ending at {end}"
+                )
+            data += more
+        block = array(dtype)
+        block.frombytes(data)
+        start += size
+        yield from block
+
+
+def _merge_runs(
+    runs_path: str,
+    runs: list[tuple[int, int]],
+    out_path: str | os.PathLike,
+    dtype: str,
+    buffer_bytes: int,
+    total: int,
+    progress: Callable[[str, int, int], None] | None,
+) -> None:
+    """
+    Merges the sorted {runs} of {runs_path} into {out_path}
+    """
+    out_items = max(1, buffer_bytes // array(dtype).itemsize)
+    written = 0
+    # Every reader seeks before it reads a block, so they can share one unbuffered file. The output is
+    # buffered, as only a buffered write() is sure to write the whole block
+    with open(runs_path, "rb", buffering=0) as runs_file, open(out_path, "wb") as out:
+        readers = [
+            _read_run(runs_file, start, end, dtype, buffer_bytes) for start, end in runs
+        ]
+        output = array(dtype)
+        for value in heapq.merge(*readers):
+            output.append(value)
+            if len(output) == out_items:
+                written += out.write(output)
+                del output[:]
+                if progress is not None:
+                    progress("merge", written, total)
+        if output:
+            written += out.write(output)
+            if progress is not None:
+                progress("merge", written, total)
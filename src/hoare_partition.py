@@ -11,13 +11,46 @@ Functions:
       the pivot remains in its original position during the partitioning process.
     - hoare_partition_var2: Implements a variation of the Hoare partitioning scheme where
       the pivot is swapped to the start of the range before partitioning.
+    - partition_3way: The Bentley-McIlroy three-way ("fat") partition, which gathers every element
+      equal to the pivot in the middle of the range.
+    - dual_pivot_partition: Yaroslavskiy's dual-pivot partition, which splits the range into three
+      parts around two pivots.
 
 Notes:
-    - Both variations perform the partitioning in-place, meaning no additional memory is allocated.
-    - These implementations are efficient for arrays with many repeated elements and perform fewer
-      swaps compared to the Lomuto partitioning scheme.
+    - All variations perform the partitioning in-place, meaning no additional memory is allocated.
+    - The two Hoare variations split runs of repeated elements evenly and perform fewer swaps than
+      the Lomuto partitioning scheme. They still swap equal elements with each other, and the equal
+      elements end up on both sides, so a sort partitions them again and again.
+    - partition_3way is the one to use for keys with few distinct values. The elements equal to the
+      pivot are left out of both sides, so a range with k distinct values is finished after at most k
+      partitions, whatever its length.
+    - hoare_partition_var2 also takes numpy arrays, and array.array or memoryview buffers of numbers.
+      Those are partitioned in place by numpy_backend.block_partition, which does the bulk of the work
+      a block at a time and returns the final position of the pivot, as var2 does for a list.
+      hoare_partition_var1 always runs its scalar loop, as its return value is defined by that loop
+      and not by where the pivot ends up. Lists always take the scalar loops below.
 """
 
+from numpy_backend import as_ndarray, block_partition
+
+
+def _check_range(nums: list[int], left: int, right: int, pivot_index: int) -> None:
+    """
+    Raises the errors documented by the partition functions when the range or pivot is out of bounds
+    """
+    if not (0 <= left <= right):
+        raise ValueError(
+            f"The 'left' argument must satisfy 0 <= left <= right, but got left={left} and right={right}."
+        )
+    if not (0 <= right < len(nums)):
+        raise ValueError(
+            f"'right' must satisfy 0 <= right < len(nums), but got right={right} and len(nums)={len(nums)}"
+        )
+    if not (left <= pivot_index <= right):
+        raise IndexError(
+            f"'pivot_index' must satisfy left <= pivot_index <= right, but got pivot_index={pivot_index}, left={left}, and right={right}."
+        )
+
 
 def hoare_partition_var1(
     nums: list[int], left: int, right: int, pivot_index: int
@@ -71,18 +104,7 @@ def hoare_partition_var1(
         >>> nums
         [3, 2, 4, 7, 5]
     """
-    if not (0 <= left <= right):
-        raise ValueError(
-            f"The 'left' argument must satisfy 0 <= left <= right, but got left={left} and right={right}."
-        )
-    if not (0 <= right < len(nums)):
-        raise ValueError(
-            f"'right' must satisfy 0 <= right < len(nums), but got right={right} and len(nums)={len(nums)}"
-        )
-    if not (left <= pivot_index <= right):
-        raise IndexError(
-            f"'pivot_index' must satisfy left <= pivot_index <= right, but got pivot_index={pivot_index}, left={left}, and right={right}."
-        )
+    _check_range(nums, left, right, pivot_index)
     pivot = nums[pivot_index]
     i = left - 1
     j = right + 1
@@ -141,6 +163,10 @@ def hoare_partition_var2(nums: list[int], left: int, right: int, pivot_index: in
         >>> nums
         [2, 3, 4, 7, 5]
     """
+    arr = as_ndarray(nums)
+    if arr is not None:
+        _check_range(arr, left, right, pivot_index)
+        return block_partition(arr, left, right, pivot_index)
     pivot = nums[pivot_index]
     nums[left], nums[pivot_index] = nums[pivot_index], nums[left]
     i = left
@@ -156,3 +182,170 @@ def hoare_partition_var2(nums: list[int], left: int, right: int, pivot_index: in
             nums[j], nums[left] = nums[left], nums[j]
             return j  # Return the partition index
         nums[i], nums[j] = nums[j], nums[i]
+
+
+def partition_3way(
+    nums: list[int], left: int, right: int, pivot_index: int
+) -> tuple[int, int]:
+    """
+    Perform the Bentley-McIlroy three-way partitioning scheme on a list of integers.
+
+    This function partitions `nums[left..right]` into three segments based on a pivot element:
+    - All elements in the range `nums[left..lt-1]` are less than the pivot.
+    - All elements in the range `nums[lt..gt]` are equal to the pivot.
+    - All elements in the range `nums[gt+1..right]` are greater than the pivot.
+
+    The scan is the one of hoare_partition_var2: i moves right over smaller elements, j moves left over
+    greater ones, and the two are swapped when both stop. In addition, an element equal to the pivot that
+    i or j stops on is swapped out to the far left or far right end of the range. Once i and j cross, the
+    two ends are swapped into the middle. Equal elements are therefore swapped at most twice each, and
+    the range in between is scanned exactly like in a two-way partition, so when all keys are distinct
+    this costs about the same as hoare_partition_var2.
+
+    Use this variation when the keys have few distinct values. The equal segment can be left out of
+    any further partitioning.
+
+    The partitioning is done in-place, meaning no additional memory is allocated.
+
+    Args:
+        nums (list[int]): The list of integers to partition. Must be non-empty.
+        left (int): The starting index of the range to partition. Must satisfy `0 <= left <= right`.
+        right (int): The ending index of the range to partition. Must satisfy `0 <= right < len(nums)`.
+        pivot_index (int): The index of the pivot element in the list. Must satisfy `left <= pivot_index <= right`.
+
+    Returns:
+        tuple[int, int]: The bounds `(lt, gt)` of the segment equal to the pivot. It is never empty,
+        as it holds at least the pivot itself.
+
+    Raises:
+        IndexError: If `pivot_index` is out of the range `[left, right]`.
+        ValueError: If `left` or `right` are out of bounds or if `left > right`.
+
+    Examples:
+        >>> nums = [2, 1, 2, 3, 2, 0]
+        >>> partition_3way(nums, 0, 5, 0)
+        (2, 4)
+        >>> nums
+        [1, 0, 2, 2, 2, 3]
+    """
+    _check_range(nums, left, right, pivot_index)
+    if left == right:
+        return left, right
+    pivot = nums[pivot_index]
+    nums[left], nums[pivot_index] = nums[pivot_index], nums[left]
+    # nums[left..p] and nums[q..right] hold elements equal to the pivot
+    i, j = left, right + 1
+    p, q = left, right + 1
+    while True:
+        i += 1
+        while nums[i] < pivot:
+            if i == right:
+                break
+            i += 1
+        j -= 1
+        while pivot < nums[j]:
+            j -= 1
+        if i == j and nums[i] == pivot:
+            p += 1
+            nums[p], nums[i] = nums[i], nums[p]
+        if i >= j:
+            break
+        nums[i], nums[j] = nums[j], nums[i]
+        if nums[i] == pivot:
+            p += 1
+            nums[p], nums[i] = nums[i], nums[p]
+        if nums[j] == pivot:
+            q -= 1
+            nums[q], nums[j] = nums[j], nums[q]
+    # Everything up to j is <= pivot and everything after it is >= pivot. Swap both ends next to j
+    i = j + 1
+    for k in range(left, p + 1):
+        nums[k], nums[j] = nums[j], nums[k]
+        j -= 1
+    for k in range(right, q - 1, -1):
+        nums[k], nums[i] = nums[i], nums[k]
+        i += 1
+    return j + 1, i - 1
+
+
+def dual_pivot_partition(
+    nums: list[int], left: int, right: int, pivot1_index: int, pivot2_index: int
+) -> tuple[int, int]:
+    """
+    Perform Yaroslavskiy's dual-pivot partitioning scheme on a list of integers.
+
+    Two pivots p <= q split `nums[left..right]` into five segments:
+    - All elements in the range `nums[left..lt-1]` are less than p.
+    - `nums[lt]` is p.
+    - All elements in the range `nums[lt+1..gt-1]` are between p and q, inclusive.
+    - `nums[gt]` is q.
+    - All elements in the range `nums[gt+1..right]` are greater than q.
+
+    A single scan from the left sorts every element into one of the three parts, so each element is
+    compared about 1.5 times on average. A sort that splits every range in three needs fewer levels
+    than one that splits in two, and with that fewer passes over the data.
+
+    If p == q, the middle segment holds only elements equal to both pivots and needs no further
+    partitioning.
+
+    The partitioning is done in-place, meaning no additional memory is allocated.
+
+    Args:
+        nums (list[int]): The list of integers to partition. Must have at least two elements.
+        left (int): The starting index of the range to partition. Must satisfy `0 <= left <= right`.
+        right (int): The ending index of the range to partition. Must satisfy `0 <= right < len(nums)`.
+        pivot1_index (int): The index of one pivot. Must satisfy `left <= pivot1_index <= right`.
+        pivot2_index (int): The index of the other pivot. Must satisfy `left <= pivot2_index <= right`
+            and differ from pivot1_index. The two pivots may be given in either order.
+
+    Returns:
+        tuple[int, int]: The final positions `(lt, gt)` of the smaller and the larger pivot.
+
+    Raises:
+        IndexError: If either pivot index is out of the range `[left, right]`.
+        ValueError: If `left` or `right` are out of bounds, if `left > right`, or if both pivot
+            indices are the same.
+
+    Examples:
+        >>> nums = [5, 9, 1, 7, 3, 8]
+        >>> dual_pivot_partition(nums, 0, 5, 4, 3)
+        (1, 3)
+        >>> nums
+        [1, 3, 5, 7, 9, 8]
+    """
+    _check_range(nums, left, right, pivot1_index)
+    _check_range(nums, left, right, pivot2_index)
+    if pivot1_index == pivot2_index:
+        raise ValueError(
+            f"The two pivot indices must differ, but both are {pivot1_index}."
+        )
+    # Move the pivots to the ends of the range, the smaller one to the left
+    nums[left], nums[pivot1_index] = nums[pivot1_index], nums[left]
+    if pivot2_index == left:
+        pivot2_index = pivot1_index
+    nums[right], nums[pivot2_index] = nums[pivot2_index], nums[right]
+    if nums[right] < nums[left]:
+        nums[left], nums[right] = nums[right], nums[left]
+    p, q = nums[left], nums[right]
+    # nums[left+1..lt-1] < p, nums[lt..k-1] in [p, q], nums[gt+1..right-1] > q, and nums[k..gt] is unseen
+    lt, gt = left + 1, right - 1
+    k = lt
+    while k <= gt:
+        value = nums[k]
+        if value < p:
+            nums[k], nums[lt] = nums[lt], value
+            lt += 1
+        elif q < value:
+            while q < nums[gt] and k < gt:
+                gt -= 1
+            nums[k], nums[gt] = nums[gt], value
+            gt -= 1
+            if nums[k] < p:
+                nums[k], nums[lt] = nums[lt], nums[k]
+                lt += 1
+        k += 1
+    lt -= 1
+    gt += 1
+    nums[left], nums[lt] = nums[lt], nums[left]
+    nums[right], nums[gt] = nums[gt], nums[right]
+    return lt, gt
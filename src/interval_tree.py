@@ -0,0 +1,150 @@
+"""An interval tree: an AvlTree of closed intervals that answers overlap queries.
+
+Every value is a (lo, hi) pair with lo <= hi, and the tree is ordered by the pairs themselves, so by lo
+first. On top of the height and the size, each node keeps max_hi, the largest hi in its subtree. That is
+what lets overlapping() skip a whole subtree: if its max_hi is below the query's lo, nothing in it can
+reach the query. And as the intervals are visited in order of their lo, the walk stops at the first one
+that starts after the query's hi.
+
+max_hi only depends on a node and its children, like the height, so it is recomputed in _fix_height(),
+which AvlTree's rotations, builds and joins all call through cls. Those keep max_hi correct with no
+further changes, including from_sorted(), the batch operations and the set operations. The one place
+that needs more is _rebalance(): it stops fixing heights at the first subtree whose height did not change,
+but a max_hi above that point can still change, so max_hi is recomputed on the rest of the path too.
+"""
+
+import heapq
+from typing import Iterable, Iterator, TypeVar
+
+from avltree import AvlTree, AvlTreeNode
+
+T = TypeVar("T")
+
+Interval = tuple[T, T]
+
+
+def _check_interval(val: Interval) -> None:
+    if len(val) != 2 or val[1] < val[0]:
+        raise ValueError(
+            f"An interval is a (lo, hi) pair with lo <= hi, but got {val!r}"
+        )
+
+
+class IntervalTreeNode(AvlTreeNode[Interval]):
+    """
+    Represents a node in an IntervalTree
+    """
+
+    __slots__ = ("max_hi",)
+
+    def __init__(
+        self,
+        val: Interval,
+        left: "IntervalTreeNode | None" = None,
+        right: "IntervalTreeNode | None" = None,
+    ):
+        _check_interval(val)
+        super().__init__(val, left, right)
+        # Largest hi of any interval in the subtree rooted here. Kept up to date together with height
+        self.max_hi = val[1]
+
+
+class IntervalTree(AvlTree[Interval]):
+    """
+    An AVL Tree of closed intervals (lo, hi) that finds every interval overlapping a query
+    """
+
+    _node_type = IntervalTreeNode
+
+    @staticmethod
+    def _fix_height(node: IntervalTreeNode) -> None:
+        """
+        Recomputes the height, the size and max_hi of {node} from its children
+        """
+        AvlTree._fix_height(node)
+        IntervalTree._fix_max_hi(node)
+
+    @staticmethod
+    def _fix_max_hi(node: IntervalTreeNode) -> None:
+        left, right = node.left, node.right
+        max_hi = node.val[1]
+        if left is not None and max_hi < left.max_hi:
+            max_hi = left.max_hi
+        if right is not None and max_hi < right.max_hi:
+            max_hi = right.max_hi
+        node.max_hi = max_hi
+
+    def _rebalance(self, path: list[IntervalTreeNode], size_change: int) -> None:
+        """
+        See AvlTree._rebalance. Afterwards max_hi is recomputed bottom-up along the whole of {path}.
+        Below the point where the heights settled every node on it is already correct, and rotations
+        only happen below that point, so above it the path is still a chain of ancestors
+        """
+        super()._rebalance(path, size_change)
+        fix_max_hi = self._fix_max_hi
+        for i in range(len(path) - 1, -1, -1):
+            fix_max_hi(path[i])
+
+    def insert_many(self, vals: Iterable[Interval]) -> None:
+        """
+        See AvlTree.insert_many. Every interval is checked before the tree is touched, so an invalid one
+        raises ValueError and leaves the tree unchanged
+        """
+        batch = list(vals)
+        for val in batch:
+            _check_interval(val)
+        super().insert_many(batch)
+
+    def overlapping(self, lo: T, hi: T) -> Iterator[Interval]:
+        """
+        Yields every interval (a, b) in the tree with a <= {hi} and b >= {lo}, ordered by a.
+        Only subtrees that hold an interval ending at or after {lo} are entered, and the walk ends at the
+        first interval starting after {hi}. That is O(log n + k) for k results when they are mostly
+        contiguous in the tree, and O(min(n, (k + 1) log n)) at worst
+        """
+        stack = []
+        node = self.root
+        while True:
+            while node is not None and not node.max_hi < lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            val = node.val
+            if hi < val[0]:
+                return
+            if not val[1] < lo:
+                yield val
+            node = node.right
+
+    def stab(self, point: T) -> list[Interval]:
+        """
+        Returns every interval that contains {point}, ordered by lo
+        """
+        return list(self.overlapping(point, point))
+
+    def stab_many(self, points: Iterable[T]) -> list[list[Interval]]:
+        """
+        Returns, for each of {points} in the given order, the intervals that contain it, ordered by lo.
+        The points are sorted and answered in one sweep over the intervals overlapping [min, max]:
+        an interval enters a heap keyed on its hi once the sweep reaches its lo, and leaves it once
+        the sweep passes its hi. That walks the tree once instead of once per point
+        """
+        points = list(points)
+        results: list[list[Interval]] = [[] for _ in points]
+        if not points or self.root is None:
+            return results
+        order = sorted(range(len(points)), key=points.__getitem__)
+        candidates = self.overlapping(points[order[0]], points[order[-1]])
+        upcoming = next(candidates, None)
+        active: list[tuple[T, Interval]] = []
+        for index in order:
+            point = points[index]
+            while upcoming is not None and not point < upcoming[0]:
+                heapq.heappush(active, (upcoming[1], upcoming))
+                upcoming = next(candidates, None)
+            while active and active[0][0] < point:
+                heapq.heappop(active)
+            results[index] = sorted(val for _, val in active)
+        return results
@@ -0,0 +1,166 @@
+"""
+numpy_backend.py
+
+Vectorized partitioning for numeric arrays.
+
+The partition loops in hoare_partition.py touch one element per python bytecode round trip. On a numpy
+array, or on an array.array / memoryview seen through one, most of that work can be done by numpy a
+block at a time instead.
+
+block_partition() is a block partition in the style of BlockQuicksort. It keeps one block of
+BLOCK_SIZE elements open at each end of the range. For each block it computes a mask of the elements
+on the wrong side of the pivot (greater in the left block, smaller in the right block) and compacts the
+mask to a list of offsets with flatnonzero. The two offset lists are then paired up and swapped with
+one fancy-indexing assignment. Whichever block runs out of offsets is closed and the next one is opened.
+Once less than a block is left between the two ends, the scalar Hoare loop finishes the few elements
+around the meeting point. Elements equal to the pivot are never moved by the block step, so they stay
+spread over both sides, like in the scalar Hoare scheme.
+
+Functions:
+    - as_ndarray: A zero copy, writable ndarray view of a numeric buffer, or None.
+    - block_partition: Partitions an ndarray in place, with the contract of hoare_partition_var2.
+
+Notes:
+    - numpy is optional. Without it as_ndarray() always returns None and callers keep their pure
+      python paths.
+    - Lists are never converted. Building an ndarray from a list copies it and would change the
+      element types, so lists always take the pure python paths.
+"""
+
+from array import array
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 4096
+# Kinds of dtype that the vectorized paths handle: bool, signed and unsigned integers and floats
+_NUMERIC_KINDS = "biuf"
+
+
+def as_ndarray(nums: Any) -> "np.ndarray | None":
+    """
+    Returns a one dimensional, writable ndarray that shares memory with {nums}, or None when there
+    is none: numpy is not installed, nums is a list, or nums is not a writable numeric buffer.
+
+    numpy arrays are returned as they are. array.array and memoryview objects are wrapped without
+    copying, so writes to the returned array change nums.
+
+    Examples:
+        >>> nums = array("d", [3.0, 1.0, 2.0])
+        >>> as_ndarray(nums).sort()
+        >>> nums
+        array('d', [1.0, 2.0, 3.0])
+    """
+    if np is None or isinstance(nums, list):
+        return None
+    if isinstance(nums, np.ndarray):
+        arr = nums
+    elif isinstance(nums, (array, memoryview)):
+        try:
+            arr = np.asarray(nums)
+        except (TypeError, ValueError):
+            return None
+    else:
+        return None
+    if arr.ndim != 1 or arr.dtype.kind not in _NUMERIC_KINDS or not arr.flags.writeable:
+        return None
+    return arr
+
+
+def block_partition(
+    arr: "np.ndarray",
+    left: int,
+    right: int,
+    pivot_index: int,
+    block_size: int = BLOCK_SIZE,
+) -> int:
+    """
+    Partitions arr[left..right] in place around arr[pivot_index], with numpy doing the bulk of the work.
+
+    The result is the one of hoare_partition_var2: all elements in `arr[left..j]` are less than or
+    equal to the pivot, all elements in `arr[j+1..right]` are greater than or equal to it, and the
+    pivot is at `arr[j]`.
+
+    Args:
+        arr (np.ndarray): A one dimensional numeric array, as returned by as_ndarray().
+        left (int): The starting index of the range to partition. Must satisfy `0 <= left <= right`.
+        right (int): The ending index of the range to partition. Must satisfy `0 <= right < len(arr)`.
+        pivot_index (int): The index of the pivot. Must satisfy `left <= pivot_index <= right`.
+        block_size (int): How many elements each mask covers.
+
+    Returns:
+        int: The final position `j` of the pivot.
+
+    Examples:
+        >>> arr = np.array([4, 5, 3, 7, 2])
+        >>> block_partition(arr, 0, 4, 2)
+        1
+        >>> arr[1]
+        3
+    """
+    pivot = arr[pivot_index]
+    arr[left], arr[pivot_index] = pivot, arr[left]
+    # arr[left+1..lo-1] <= pivot and arr[hi+1..right] >= pivot, except for the offsets still pending
+    # in the open blocks, which start at left_start and end at right_end
+    lo, hi = left + 1, right
+    left_start = right_end = 0
+    left_offsets = right_offsets = np.empty(0, dtype=np.intp)
+    while True:
+        if not len(left_offsets):
+            if hi - lo + 1 < block_size:
+                break
+            left_start = lo
+            left_offsets = lo + np.flatnonzero(arr[lo : lo + block_size] > pivot)
+            lo += block_size
+        if not len(right_offsets):
+            if hi - lo + 1 < block_size:
+                break
+            right_end = hi
+            right_offsets = (
+                hi
+                - block_size
+                + 1
+                + np.flatnonzero(arr[hi - block_size + 1 : hi + 1] < pivot)
+            )
+            hi -= block_size
+        pairs = min(len(left_offsets), len(right_offsets))
+        if pairs:
+            to_right = left_offsets[:pairs]
+            to_left = right_offsets[:pairs]
+            arr[to_right], arr[to_left] = arr[to_left], arr[to_right]
+            left_offsets = left_offsets[pairs:]
+            right_offsets = right_offsets[pairs:]
+    # A block with offsets left over is unfinished, so it goes back to the unpartitioned middle
+    if len(left_offsets):
+        lo = left_start
+    if len(right_offsets):
+        hi = right_end
+    j = _scalar_partition(arr, lo, hi, pivot)
+    arr[left], arr[j] = arr[j], pivot
+    return j
+
+
+def _scalar_partition(arr: "np.ndarray", lo: int, hi: int, pivot: Any) -> int:
+    """
+    Hoare partitions the unfinished middle arr[lo..hi] around {pivot}, which is not in it.
+    Returns the last index that holds a value <= pivot, which may be lo - 1
+    """
+    # The middle is at most a few blocks long. A python list is much faster to loop over than numpy scalars
+    middle = arr[lo : hi + 1].tolist()
+    pivot = pivot.item()
+    i, j = -1, len(middle)
+    while True:
+        i += 1
+        while i < len(middle) and middle[i] < pivot:
+            i += 1
+        j -= 1
+        while j >= 0 and middle[j] > pivot:
+            j -= 1
+        if i >= j:
+            break
+        middle[i], middle[j] = middle[j], middle[i]
+    arr[lo : hi + 1] = middle
+    return lo + j
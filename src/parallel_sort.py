@@ -0,0 +1,285 @@
+"""
+parallel_sort.py
+
+Multi-core sort and select over shared memory.
+
+Once a range has been partitioned, its two sides never exchange an element again, so they can be
+sorted by different processes. parallel_sort() copies the values once into a
+multiprocessing.shared_memory block, partitions it at the top level in the calling process until there
+are a few ranges per worker, and hands the ranges to a ProcessPoolExecutor. A task is just the name of
+the shared block and two indices, so no values are pickled: every worker attaches to the same block and
+sorts its range in place with the usual introsort. The sorted values are then copied back into {nums}.
+
+parallel_multiselect() works the same way, except that the top level partitions only keep the ranges
+that hold a requested rank, and the workers run quickselect on them. A single rank is therefore never
+faster in parallel, as only one range ever holds it. It pays off for many ranks at once, like a
+fine grained set of quantiles.
+
+The top level partitions run in the calling process before any worker starts, and cost
+O(n log(workers)). With numpy installed they run vectorized (see numpy_backend.py), without it they
+are the scalar Hoare loop and limit the speedup.
+
+Functions:
+    - parallel_sort: Sorts a list or a numeric buffer in place using several processes.
+    - parallel_multiselect: Several order statistics at once using several processes.
+
+Notes:
+    - Only fixed width numbers can live in shared memory: lists of all ints (that fit in 64 bits) or all
+      floats, numpy arrays and array.array / memoryview buffers of numbers. Anything else, and any
+      input shorter than {cutoff}, is handled in the calling process without a pool.
+    - workers=1 still uses a pool of one process. That is the baseline to measure the scaling against,
+      as it pays the same copies and, with numpy installed, sorts numbers with numpy like every worker.
+"""
+
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, MutableSequence, Sequence
+
+from hoare_partition import hoare_partition_var2
+from numpy_backend import as_ndarray
+from quickselect import _multiselect
+from quicksort import _check_partition, _choose_pivot, _introsort, quicksort
+
+# Inputs shorter than this are sorted in the calling process, and ranges shorter than this are not
+# partitioned further before being handed to a worker
+SEQUENTIAL_CUTOFF = 100_000
+# The top level partitions stop at this many ranges per worker, which evens out unlucky splits
+RANGES_PER_WORKER = 4
+# struct format characters of the numbers that can be shared
+_SHAREABLE_TYPECODES = "bBhHiIlLqQfd"
+
+
+def parallel_sort(
+    nums: MutableSequence[Any],
+    workers: int | None = None,
+    cutoff: int = SEQUENTIAL_CUTOFF,
+    partition: str = "hoare",
+) -> None:
+    """
+    Sorts {nums} in place in ascending order with up to {workers} processes.
+
+    Args:
+        nums (MutableSequence): The values to sort.
+        workers (int | None): How many worker processes to start. Defaults to os.cpu_count().
+        cutoff (int): Inputs shorter than this are sorted without a pool, and ranges shorter than this
+            are not split further.
+        partition (str): The partition scheme the workers sort with, one of quicksort.PARTITION_SCHEMES.
+
+    Raises:
+        ValueError: If `workers` is not positive or `partition` is unknown.
+
+    Examples:
+        >>> nums = list(range(1_000_000, 0, -1))
+        >>> parallel_sort(nums, workers=4)
+        >>> nums[:3]
+        [1, 2, 3]
+    """
+    _check_partition(partition)
+    workers = _check_workers(workers)
+    if len(nums) < max(cutoff, 2):
+        quicksort(nums, partition=partition)
+        return
+    shared = _SharedCopy.of(nums)
+    if shared is None:
+        quicksort(nums, partition=partition)
+        return
+    with shared:
+        ranges = _split(
+            shared.view, [(0, len(nums) - 1)], None, workers * RANGES_PER_WORKER, cutoff
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                executor.submit(
+                    _sort_task, shared.name, shared.typecode, left, right, partition
+                )
+                for left, right, _ in ranges
+            ]
+            for task in tasks:
+                task.result()
+        shared.copy_back(nums)
+
+
+def parallel_multiselect(
+    nums: MutableSequence[Any],
+    ks: Sequence[int],
+    workers: int | None = None,
+    cutoff: int = SEQUENTIAL_CUTOFF,
+) -> list[Any]:
+    """
+    Returns the values of rank {ks} in {nums}, in the order the ranks were given, using up to {workers}
+    processes. Reorders nums like quickselect.multiselect()
+
+    Raises:
+        IndexError: If a rank is not in the range `[0, len(nums))`.
+        ValueError: If `workers` is not positive.
+    """
+    workers = _check_workers(workers)
+    n = len(nums)
+    for k in ks:
+        if not 0 <= k < n:
+            raise IndexError(
+                f"'k' must satisfy 0 <= k < len(nums), but got k={k} and len(nums)={n}"
+            )
+    shared = _SharedCopy.of(nums) if n >= max(cutoff, 2) else None
+    if shared is None:
+        _multiselect(nums, ks)
+        return [nums[k] for k in ks]
+    ranks = sorted(set(ks))
+    with shared:
+        ranges = _split(
+            shared.view, [(0, n - 1, ranks)], ranks, workers * RANGES_PER_WORKER, cutoff
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                executor.submit(
+                    _select_task, shared.name, shared.typecode, left, right, range_ranks
+                )
+                for left, right, range_ranks in ranges
+            ]
+            for task in tasks:
+                task.result()
+        shared.copy_back(nums)
+    return [nums[k] for k in ks]
+
+
+def _check_workers(workers: int | None) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"'workers' must be at least 1, but got workers={workers}")
+    return workers
+
+
+def _split(
+    view: MutableSequence[Any],
+    ranges: list[tuple],
+    ranks: list[int] | None,
+    count: int,
+    cutoff: int,
+) -> list[tuple[int, int, list[int]]]:
+    """
+    Partitions the largest of {ranges} until there are {count} of them or all are shorter than {cutoff}.
+    Returns (left, right, ranks in the range) for every range. With {ranks}, ranges that hold none
+    of them are dropped
+    """
+    # Largest range first: (-length, left, right, ranks in the range)
+    heap = [
+        (left - right - 1, left, right, rest[0] if rest else [])
+        for left, right, *rest in ranges
+    ]
+    heapq.heapify(heap)
+    done = []
+    while heap and len(heap) + len(done) < count:
+        _, left, right, range_ranks = heapq.heappop(heap)
+        if right - left + 1 < cutoff:
+            done.append((left, right, range_ranks))
+            continue
+        j = hoare_partition_var2(view, left, right, _choose_pivot(view, left, right))
+        for side_left, side_right in ((left, j - 1), (j + 1, right)):
+            side_ranks = [k for k in range_ranks if side_left <= k <= side_right]
+            if side_left <= side_right and (ranks is None or side_ranks):
+                heapq.heappush(
+                    heap,
+                    (side_left - side_right - 1, side_left, side_right, side_ranks),
+                )
+    return done + [(left, right, range_ranks) for _, left, right, range_ranks in heap]
+
+
+def _sort_task(name: str, typecode: str, left: int, right: int, partition: str) -> None:
+    shm = SharedMemory(name=name)
+    try:
+        # The view has to be released before close(), also when the sort raises, or close() raises
+        # BufferError and hides the sort's exception
+        with shm.buf.cast(typecode) as view:
+            _introsort(
+                view, left, right, 2 * (right - left + 1).bit_length(), partition
+            )
+    finally:
+        shm.close()
+
+
+def _select_task(
+    name: str, typecode: str, left: int, right: int, ranks: list[int]
+) -> None:
+    shm = SharedMemory(name=name)
+    try:
+        with shm.buf.cast(typecode) as view, view[left : right + 1] as window:
+            _multiselect(window, [k - left for k in ranks])
+    finally:
+        shm.close()
+
+
+class _SharedCopy:
+    """
+    A copy of a sequence of fixed width numbers in a SharedMemory block. Unlinks the block on exit
+    """
+
+    def __init__(self, source: memoryview, typecode: str):
+        self.typecode = typecode
+        self.nbytes = source.nbytes
+        self.shm = SharedMemory(create=True, size=max(1, self.nbytes))
+        self.name = self.shm.name
+        self.shm.buf[: self.nbytes] = source
+        self.view = self.shm.buf[: self.nbytes].cast(typecode)
+
+    @classmethod
+    def of(cls, nums: MutableSequence[Any]) -> "_SharedCopy | None":
+        """
+        Copies {nums} into shared memory, or returns None if its values are not fixed width numbers
+        """
+        arr = as_ndarray(nums)
+        if arr is not None:
+            typecode = arr.dtype.char
+            source = memoryview(arr.copy()).cast("B")
+        elif isinstance(nums, list):
+            typecode = _list_typecode(nums)
+            if typecode is None:
+                return None
+            source = memoryview(array(typecode, nums)).cast("B")
+        elif isinstance(nums, array):
+            typecode = nums.typecode
+            source = memoryview(nums).cast("B")
+        elif isinstance(nums, memoryview) and not nums.readonly and nums.c_contiguous:
+            typecode = nums.format
+            source = nums.cast("B")
+        else:
+            return None
+        if typecode not in _SHAREABLE_TYPECODES:
+            return None
+        return cls(source, typecode)
+
+    def copy_back(self, nums: MutableSequence[Any]) -> None:
+        if isinstance(nums, list):
+            nums[:] = self.view.tolist()
+            return
+        arr = as_ndarray(nums)
+        if arr is not None:
+            arr[:] = self.view
+            return
+        target = memoryview(nums).cast("B")
+        target[:] = self.view.cast("B")
+        target.release()
+
+    def __enter__(self) -> "_SharedCopy":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.view.release()
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _list_typecode(nums: list[Any]) -> str | None:
+    """
+    'q' for a list of ints that fit in 64 bits, 'd' for a list of floats, None for anything else
+    """
+    if all(type(value) is int for value in nums):
+        if min(nums) >= -(2**63) and max(nums) < 2**63:
+            return "q"
+        return None
+    if all(type(value) is float for value in nums):
+        return "d"
+    return None
@@ -0,0 +1,206 @@
+"""A persistent AVL Tree: updates copy the nodes they change instead of mutating them.
+
+AvlTree.insert() and delete() relink and rotate nodes in place, so anyone who wants a consistent view
+of the tree while it changes has to copy the whole tree first. PersistentAvlTree never modifies a node
+once it is part of a tree. An update copies the nodes on its search path, O(log n) of them, plus at
+most two more per rotation, links the copies to the untouched subtrees, and installs the root of the
+copy as the new root. Every older root still points to a complete, unchanged tree that shares all the
+nodes off the path with the newer ones.
+
+That makes snapshot() O(1): it is a new PersistentAvlTree on the current root. A reader in another
+thread can search or iterate a snapshot for as long as it likes with no locking while a writer keeps
+updating, and iterators over a PersistentAvlTree stay valid after updates, unlike those of AvlTree.
+Replacing the root is a single attribute assignment, so a reader that takes a snapshot always sees one
+version or the next, never half an update. Several writers still need a lock between them.
+
+The nodes are plain AvlTreeNodes, so the read only helpers of AvlTree and bst work on them. The copies
+are rebalanced with AvlTree's rotations, which only ever get fresh copies: a rotation after a delete
+works on the sibling subtree, which is off the search path, so those nodes are copied first.
+Like AvlTree._rebalance(), an update stops rebalancing at the first copy whose height did not change.
+The copies above it only need their size adjusted.
+
+A PersistentAvlTree is not an AvlTree, as the batch and set operations of AvlTree rebuild nodes in place.
+"""
+
+from typing import Generic, Iterable, Iterator, TypeVar
+
+import bst
+from avltree import AvlTree, AvlTreeNode
+
+T = TypeVar("T")
+
+
+class PersistentAvlTree(Generic[T]):
+    """
+    An AVL Tree whose updates copy the O(log n) nodes on their path, so old versions stay intact
+    """
+
+    def __init__(self, root: AvlTreeNode | None = None):
+        self.root = root
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[T]) -> "PersistentAvlTree[T]":
+        """
+        Builds a height balanced tree from an iterable of values in ascending order in O(n).
+        See AvlTree.from_sorted
+        """
+        return cls(AvlTree.from_sorted(iterable).root)
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> "PersistentAvlTree[T]":
+        return cls.from_sorted(sorted(iterable))
+
+    def snapshot(self) -> "PersistentAvlTree[T]":
+        """
+        Returns the current version of the tree in O(1). Later updates to either tree don't affect the other
+        """
+        return PersistentAvlTree(self.root)
+
+    def is_empty(self) -> bool:
+        return self.root is None
+
+    def __len__(self) -> int:
+        return bst.size(self.root)
+
+    def __iter__(self) -> Iterator[T]:
+        return bst.iter_values(self.root)
+
+    def __reversed__(self) -> Iterator[T]:
+        return bst.iter_values(self.root, reverse=True)
+
+    def rank(self, val: T) -> int:
+        return bst.rank(self.root, val)
+
+    def select(self, k: int) -> T:
+        return bst.select(self.root, k)
+
+    def irange(
+        self,
+        lo: T | None = None,
+        hi: T | None = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Yields the values {v} with lo <= v <= hi in ascending order, or descending if {reverse}. See AvlTree.irange
+        """
+        return bst.irange(self.root, lo, hi, inclusive, reverse)
+
+    def search(self, val: T) -> bool:
+        """
+        Search for a key with {val} in the Tree
+        """
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                return True
+            node = node.left if val < node_val else node.right
+        return False
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree by copying its search path. If the value already exists, this
+        is a noop and nothing is copied
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                return
+            went_left = val < node_val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        self.root = PersistentAvlTree._copy_path(path, AvlTreeNode(val), 1)
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree by copying its search path. If the value is missing, this is a
+        noop and nothing is copied
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                break
+            went_left = val < node_val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        if node is None:
+            return
+        if node.left is not None and node.right is not None:
+            # The max of the left subtree takes the place of node. Its copy of node stands in for node on
+            # the path, and the path continues down to the max, whose left child moves up to replace it
+            replacement = node.left
+            inner_path = [(replacement, False)]
+            while replacement.right is not None:
+                replacement = replacement.right
+                inner_path.append((replacement, False))
+            inner_path.pop()
+            stand_in = AvlTreeNode(replacement.val, node.left, node.right)
+            stand_in.height = node.height
+            stand_in.size = node.size
+            path.append((stand_in, True))
+            path.extend(inner_path)
+            subtree = replacement.left
+        else:
+            subtree = node.left if node.left is not None else node.right
+        self.root = PersistentAvlTree._copy_path(path, subtree, -1)
+
+    @staticmethod
+    def _copy_path(
+        path: list[tuple[AvlTreeNode, bool]],
+        subtree: AvlTreeNode | None,
+        size_change: int,
+    ) -> AvlTreeNode | None:
+        """
+        Copies the nodes of {path} (root first, each with whether the path goes left from it) bottom-up,
+        hanging {subtree} where the path ends, and returns the root of the copy.
+        {size_change} is 1 if {subtree} holds one more node than the one it replaces, -1 if one less
+        """
+        settled = False
+        for node, went_left in reversed(path):
+            copy = (
+                AvlTreeNode(node.val, subtree, node.right)
+                if went_left
+                else AvlTreeNode(node.val, node.left, subtree)
+            )
+            if settled:
+                copy.height = node.height
+                copy.size = node.size + size_change
+            else:
+                AvlTree._fix_height(copy)
+                copy = PersistentAvlTree._rebalance(copy)
+                settled = copy.height == node.height
+            subtree = copy
+        return subtree
+
+    @staticmethod
+    def _rebalance(node: AvlTreeNode) -> AvlTreeNode:
+        """
+        AvlTree._apply_rotation on the fresh copy {node}. The children and grandchildren that rotate
+        with it are copied first, as they may be shared with older versions
+        """
+        balance = node.balance()
+        if balance > 1:
+            right = node.right = PersistentAvlTree._copy(node.right)
+            if right.balance() < 0:
+                right.left = PersistentAvlTree._copy(right.left)
+                node.right = AvlTree._right_rotate(right)
+            return AvlTree._left_rotate(node)
+        if balance < -1:
+            left = node.left = PersistentAvlTree._copy(node.left)
+            if left.balance() > 0:
+                left.right = PersistentAvlTree._copy(left.right)
+                node.left = AvlTree._left_rotate(left)
+            return AvlTree._right_rotate(node)
+        return node
+
+    @staticmethod
+    def _copy(node: AvlTreeNode) -> AvlTreeNode:
+        copy = AvlTreeNode(node.val, node.left, node.right)
+        copy.height = node.height
+        copy.size = node.size
+        return copy
@@ -0,0 +1,243 @@
+"""
+quickselect.py
+
+Order statistics built on hoare_partition_var2.
+
+hoare_partition_var2 leaves the pivot at its final sorted position j. So after one partition, the kth
+smallest value is either the pivot (k == j), or it is on the one side of j that contains k. Quickselect
+only continues into that side, which makes it expected O(n) instead of the O(n log n) of a full sort.
+
+Pivots are picked at random, which makes the expected cost O(n) on any input. To also bound the
+worst case, every range gets a budget of 2 * log2(n) partitions. A range that runs out of budget
+switches to the median of medians pivot, which always leaves at least ~30% of the range on each side
+and therefore guarantees O(n) (this is introselect).
+
+multiselect() finds several order statistics in one pass. Every partition splits the requested ranks
+between its two sides, and a side that holds no requested rank is never looked at again.
+Finding p50, p90 and p99 this way costs little more than finding one of them.
+
+Every function takes a {partition} from quicksort.PARTITION_SCHEMES. "hoare" partitions with
+hoare_partition_var2. "3way" uses partition_3way, and every rank that falls in the run of values equal
+to the pivot is settled at once, which is what low-cardinality keys need. "dual_pivot" uses
+dual_pivot_partition around two random pivots, and switches to "3way" with median of medians pivots
+once the budget runs out.
+
+Functions:
+    - nth_element: Reorders a list so that nums[k] holds the kth smallest value.
+    - select: The kth smallest value.
+    - multiselect: Several order statistics at once.
+    - quantiles: Several quantiles at once.
+    - partial_sort: Sorts the k smallest values to the front.
+    - top_k: The k largest values, largest first.
+
+Notes:
+    - Every function works in place and reorders {nums}.
+    - numpy arrays, and array.array or memoryview buffers of numbers, are handed to numpy's in place
+      ndarray.partition through a zero copy view (see numpy_backend.as_ndarray), which is an introselect
+      in C and takes all the ranks at once. {partition} makes no difference for them.
+    - Ranks count from 0, so select(nums, 0) is the minimum.
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+from typing import Any, MutableSequence, Sequence
+
+from hoare_partition import dual_pivot_partition, hoare_partition_var2, partition_3way
+from numpy_backend import as_ndarray
+from quicksort import (
+    INSERTION_SORT_THRESHOLD,
+    _check_partition,
+    _insertion_sort,
+    _introsort,
+)
+
+_random = random.Random()
+
+
+def nth_element(nums: MutableSequence[Any], k: int, partition: str = "hoare") -> None:
+    """
+    Reorders {nums} in place so that nums[k] is the value that would be there if nums were sorted,
+    every value before it is <= nums[k] and every value after it is >= nums[k].
+    Expected O(n), worst case O(n).
+
+    Raises:
+        IndexError: If `k` is not in the range `[0, len(nums))`.
+
+    Examples:
+        >>> nums = [9, 1, 8, 2, 7]
+        >>> nth_element(nums, 2)
+        >>> nums[2]
+        7
+    """
+    _multiselect(nums, [k], partition)
+
+
+def select(nums: MutableSequence[Any], k: int, partition: str = "hoare") -> Any:
+    """
+    Returns the {k}th smallest value of {nums}, counting from 0. Reorders nums like nth_element()
+
+    Examples:
+        >>> select([5, 3, 1, 4], 1)
+        3
+    """
+    _multiselect(nums, [k], partition)
+    return nums[k]
+
+
+def multiselect(
+    nums: MutableSequence[Any], ks: Sequence[int], partition: str = "hoare"
+) -> list[Any]:
+    """
+    Returns the values of rank {ks} in {nums}, in the order the ranks were given, in a single pass.
+    Afterwards nums[k] holds the right value for every k in ks, with the nth_element() guarantees around it
+
+    Examples:
+        >>> multiselect([5, 3, 1, 4, 2], [4, 0, 2])
+        [5, 1, 3]
+    """
+    _multiselect(nums, ks, partition)
+    return [nums[k] for k in ks]
+
+
+def quantiles(
+    nums: MutableSequence[Any], qs: Sequence[float], partition: str = "hoare"
+) -> list[Any]:
+    """
+    Returns the {qs} quantiles of {nums} in a single pass, e.g. qs=[0.5, 0.99] for p50 and p99.
+    The q quantile is the value of rank floor(q * (len(nums) - 1)), so no interpolation is done
+    and every returned value is an element of nums.
+
+    Raises:
+        ValueError: If a quantile is outside `[0, 1]` or nums is empty.
+    """
+    if len(nums) == 0:
+        raise ValueError("Quantiles of an empty sequence are undefined")
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantiles must satisfy 0 <= q <= 1, but got q={q}")
+    return multiselect(nums, [int(q * (len(nums) - 1)) for q in qs], partition)
+
+
+def partial_sort(nums: MutableSequence[Any], k: int, partition: str = "hoare") -> None:
+    """
+    Reorders {nums} in place so that nums[:k] are its k smallest values in ascending order.
+    The order of the rest is unspecified. O(n + k log k)
+    """
+    if not 0 <= k <= len(nums):
+        raise IndexError(
+            f"'k' must satisfy 0 <= k <= len(nums), but got k={k} and len(nums)={len(nums)}"
+        )
+    if k == 0:
+        return
+    _multiselect(nums, [k - 1], partition)
+    _introsort(nums, 0, k - 1, 2 * k.bit_length(), partition)
+
+
+def top_k(nums: MutableSequence[Any], k: int, partition: str = "hoare") -> list[Any]:
+    """
+    Returns the {k} largest values of {nums}, largest first. Reorders nums. O(n + k log k)
+
+    Examples:
+        >>> top_k([5, 3, 9, 1, 7], 2)
+        [9, 7]
+    """
+    n = len(nums)
+    if not 0 <= k <= n:
+        raise IndexError(
+            f"'k' must satisfy 0 <= k <= len(nums), but got k={k} and len(nums)={n}"
+        )
+    if k == 0:
+        return []
+    _multiselect(nums, [n - k], partition)
+    largest = [nums[i] for i in range(n - k, n)]
+    _introsort(largest, 0, k - 1, 2 * k.bit_length(), partition)
+    largest.reverse()
+    return largest
+
+
+def _multiselect(
+    nums: MutableSequence[Any], ks: Sequence[int], partition: str = "hoare"
+) -> None:
+    """
+    Puts the right value at every rank in {ks}. The core of every function in this module
+    """
+    _check_partition(partition)
+    n = len(nums)
+    for k in ks:
+        if not 0 <= k < n:
+            raise IndexError(
+                f"'k' must satisfy 0 <= k < len(nums), but got k={k} and len(nums)={n}"
+            )
+    ranks = sorted(set(ks))
+    if not ranks:
+        return
+    arr = as_ndarray(nums)
+    if arr is not None:
+        arr.partition(ranks)
+        return
+    # Ranges still to work on: nums[left..right] holds the ranks ranks[first:last],
+    # and has depth partitions left before it switches to median of medians pivots
+    stack = [(0, n - 1, 0, len(ranks), 2 * n.bit_length())]
+    while stack:
+        left, right, first, last, depth = stack.pop()
+        if first == last:
+            continue
+        if right - left + 1 <= INSERTION_SORT_THRESHOLD:
+            _insertion_sort(nums, left, right)
+            continue
+        if partition == "dual_pivot" and depth > 0:
+            pivot1_index = _random.randint(left, right)
+            pivot2_index = _random.randint(left, right - 1)
+            if pivot2_index >= pivot1_index:
+                pivot2_index += 1
+            lt, gt = dual_pivot_partition(nums, left, right, pivot1_index, pivot2_index)
+            sides = [(left, lt - 1), (lt + 1, gt - 1), (gt + 1, right)]
+        else:
+            if depth > 0:
+                pivot_index = _random.randint(left, right)
+            else:
+                pivot_index = _median_of_medians(nums, left, right)
+            if partition == "hoare":
+                lt = gt = hoare_partition_var2(nums, left, right, pivot_index)
+            else:
+                lt, gt = partition_3way(nums, left, right, pivot_index)
+            sides = [(left, lt - 1), (gt + 1, right)]
+        # Ranks outside every side are at a pivot, or equal to one, and already in place
+        for side_left, side_right in sides:
+            begin = bisect_left(ranks, side_left, first, last)
+            end = bisect_right(ranks, side_right, begin, last)
+            stack.append((side_left, side_right, begin, end, depth - 1))
+
+
+def _median_of_medians(nums: MutableSequence[Any], left: int, right: int) -> int:
+    """
+    Returns the index of a pivot for nums[left..right] with at least ~30% of the range on either side.
+    The medians of groups of five are gathered at the front of the range and their median is selected
+    """
+    store = left
+    for group_start in range(left, right + 1, 5):
+        group_end = min(group_start + 4, right)
+        _insertion_sort(nums, group_start, group_end)
+        median = group_start + (group_end - group_start) // 2
+        nums[store], nums[median] = nums[median], nums[store]
+        store += 1
+    mid = left + (store - 1 - left) // 2
+    _select_in_range(nums, left, store - 1, mid)
+    return mid
+
+
+def _select_in_range(nums: MutableSequence[Any], left: int, right: int, k: int) -> None:
+    """
+    nth_element() restricted to nums[left..right], always using median of medians pivots
+    """
+    while right - left + 1 > INSERTION_SORT_THRESHOLD:
+        j = hoare_partition_var2(
+            nums, left, right, _median_of_medians(nums, left, right)
+        )
+        if k == j:
+            return
+        if k < j:
+            right = j - 1
+        else:
+            left = j + 1
+    _insertion_sort(nums, left, right)
@@ -0,0 +1,226 @@
+"""
+quicksort.py
+
+An introsort built on hoare_partition_var1.
+
+The plain recursive quicksort has three weak spots, each handled the way production sorts handle them:
+    - A bad pivot on sorted or patterned input makes it quadratic. The pivot is the median of three
+      elements, or for larger ranges Tukey's ninther (the median of three medians of three), which
+      is cheap and stays close to the true median on sorted, reversed and sawtooth input.
+    - Recursion is slow in python and can be deep. Ranges to sort are kept on an explicit stack.
+      The larger side of every partition is pushed and the loop carries on with the smaller side,
+      so the stack never holds more than log2(n) ranges.
+    - A crafted input can still defeat any fixed pivot rule. Once a range has been partitioned
+      2 * log2(n) times without getting small, it is heapsorted instead, so the worst case is O(n log n).
+Ranges of at most INSERTION_SORT_THRESHOLD elements are finished with insertion sort, which beats
+partitioning at that size.
+
+The partition step is selectable through PARTITION_SCHEMES:
+    - "hoare": hoare_partition_var1 around one pivot. The default, and the fastest on distinct keys.
+    - "3way": partition_3way around one pivot. The elements equal to the pivot are final after one
+      partition, so input with k distinct keys takes O(n log k) instead of O(n log n).
+    - "dual_pivot": dual_pivot_partition around the 2nd and 4th of five evenly spaced samples. Splits
+      every range in three. When both pivots are equal, the middle part is all equal and is skipped.
+
+Functions:
+    - quicksort: Sorts a list (or any mutable sequence) in place.
+
+Notes:
+    - numpy arrays, and array.array or memoryview buffers of numbers, are sorted in place by numpy's
+      own sort through a zero copy view (see numpy_backend.as_ndarray). It is an introsort too, and
+      runs in C, so {partition} makes no difference for them.
+    - Without a key the sort is not stable, like any quicksort. With a key, each element is decorated
+      with (key, original index), which makes the sort stable and calls key once per element.
+"""
+
+from typing import Any, Callable, MutableSequence
+
+from hoare_partition import dual_pivot_partition, hoare_partition_var1, partition_3way
+from numpy_backend import as_ndarray
+
+INSERTION_SORT_THRESHOLD = 16
+# Ranges at least this long pick the ninther as pivot instead of the median of three
+NINTHER_THRESHOLD = 40
+PARTITION_SCHEMES = ("hoare", "3way", "dual_pivot")
+
+
+def quicksort(
+    nums: MutableSequence[Any],
+    key: Callable[[Any], Any] | None = None,
+    partition: str = "hoare",
+) -> None:
+    """
+    Sort {nums} in place in ascending order in O(n log n) worst case time.
+
+    Args:
+        nums (MutableSequence): The values to sort. A list, or anything indexable and assignable
+            such as array.array.
+        key (Callable | None): Sort by key(value) instead of the values themselves. Called once per value.
+        partition (str): One of PARTITION_SCHEMES. Use "3way" when the keys have few distinct values.
+
+    Raises:
+        ValueError: If `partition` is not one of PARTITION_SCHEMES.
+
+    Examples:
+        >>> nums = [5, 2, 9, 1]
+        >>> quicksort(nums)
+        >>> nums
+        [1, 2, 5, 9]
+        >>> words = ["bb", "a", "ccc"]
+        >>> quicksort(words, key=len)
+        >>> words
+        ['a', 'bb', 'ccc']
+    """
+    _check_partition(partition)
+    n = len(nums)
+    if n < 2:
+        return
+    if key is None:
+        _introsort(nums, 0, n - 1, 2 * (n.bit_length() - 1), partition)
+        return
+    values = list(nums)
+    decorated = [(key(value), index) for index, value in enumerate(values)]
+    _introsort(decorated, 0, n - 1, 2 * (n.bit_length() - 1), partition)
+    for position, (_, index) in enumerate(decorated):
+        nums[position] = values[index]
+
+
+def _check_partition(partition: str) -> None:
+    if partition not in PARTITION_SCHEMES:
+        raise ValueError(
+            f"'partition' must be one of {PARTITION_SCHEMES}, but got partition={partition!r}"
+        )
+
+
+def _introsort(
+    nums: MutableSequence[Any],
+    left: int,
+    right: int,
+    depth_limit: int,
+    partition: str = "hoare",
+) -> None:
+    """
+    Sorts nums[left..right]. A range partitioned more than {depth_limit} times is heapsorted instead.
+    {partition} picks the partition step from PARTITION_SCHEMES
+    """
+    arr = as_ndarray(nums)
+    if arr is not None:
+        arr[left : right + 1].sort()
+        return
+    # Ranges still to sort, with the depth budget they have left
+    stack = [(left, right, depth_limit)]
+    while stack:
+        left, right, depth = stack.pop()
+        while right - left + 1 > INSERTION_SORT_THRESHOLD:
+            if depth == 0:
+                _heapsort(nums, left, right)
+                break
+            depth -= 1
+            if partition == "hoare":
+                pivot_index = _choose_pivot(nums, left, right)
+                # With the pivot at the start of the range, var1 always returns j < right,
+                # so both sides are non-empty and the loop makes progress
+                nums[left], nums[pivot_index] = nums[pivot_index], nums[left]
+                j = hoare_partition_var1(nums, left, right, left)
+                sides = [(left, j), (j + 1, right)]
+            elif partition == "3way":
+                lt, gt = partition_3way(
+                    nums, left, right, _choose_pivot(nums, left, right)
+                )
+                sides = [(left, lt - 1), (gt + 1, right)]
+            else:
+                lt, gt = dual_pivot_partition(
+                    nums, left, right, *_choose_pivots(nums, left, right)
+                )
+                sides = [(left, lt - 1), (gt + 1, right)]
+                if nums[lt] < nums[gt]:
+                    sides.append((lt + 1, gt - 1))
+            # Carry on with the smallest side and push the others
+            sides.sort(key=lambda side: side[1] - side[0])
+            for side_left, side_right in sides[1:]:
+                stack.append((side_left, side_right, depth))
+            left, right = sides[0]
+        else:
+            _insertion_sort(nums, left, right)
+
+
+def _median_of_three(nums: MutableSequence[Any], a: int, b: int, c: int) -> int:
+    """
+    Returns whichever of the indices {a}, {b}, {c} holds the median of the three values
+    """
+    if nums[a] < nums[b]:
+        if nums[b] < nums[c]:
+            return b
+        return c if nums[a] < nums[c] else a
+    if nums[a] < nums[c]:
+        return a
+    return c if nums[b] < nums[c] else b
+
+
+def _choose_pivot(nums: MutableSequence[Any], left: int, right: int) -> int:
+    mid = left + (right - left) // 2
+    if right - left + 1 < NINTHER_THRESHOLD:
+        return _median_of_three(nums, left, mid, right)
+    step = (right - left + 1) // 8
+    return _median_of_three(
+        nums,
+        _median_of_three(nums, left, left + step, left + 2 * step),
+        _median_of_three(nums, mid - step, mid, mid + step),
+        _median_of_three(nums, right - 2 * step, right - step, right),
+    )
+
+
+def _choose_pivots(
+    nums: MutableSequence[Any], left: int, right: int
+) -> tuple[int, int]:
+    """
+    Returns the indices of the 2nd and 4th smallest of five evenly spaced values in nums[left..right],
+    which split the range roughly in thirds
+    """
+    step = (right - left) // 6
+    mid = left + (right - left) // 2
+    samples = sorted(
+        (mid - 2 * step, mid - step, mid, mid + step, mid + 2 * step),
+        key=nums.__getitem__,
+    )
+    return samples[1], samples[3]
+
+
+def _insertion_sort(nums: MutableSequence[Any], left: int, right: int) -> None:
+    for i in range(left + 1, right + 1):
+        value = nums[i]
+        j = i - 1
+        while j >= left and value < nums[j]:
+            nums[j + 1] = nums[j]
+            j -= 1
+        nums[j + 1] = value
+
+
+def _sift_down(nums: MutableSequence[Any], offset: int, root: int, size: int) -> None:
+    """
+    Sifts the value at heap position {root} down a max heap of {size} values stored from nums[offset]
+    """
+    value = nums[offset + root]
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            break
+        if child + 1 < size and nums[offset + child] < nums[offset + child + 1]:
+            child += 1
+        if not value < nums[offset + child]:
+            break
+        nums[offset + root] = nums[offset + child]
+        root = child
+    nums[offset + root] = value
+
+
+def _heapsort(nums: MutableSequence[Any], left: int, right: int) -> None:
+    """
+    Sorts nums[left..right] in place in O(n log n), whatever the input
+    """
+    size = right - left + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(nums, left, root, size)
+    for end in range(size - 1, 0, -1):
+        nums[left], nums[left + end] = nums[left + end], nums[left]
+        _sift_down(nums, left, 0, end)
@@ -1,7 +1,28 @@
-from PrettyPrintTree import PrettyPrintTree
-from typing import Generic, TypeVar
+"""A Red Black Tree is a Binary Search Tree where every node is colored red or black such that
+    1. The root is black
+    2. A red node never has a red child
+    3. Every path from a node down to an empty subtree passes through the same number of black nodes
+
+Together these keep the longest root to leaf path within twice the shortest, so the height is O(log n).
+Compared to an AVL Tree the balance is looser, which makes updates cheaper. An insert does at most 2
+rotations and a delete at most 3. Everything else is recoloring, which usually stops after a level or two.
+An AVL Tree on the other hand calls _apply_rotation at every ancestor.
+
+In python an empty subtree is None, and None counts as black.
+Deleting a node with two children works like AvlTree.delete: the max node of the left subtree, which has
+at most one child, is moved into its place and takes over its color.
+
+References:
+Introduction to Algorithms (CLRS), chapter 13
+"""
+
+import os
+from typing import Generic, Iterable, Iterator, TypeVar
 from enum import Enum
 
+import bst
+import snapshot
+
 T = TypeVar("T")
 
 
@@ -10,11 +31,21 @@ class RedBlackTreeColor(Enum):
     BLACK = 1
 
 
+RED = RedBlackTreeColor.RED
+BLACK = RedBlackTreeColor.BLACK
+
+
+def _is_red(node: "RedBlackTreeNode | None") -> bool:
+    return node is not None and node.color is RED
+
+
 class RedBlackTreeNode(Generic[T]):
     """
-    Represents a node in an AVL Tree
+    Represents a node in a Red Black Tree
     """
 
+    __slots__ = ("left", "right", "val", "parent", "color", "size")
+
     def __init__(
         self,
         val: T,
@@ -28,6 +59,8 @@ class RedBlackTreeNode(Generic[T]):
         self.val = val
         self.parent = parent
         self.color = color
+        # Number of nodes in the subtree rooted here
+        self.size = 1
 
     def children(self) -> list["RedBlackTreeNode"]:
         """
@@ -46,13 +79,11 @@ class RedBlackTree(Generic[T]):
     A Red black Tree is a Binary Search Tree that is approximately height balanced
     """
 
+    # Built on the first call to __str__ and shared by every tree. See pretty_printer
+    _pretty_printer = None
+
     def __init__(self, root: "RedBlackTreeNode | None" = None):
         self.root = root
-        self.pretty_printer = PrettyPrintTree(
-            lambda node: node.children(),
-            lambda node: node.val,
-            return_instead_of_print=True,
-        )
 
     def __str__(self) -> str:
         if self.root:
@@ -60,6 +91,107 @@ class RedBlackTree(Generic[T]):
         else:
             return f"Empty-Tree"
 
+    @property
+    def pretty_printer(self):
+        """
+        The PrettyPrintTree used by __str__.
+        The PrettyPrint package is only imported once a tree is actually printed
+        """
+        if RedBlackTree._pretty_printer is None:
+            from PrettyPrint import PrettyPrintTree
+
+            RedBlackTree._pretty_printer = PrettyPrintTree(
+                lambda node: node.children(),
+                lambda node: node.val,
+                return_instead_of_print=True,
+            )
+        return RedBlackTree._pretty_printer
+
+    @classmethod
+    def from_sorted(cls, iterable: Iterable[T]) -> "RedBlackTree[T]":
+        """
+        Builds a tree from an iterable of values in ascending order in O(n), with no rotations or fixups.
+        Duplicate values are dropped. Raises ValueError if the values are not sorted.
+
+        Like AvlTree.from_sorted, the nodes are threaded into a chain through their right pointers and the
+        chain is folded into a tree where the sizes of the left and right subtrees of every node differ by
+        at most one. Every level of such a tree is full except maybe the deepest one, so coloring the
+        deepest level red and all other nodes black puts the same number of black nodes on every path.
+        """
+        head: RedBlackTreeNode | None = None
+        tail: RedBlackTreeNode | None = None
+        count = 0
+        for val in iterable:
+            if tail is not None:
+                if val == tail.val:
+                    continue
+                if val < tail.val:
+                    raise ValueError(
+                        f"from_sorted() expects values in ascending order, but got {val!r} after {tail.val!r}"
+                    )
+            node = RedBlackTreeNode(val, color=BLACK)
+            if tail is None:
+                head = node
+            else:
+                tail.right = node
+            tail = node
+            count += 1
+        return cls(RedBlackTree._build_from_chain(head, count))
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> "RedBlackTree[T]":
+        """
+        Builds a tree from an iterable of values in any order, in O(n log n) for the sort and O(n) for the build
+        """
+        return cls.from_sorted(sorted(iterable))
+
+    @staticmethod
+    def _build_from_chain(
+        head: RedBlackTreeNode | None, count: int
+    ) -> RedBlackTreeNode | None:
+        """
+        Turns a chain of {count} black nodes linked in ascending order through their right pointers
+        into a balanced tree and returns its root. The nodes on the deepest level are colored red
+        """
+        cursor = head
+        deepest = count.bit_length() - 1
+
+        def build(n: int, depth: int) -> RedBlackTreeNode | None:
+            nonlocal cursor
+            if n == 0:
+                return None
+            left = build(n // 2, depth + 1)
+            node = cursor
+            assert node is not None
+            cursor = node.right
+            node.left = left
+            node.right = build(n - n // 2 - 1, depth + 1)
+            for child in (node.left, node.right):
+                if child is not None:
+                    child.parent = node
+            node.size = n
+            if depth == deepest and depth > 0:
+                node.color = RED
+            return node
+
+        return build(count, 0)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the values of the tree to the file {path} in ascending order. See snapshot.py for the format
+        """
+        snapshot.write_snapshot(path, self)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "RedBlackTree[T]":
+        """
+        Builds a tree from a file written by save() in O(n), with no inserts, rotations or fixups.
+        Numeric values are read through a memory map of the file.
+        Raises ValueError if the file is not a snapshot or its values are not sorted
+        """
+        with snapshot.paused_gc():
+            return cls.from_sorted(snapshot.read_snapshot(path))
+
     def _left_rotate(self, node: RedBlackTreeNode) -> None:
         r"""
             C                                A
@@ -82,6 +214,9 @@ class RedBlackTree(Generic[T]):
         # link node and right child. right child is new parent
         right_child.left = node
         node.parent = right_child
+        # right_child takes over the whole subtree, node loses right_child and its right subtree
+        right_child.size = node.size
+        node.size = 1 + bst.size(node.left) + bst.size(right_childs_left_child)
         # Fix up links with parent_of_node
         right_child.parent = parent_of_node
         if not parent_of_node:
@@ -112,10 +247,12 @@ class RedBlackTree(Generic[T]):
         # left_child becomes new root of subtree
         left_child.right = node
         node.parent = left_child
+        left_child.size = node.size
+        node.size = 1 + bst.size(left_childs_right_child) + bst.size(node.right)
         # link to subtree above
         left_child.parent = parent_of_node
         if not parent_of_node:
-            self.root = node
+            self.root = left_child
         elif parent_of_node.left == node:
             parent_of_node.left = left_child
         else:
@@ -127,19 +264,320 @@ class RedBlackTree(Generic[T]):
         """
         return self.root is None
 
+    def __len__(self) -> int:
+        return bst.size(self.root)
+
+    def rank(self, val: T) -> int:
+        """
+        Returns the number of values in the tree smaller than {val} in O(log n).
+        {val} does not need to be in the tree
+        """
+        return bst.rank(self.root, val)
+
+    def select(self, k: int) -> T:
+        """
+        Returns the {k}th smallest value in the tree, counting from 0, in O(log n).
+        Raises IndexError if k is out of range
+        """
+        return bst.select(self.root, k)
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """
+        Returns the number of values {v} in the tree with lo <= v <= hi in O(log n)
+        """
+        if hi < lo:
+            return 0
+        return bst.rank(self.root, hi, inclusive=True) - bst.rank(self.root, lo)
+
+    def __iter__(self) -> Iterator[T]:
+        return bst.iter_values(self.root)
+
+    def __reversed__(self) -> Iterator[T]:
+        return bst.iter_values(self.root, reverse=True)
+
+    def irange(
+        self,
+        lo: T | None = None,
+        hi: T | None = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Yields the values {v} with lo <= v <= hi in ascending order, or descending if {reverse}, in O(log n + k).
+        {inclusive} says whether each bound is included, and a bound of None leaves that side open
+        """
+        return bst.irange(self.root, lo, hi, inclusive, reverse)
+
+    def cursor(self) -> bst.Cursor:
+        """
+        Returns an unpositioned cursor over the tree. See bst.Cursor
+        """
+        return bst.Cursor(self.root)
+
     def search(self, val: T) -> bool:
         """
         Search for a key with {val} in the Tree
         """
-
-        def search_from_node(val: T, node: RedBlackTreeNode | None) -> bool:
-            if node is None:
-                return False
-            elif node.val == val:
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
                 return True
-            elif val < node.val:
-                return search_from_node(val, node.left)
+            node = node.left if val < node_val else node.right
+        return False
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree. If the value already exists, this is a noop
+        """
+        self._find_or_insert(val, RedBlackTreeNode)
+
+    def _find_or_insert(self, val: T, node_type: type) -> tuple[RedBlackTreeNode, bool]:
+        """
+        Returns the node holding {val} and False if there is one.
+        Otherwise inserts node_type(val) and returns it and True. Done in a single descent
+        """
+        parent = None
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                return node, False
+            parent = node
+            node = node.left if val < node_val else node.right
+        new_node = node_type(val, parent=parent)
+        if parent is None:
+            self.root = new_node
+        elif val < parent.val:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        ancestor = parent
+        while ancestor is not None:
+            ancestor.size += 1
+            ancestor = ancestor.parent
+        self._insert_fixup(new_node)
+        return new_node, True
+
+    def _insert_fixup(self, node: RedBlackTreeNode) -> None:
+        """
+        Restores the invariants after {node} was inserted as a red leaf.
+        The only one that can be broken is a red node having a red parent.
+        """
+        parent = node.parent
+        while parent is not None and parent.color is RED:
+            # parent is red, so it is not the root and grandparent exists
+            grandparent = parent.parent
+            assert grandparent is not None
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if _is_red(uncle):
+                    # Push the blackness of grandparent down one level and continue from grandparent
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                else:
+                    if node is parent.right:
+                        node = parent
+                        self._left_rotate(node)
+                        parent = node.parent
+                    parent.color = BLACK
+                    grandparent.color = RED
+                    self._right_rotate(grandparent)
             else:
-                return search_from_node(val, node.right)
+                uncle = grandparent.left
+                if _is_red(uncle):
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                else:
+                    if node is parent.left:
+                        node = parent
+                        self._right_rotate(node)
+                        parent = node.parent
+                    parent.color = BLACK
+                    grandparent.color = RED
+                    self._left_rotate(grandparent)
+            parent = node.parent
+        self.root.color = BLACK
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree
+        """
+        self._delete(val)
+
+    def _transplant(
+        self, node: RedBlackTreeNode, subtree: RedBlackTreeNode | None
+    ) -> None:
+        """
+        Puts {subtree} where {node} hangs from its parent
+        """
+        parent = node.parent
+        if parent is None:
+            self.root = subtree
+        elif parent.left is node:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+        if subtree is not None:
+            subtree.parent = parent
+
+    def _delete(self, val: T) -> RedBlackTreeNode | None:
+        """
+        Unlinks the node holding {val} and returns it, or returns None if there is none.
+        Nodes are moved rather than having their values copied, so every other node keeps its value
+        """
+        node = self.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                break
+            node = node.left if val < node_val else node.right
+        if node is None:
+            return None
+        # removed_color is the color of the position that disappears from the tree,
+        # child is the subtree that moves up into it and child_parent its new parent
+        if node.left is None or node.right is None:
+            removed_color = node.color
+            child = node.left if node.left is not None else node.right
+            child_parent = node.parent
+            self._transplant(node, child)
+        else:
+            # The max of the left subtree takes the place and the color of node
+            replacement = node.left
+            while replacement.right is not None:
+                replacement = replacement.right
+            removed_color = replacement.color
+            child = replacement.left
+            if replacement.parent is node:
+                child_parent = replacement
+            else:
+                child_parent = replacement.parent
+                self._transplant(replacement, child)
+                replacement.left = node.left
+                replacement.left.parent = replacement
+            self._transplant(node, replacement)
+            replacement.right = node.right
+            replacement.right.parent = replacement
+            replacement.color = node.color
+        # Every subtree from child_parent up to the root lost one node
+        ancestor = child_parent
+        while ancestor is not None:
+            ancestor.size = 1 + bst.size(ancestor.left) + bst.size(ancestor.right)
+            ancestor = ancestor.parent
+        if removed_color is BLACK:
+            self._delete_fixup(child, child_parent)
+        node.left = node.right = node.parent = None
+        return node
+
+    def _delete_fixup(
+        self, node: RedBlackTreeNode | None, parent: RedBlackTreeNode | None
+    ) -> None:
+        """
+        Restores the invariants after a black node was spliced out and replaced by {node}.
+        Every path through {node} is now one black short. {node} can be None,
+        which is why its parent is passed in explicitly.
+        """
+        while node is not self.root and not _is_red(node):
+            assert parent is not None
+            if node is parent.left:
+                sibling = parent.right
+                # The paths through sibling have at least one more black node than the ones through node
+                assert sibling is not None
+                if sibling.color is RED:
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._left_rotate(parent)
+                    sibling = parent.right
+                    assert sibling is not None
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    # Take one black off the sibling's side and push the deficit up to parent
+                    sibling.color = RED
+                    node = parent
+                    parent = node.parent
+                else:
+                    if not _is_red(sibling.right):
+                        sibling.left.color = BLACK
+                        sibling.color = RED
+                        self._right_rotate(sibling)
+                        sibling = parent.right
+                    sibling.color = parent.color
+                    parent.color = BLACK
+                    sibling.right.color = BLACK
+                    self._left_rotate(parent)
+                    node = self.root
+            else:
+                sibling = parent.left
+                assert sibling is not None
+                if sibling.color is RED:
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._right_rotate(parent)
+                    sibling = parent.left
+                    assert sibling is not None
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.color = RED
+                    node = parent
+                    parent = node.parent
+                else:
+                    if not _is_red(sibling.left):
+                        sibling.right.color = BLACK
+                        sibling.color = RED
+                        self._left_rotate(sibling)
+                        sibling = parent.left
+                    sibling.color = parent.color
+                    parent.color = BLACK
+                    sibling.left.color = BLACK
+                    self._right_rotate(parent)
+                    node = self.root
+        if node is not None:
+            node.color = BLACK
+
+    def check_invariants(self) -> int:
+        """
+        Verifies the search tree order, parent pointers, subtree sizes and the red black properties.
+        Raises AssertionError on the first violation and returns the black height of the tree otherwise.
+        Meant for tests and debugging, it visits every node.
+        """
+        if _is_red(self.root):
+            raise AssertionError("The root must be black")
+        if self.root is not None and self.root.parent is not None:
+            raise AssertionError("The root must not have a parent")
+
+        def check(
+            node: RedBlackTreeNode | None,
+            lo: RedBlackTreeNode | None,
+            hi: RedBlackTreeNode | None,
+        ) -> int:
+            """
+            Checks the subtree of {node}, whose values must lie strictly between the values of the
+            nodes {lo} and {hi}, the nearest ancestors it is right and left of. None means unbounded
+            """
+            if node is None:
+                return 1
+            for child in (node.left, node.right):
+                if child is None:
+                    continue
+                if child.parent is not node:
+                    raise AssertionError(f"Broken parent pointer below {node.val!r}")
+                if node.color is RED and child.color is RED:
+                    raise AssertionError(f"Red node {node.val!r} has a red child")
+            if lo is not None and not lo.val < node.val:
+                raise AssertionError(
+                    f"{node.val!r} is not greater than its ancestor {lo.val!r}"
+                )
+            if hi is not None and not node.val < hi.val:
+                raise AssertionError(
+                    f"{node.val!r} is not less than its ancestor {hi.val!r}"
+                )
+            if node.size != 1 + bst.size(node.left) + bst.size(node.right):
+                raise AssertionError(f"Wrong subtree size at {node.val!r}")
+            black_height = check(node.left, lo, node)
+            if black_height != check(node.right, node, hi):
+                raise AssertionError(f"Black heights differ below {node.val!r}")
+            return black_height + (1 if node.color is BLACK else 0)
 
-        return search_from_node(val, self.root)
+        return check(self.root, None, None)
@@ -0,0 +1,272 @@
+"""A bounded cache in front of AvlTree.search() for skewed lookups.
+
+A search walks O(log n) levels of the tree, a comparison or two and a Python bytecode loop iteration
+per level. When most lookups go to a few thousand hot keys out of millions, as under a Zipf
+distribution, a dict lookup in front of the walk answers most of them in O(1).
+
+CachedAvlTree remembers the result of search(val), found or not, for up to {capacity} values.
+insert(val) and delete(val) drop the cached result for val, and anything that replaces the tree's
+root, like insert_many(), delete_many(), split(), join() and the set operations, drops the whole
+cache. So does an insert or delete that rotates at the root, which only happens O(log n) times
+over n updates.
+
+Two eviction policies, clock being the default:
+    - lru: Evicts the value searched least recently. An OrderedDict, so a hit moves the value to the
+      end of it.
+    - clock: Approximates LRU with a reference bit per slot, set on a hit. A full cache advances a hand
+      over the slots, clearing the set bits, and evicts the first slot whose bit is already clear. A
+      hit only sets a bit, so it is cheaper than an LRU hit, but a hot value is sometimes evicted
+      before a colder one. Under Zipf s=1.1 lookups both reach the same hit rate, and clock is the
+      faster of the two (see benchmarks/bench_search_cache.py).
+
+Classes:
+    - LruCache, ClockCache: The caches, usable on their own for any hashable keys.
+    - CachedAvlTree: An AvlTree with a cache in front of search().
+
+Notes:
+    - The values of a CachedAvlTree must be hashable, as well as ordered.
+    - Trees returned by from_sorted(), split() and the set operations get a cache with the default
+      capacity and policy.
+
+Example:
+    >>> tree = CachedAvlTree.from_sorted(range(1000))
+    >>> tree.search(7), tree.search(7), tree.search(1000)
+    (True, True, False)
+    >>> tree.cache_info()
+    CacheInfo(hits=1, misses=2, capacity=4096, size=2)
+"""
+
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, TypeVar
+
+from avltree import AvlTree, AvlTreeNode
+
+T = TypeVar("T")
+
+DEFAULT_CAPACITY = 4096
+
+_MISSING: Any = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    capacity: int
+    size: int
+
+
+class LruCache:
+    """
+    Maps up to {capacity} keys to values, evicting the least recently used key
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        _check_capacity(capacity)
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value of {key} and marks it as used, or {default} if it is not cached
+        """
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches {value} for {key}, evicting the least recently used key if the cache is full
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drops every key. The hit and miss counters are kept
+        """
+        self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.capacity, len(self))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class ClockCache:
+    """
+    Maps up to {capacity} keys to values, evicting with the CLOCK (second chance) policy
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        _check_capacity(capacity)
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        # key -> the index of its slot in the lists below
+        self._slots: dict[Hashable, int] = {}
+        self._keys: list[Any] = []
+        self._values: list[Any] = []
+        self._referenced: list[bool] = []
+        # Slots emptied by discard(), reused before anything is evicted
+        self._free: list[int] = []
+        self._hand = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value of {key} and sets its reference bit, or {default} if it is not cached
+        """
+        index = self._slots.get(key)
+        if index is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._referenced[index] = True
+        return self._values[index]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches {value} for {key}. If the cache is full, the hand evicts the first key it finds
+        whose reference bit is clear, clearing the set bits it passes
+        """
+        index = self._slots.get(key)
+        if index is not None:
+            self._values[index] = value
+            self._referenced[index] = True
+            return
+        if self._free:
+            index = self._free.pop()
+            self._keys[index] = key
+            self._values[index] = value
+        elif len(self._keys) < self.capacity:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._referenced.append(False)
+        else:
+            index = self._evict()
+            self._keys[index] = key
+            self._values[index] = value
+        self._slots[key] = index
+
+    def _evict(self) -> int:
+        """
+        Empties the slot under the hand once its reference bit is clear and returns its index
+        """
+        referenced = self._referenced
+        hand = self._hand
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % self.capacity
+        del self._slots[self._keys[hand]]
+        self._hand = (hand + 1) % self.capacity
+        return hand
+
+    def discard(self, key: Hashable) -> None:
+        index = self._slots.pop(key, None)
+        if index is not None:
+            self._keys[index] = self._values[index] = None
+            self._referenced[index] = False
+            self._free.append(index)
+
+    def clear(self) -> None:
+        """
+        Drops every key. The hit and miss counters are kept
+        """
+        self._slots.clear()
+        self._keys.clear()
+        self._values.clear()
+        self._referenced.clear()
+        self._free.clear()
+        self._hand = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.capacity, len(self))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+
+CACHE_POLICIES = {"lru": LruCache, "clock": ClockCache}
+
+
+def _check_capacity(capacity: int) -> None:
+    if capacity < 1:
+        raise ValueError(f"'capacity' must be at least 1, but got capacity={capacity}")
+
+
+class CachedAvlTree(AvlTree[T]):
+    """
+    An AvlTree that caches the results of search(). See the module docstring
+    """
+
+    def __init__(
+        self,
+        root: AvlTreeNode | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+        policy: str = "clock",
+    ):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                f"'policy' must be one of {tuple(CACHE_POLICIES)}, but got policy={policy!r}"
+            )
+        self.cache = CACHE_POLICIES[policy](capacity)
+        super().__init__(root)
+
+    @property
+    def root(self) -> AvlTreeNode | None:
+        return self._root
+
+    @root.setter
+    def root(self, root: AvlTreeNode | None) -> None:
+        # Whatever replaces the root may have changed any value in the tree
+        self._root = root
+        self.cache.clear()
+
+    def cache_info(self) -> CacheInfo:
+        """
+        The hits and misses of search() so far, and the capacity and current size of the cache
+        """
+        return self.cache.info()
+
+    def search(self, val: T) -> bool:
+        """
+        Search for a key with {val} in the Tree, or in the cache of recent searches
+        """
+        found = self.cache.get(val)
+        if found is None:
+            found = AvlTree.search(self, val)
+            self.cache.put(val, found)
+        return found
+
+    def insert(self, val: T) -> None:
+        """
+        Inserts a value {val} into the tree and drops its cached search result
+        """
+        self.cache.discard(val)
+        self._find_or_insert(val, self._node_type)
+
+    def delete(self, val: T) -> None:
+        """
+        Delete a value {val} from the Tree and drops its cached search result
+        """
+        self.cache.discard(val)
+        self._delete(val)
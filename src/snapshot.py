@@ -0,0 +1,189 @@
+"""
+snapshot.py
+
+A compact binary file format for the values of a tree, in ascending order. AvlTree.save() and
+RedBlackTree.save() write it, and load() rebuilds a balanced tree from it with from_sorted() in O(n),
+without a single insert or rotation. The file only holds the values, not the shape of the tree, so a
+snapshot saved from one kind of tree can be loaded into the other.
+
+The file starts with a 16 byte header:
+    - magic (4 bytes): b"DSZT"
+    - version (1 byte): FORMAT_VERSION
+    - typecode (1 byte): The array.array typecode of the values, b"q" for ints that fit in 64 bits or
+      b"d" for floats, or b"O" for any other values
+    - byteorder (1 byte): 0 if the numbers were written little endian, 1 if big endian
+    - 1 byte of padding
+    - count (8 bytes, little endian): The number of values
+For "q" and "d" the header is followed by the values as a raw array, which load memory maps and reads
+straight into the new nodes. For "O" it is followed by pickled lists of up to PICKLE_CHUNK values each.
+Only the flat lists of values are pickled, never the nodes, so there is no recursion over the tree.
+
+Functions:
+    - write_snapshot: Writes sorted values to a snapshot file.
+    - read_snapshot: Yields the values of a snapshot file in order.
+    - paused_gc: A context manager that turns off the cyclic garbage collector while a tree is built.
+
+Notes:
+    - Loading a snapshot of "O" values unpickles it, so only load those from a source you trust.
+    - write_snapshot() writes a temporary file next to {path} and renames it over {path} once it is
+      complete, so a crash never leaves a half written snapshot behind.
+"""
+
+import gc
+import mmap
+import os
+import pickle
+import secrets
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+MAGIC = b"DSZT"
+FORMAT_VERSION = 1
+# How many values go into each pickled list of a snapshot of non numeric values
+PICKLE_CHUNK = 4096
+
+_HEADER = struct.Struct("<4sBcBxQ")
+_OBJECT_TYPECODE = "O"
+_BYTEORDERS = ("little", "big")
+
+
+def write_snapshot(path: str | os.PathLike, values: Iterable[Any]) -> int:
+    """
+    Writes {values}, which must be in ascending order, to the snapshot file {path}. Replaces {path} if it
+    exists. Returns the number of values written
+    """
+    values = list(values)
+    typecode = _typecode(values)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        typecode.encode(),
+        _BYTEORDERS.index(sys.byteorder),
+        len(values),
+    )
+    out_dir = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = _create_temp_file(out_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(header)
+            if typecode == _OBJECT_TYPECODE:
+                chunks = iter(values)
+                while chunk := list(islice(chunks, PICKLE_CHUNK)):
+                    pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                array(typecode, values).tofile(out)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return len(values)
+
+
+def read_snapshot(path: str | os.PathLike) -> Iterator[Any]:
+    """
+    Yields the values of the snapshot file {path} in the order they were written.
+    Numeric values are read through a memory map of the file, which stays open until the last value
+    has been yielded or the generator is closed.
+
+    Raises:
+        ValueError: If {path} is not a snapshot, has a version this one can't read, or is truncated.
+    """
+    with open(path, "rb") as source:
+        header = source.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is too short to be a snapshot")
+        magic, version, typecode, byteorder, count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a snapshot, it starts with {magic!r}")
+        if not 1 <= version <= FORMAT_VERSION:
+            raise ValueError(
+                f"{path} is a version {version} snapshot, but only 1 to {FORMAT_VERSION} can be read"
+            )
+        if byteorder not in (0, 1):
+            raise ValueError(f"{path} is not a snapshot, its byte order is {byteorder}")
+        typecode = typecode.decode()
+        if typecode == _OBJECT_TYPECODE:
+            yield from _read_pickled(source, path, count)
+            return
+        itemsize = array(typecode).itemsize
+        size = os.fstat(source.fileno()).st_size - _HEADER.size
+        if size != count * itemsize:
+            raise ValueError(
+                f"{path} should hold {count} values of {itemsize} bytes, but has {size} bytes of them"
+            )
+        if count == 0:
+            return
+        if _BYTEORDERS[byteorder] != sys.byteorder:
+            swapped = array(typecode)
+            swapped.frombytes(source.read())
+            swapped.byteswap()
+            yield from swapped
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as whole, whole[
+                _HEADER.size :
+            ] as payload, payload.cast(typecode) as view:
+                yield from view
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Turns off the cyclic garbage collector until the block exits, if it was on.
+    Every node is an object the collector tracks, so building a tree of millions of nodes triggers
+    collections that scan the whole growing heap again and again, which took more than half the time
+    of a load. A tree under construction holds no garbage, so there is nothing for them to find
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _create_temp_file(out_dir: str) -> tuple[int, str]:
+    """
+    Creates a new file with a unique name in {out_dir} and returns its descriptor and path.
+    Unlike tempfile.mkstemp() it is created with the mode the umask gives a new file, as it is
+    renamed over the snapshot
+    """
+    while True:
+        path = os.path.join(out_dir, f".snapshot-{secrets.token_hex(8)}.tmp")
+        try:
+            flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
+def _read_pickled(source, path: str | os.PathLike, count: int) -> Iterator[Any]:
+    remaining = count
+    while remaining > 0:
+        try:
+            chunk = pickle.load(source)
+        except (EOFError, pickle.UnpicklingError):
+            raise ValueError(
+                f"{path} should hold {count} values, but ends after {count - remaining}"
+            ) from None
+        remaining -= len(chunk)
+        yield from chunk
+
+
+def _typecode(values: list[Any]) -> str:
+    """
+    'q' for ints that fit in 64 bits, 'd' for floats, 'O' for anything else.
+    Exact types only, as an array would turn a bool into an int or an int into a float
+    """
+    if all(type(value) is int for value in values):
+        if not values or (-(2**63) <= min(values) and max(values) < 2**63):
+            return "q"
+        return _OBJECT_TYPECODE
+    if all(type(value) is float for value in values):
+        return "d"
+    return _OBJECT_TYPECODE
@@ -0,0 +1,89 @@
+"""Streaming renderers for binary trees.
+
+PrettyPrintTree lays out the whole picture in memory before returning it, which is fine for
+debugging a few dozen nodes but not for a tree with millions of them.
+The renderers here are generators that yield one line at a time, so the output can be written
+straight to a file or a pipe. They walk the tree with an explicit stack, so memory is O(height).
+
+They work on any node with left, right and val attributes (AvlTreeNode, RedBlackTreeNode, ...).
+Red black nodes are drawn with their color.
+
+Example:
+    >>> with open("tree.dot", "w") as out:
+    ...     out.writelines(render_dot(tree.root))
+"""
+
+from typing import Any, Callable, Iterator
+
+
+def _default_label(node: Any) -> str:
+    return str(node.val)
+
+
+def _color_name(node: Any) -> str | None:
+    color = getattr(node, "color", None)
+    return color.name.lower() if color is not None else None
+
+
+def render_text(
+    root: Any, label: Callable[[Any], str] = _default_label
+) -> Iterator[str]:
+    """
+    Yields the tree as indented lines, one node per line, in pre-order.
+    Each child is prefixed with L: or R: so single children are unambiguous.
+
+        5
+        ├── L: 3
+        │   └── R: 4
+        └── R: 8
+    """
+    if root is None:
+        yield "Empty-Tree\n"
+        return
+    yield f"{label(root)}\n"
+    # (node, side, prefix of the line, whether it is the last child of its parent)
+    stack = []
+    if root.right is not None:
+        stack.append((root.right, "R", "", True))
+    if root.left is not None:
+        stack.append((root.left, "L", "", root.right is None))
+    while stack:
+        node, side, prefix, is_last = stack.pop()
+        yield f"{prefix}{'└── ' if is_last else '├── '}{side}: {label(node)}\n"
+        child_prefix = prefix + ("    " if is_last else "│   ")
+        if node.right is not None:
+            stack.append((node.right, "R", child_prefix, True))
+        if node.left is not None:
+            stack.append((node.left, "L", child_prefix, node.right is None))
+
+
+def render_dot(
+    root: Any, label: Callable[[Any], str] = _default_label, name: str = "Tree"
+) -> Iterator[str]:
+    """
+    Yields the tree as a Graphviz DOT digraph, a line at a time.
+    Nodes are numbered in pre-order. Render it with `dot -Tsvg tree.dot -o tree.svg`
+    """
+    yield f"digraph {name} {{\n"
+    yield "    node [shape=circle];\n"
+    next_id = 0
+    # (node, id of its parent or -1 for the root)
+    stack = [(root, -1)] if root is not None else []
+    while stack:
+        node, parent_id = stack.pop()
+        node_id = next_id
+        next_id += 1
+        text = label(node).replace("\\", "\\\\").replace('"', '\\"')
+        color = _color_name(node)
+        if color is None:
+            yield f'    n{node_id} [label="{text}"];\n'
+        else:
+            font = "white" if color == "black" else "black"
+            yield f'    n{node_id} [label="{text}", style=filled, fillcolor={color}, fontcolor={font}];\n'
+        if parent_id >= 0:
+            yield f"    n{parent_id} -> n{node_id};\n"
+        if node.right is not None:
+            stack.append((node.right, node_id))
+        if node.left is not None:
+            stack.append((node.left, node_id))
+    yield "}\n"
@@ -0,0 +1,371 @@
+"""Opt-in operation counters and timing hooks for AvlTree and RedBlackTree.
+
+instrument(tree) turns on counting for one tree by swapping the class of the tree object for an
+instrumented subclass, and uninstrument(tree) swaps it back. The subclass overrides search(), insert()
+and delete(), _find_or_insert() and the methods that rotate, and counts into a TreeStats. Trees that are not instrumented
+run the original methods, so when instrumentation is off it costs nothing at all: there is no flag that
+every call has to check.
+
+What is counted, per tree:
+    - operations: How many searches, inserts and deletes ran.
+    - comparisons, nodes_visited: The == and < comparisons every operation makes with the value it was
+      called with, and the nodes on its search path, the nodes whose value it compares that value with.
+      The operation runs with the value wrapped in a _Probe, which counts its comparisons as the descent
+      makes them. So values must return NotImplemented from == for types they do not know, as the
+      built-in types do. The walk delete() makes from the node it removes down to its replacement
+      compares nothing, so those nodes are not on the search path. The search cache of a CachedAvlTree
+      only ever sees the value itself, so a cache hit counts no comparisons.
+    - single_rotations, double_rotations: AvlTree rotations, counted in _apply_rotation(). A red black
+      fixup rotates through _left_rotate() and _right_rotate() one rotation at a time, so every rotation of
+      a RedBlackTree counts as single, and its double rotations show up as two.
+    - recolorings: RedBlackTree color flips. Every node of the tree gets a node subclass whose color is a
+      property that counts the writes that change it.
+    - depth_histogram: How many operations walked a search path of each length.
+    - height_histogram: The tree height after every operation. AvlTree only, as red black nodes do not
+      store their height.
+    - size_histogram: The tree size at every operation, bucketed by powers of two: bucket b counts the
+      operations that ran on a tree with 2**(b-1) <= size < 2**b values.
+join(), split(), the set operations and the batch operations are not counted. The trees they return
+are instrumented too when they are built by an instrumented tree, each with fresh TreeStats of its own.
+
+Example:
+    >>> tree = AvlTree()
+    >>> stats = instrument(tree, on_operation=lambda name, val, ns: print(name, val, ns))
+    >>> tree.insert(5)
+    insert 5 1210
+    >>> stats.operations
+    Counter({'insert': 1})
+"""
+
+from collections import Counter
+from inspect import isfunction
+from time import perf_counter_ns
+from typing import Any, Callable
+
+import bst
+from avltree import AvlTree
+from rbtree import RedBlackTree, RedBlackTreeNode
+from search_cache import CachedAvlTree
+
+# Called as on_operation(name, val, elapsed_ns) after every operation of an instrumented tree
+OperationCallback = Callable[[str, Any, int], None]
+
+_color_slot = RedBlackTreeNode.__dict__["color"]
+
+
+class TreeStats:
+    """
+    The counters of one instrumented tree. See the module docstring for what each one means
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.operations = Counter()
+        self.comparisons = 0
+        self.nodes_visited = 0
+        self.single_rotations = 0
+        self.double_rotations = 0
+        self.recolorings = 0
+        self.depth_histogram = Counter()
+        self.height_histogram = Counter()
+        self.size_histogram = Counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            name: dict(value) if isinstance(value, Counter) else value
+            for name, value in vars(self).items()
+        }
+
+    def __repr__(self) -> str:
+        counts = ", ".join(
+            f"{name}={value}"
+            for name, value in self.as_dict().items()
+            if not isinstance(value, dict)
+        )
+        return f"TreeStats({counts}, operations={dict(self.operations)})"
+
+
+def instrument(
+    tree: AvlTree | RedBlackTree, on_operation: OperationCallback | None = None
+) -> TreeStats:
+    """
+    Starts counting the operations on {tree} and returns the TreeStats they are counted into.
+    {on_operation} is called as on_operation(name, val, elapsed_ns) after every search, insert and delete.
+    Instrumenting a tree that already is replaces the callback and keeps the counts
+    """
+    if _is_instrumented(tree):
+        tree._on_operation = on_operation
+        return tree._stats
+    stats = TreeStats()
+    tree._stats = stats
+    tree._on_operation = on_operation
+    if isinstance(tree, RedBlackTree):
+        _count_colors_of_nodes(tree)
+    if isinstance(tree, CachedAvlTree):
+        tree.cache = _UnwrappingCache(tree.cache)
+    tree.__class__ = _instrumented_type(type(tree))
+    return stats
+
+
+def uninstrument(tree: AvlTree | RedBlackTree) -> TreeStats | None:
+    """
+    Stops counting the operations on {tree} and returns its final TreeStats, or None if it was not instrumented
+    """
+    if not _is_instrumented(tree):
+        return None
+    stats = tree._stats
+    tree.__class__ = tree._uninstrumented_type
+    if isinstance(tree, RedBlackTree):
+        counting_types = set(tree._node_types.values())
+        for node in bst.iter_nodes(tree.root):
+            if type(node) in counting_types:
+                node.__class__ = type(node).__bases__[0]
+        del tree._node_types
+    if isinstance(tree, CachedAvlTree):
+        tree.cache = tree.cache.cache
+    del tree._stats, tree._on_operation
+    return stats
+
+
+class _Instrumented:
+    """
+    The methods every instrumented tree class overrides. This and the two classes below are only
+    namespaces, the instrumented classes copy their methods. They can't be mixins: a tree's class can
+    only be swapped for a class with the same base layout, so the instrumented class must derive from
+    the tree class alone. That is also why the original methods are called through _uninstrumented_type
+    instead of super()
+    """
+
+    _stats: TreeStats
+    _on_operation: OperationCallback | None
+    _uninstrumented_type: type
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """
+        A tree built by an instrumented tree, like the results of split() and the set operations, or one
+        built through from_sorted(), starts out instrumented with fresh stats and no callback
+        """
+        self._uninstrumented_type.__init__(self, *args, **kwargs)
+        self._stats = TreeStats()
+        self._on_operation = None
+        if isinstance(self, RedBlackTree):
+            _count_colors_of_nodes(self)
+        if isinstance(self, CachedAvlTree):
+            self.cache = _UnwrappingCache(self.cache)
+
+    def search(self, val: Any) -> bool:
+        return self._run("search", self._uninstrumented_type.search, val)
+
+    def insert(self, val: Any) -> None:
+        return self._run("insert", self._uninstrumented_type.insert, val)
+
+    def delete(self, val: Any) -> None:
+        return self._run("delete", self._uninstrumented_type.delete, val)
+
+    def _run(self, name: str, operation: Callable[[Any, Any], Any], val: Any) -> Any:
+        stats = self._stats
+        stats.size_histogram[len(self).bit_length()] += 1
+        probe = _Probe(val)
+        start = perf_counter_ns()
+        result = operation(self, probe)
+        elapsed = perf_counter_ns() - start
+        stats.operations[name] += 1
+        stats.comparisons += probe.comparisons
+        stats.nodes_visited += probe.nodes_visited
+        stats.depth_histogram[probe.nodes_visited] += 1
+        height = getattr(self.root, "height", None)
+        if height is not None or self.root is None:
+            stats.height_histogram[height or 0] += 1
+        if self._on_operation is not None:
+            self._on_operation(name, val, elapsed)
+        return result
+
+    def _find_or_insert(self, val: Any, node_type: type) -> tuple[Any, bool]:
+        if isinstance(self, RedBlackTree):
+            node_type = _counting_node_type(self, node_type)
+        if type(val) is _Probe:
+            # The new node holds the value itself, not the probe
+            node_type = _unwrapping_node_type(node_type)
+        return self._uninstrumented_type._find_or_insert(self, val, node_type)
+
+
+class _Probe:
+    """
+    Wraps the value an instrumented operation was called with and counts the comparisons made with it.
+    Every node on a search path compares its value for equality with it first, so the == comparisons
+    are the nodes visited. Equal to and hashed like the value, so a dict keyed by values still finds it
+    """
+
+    __slots__ = ("val", "comparisons", "nodes_visited")
+
+    def __init__(self, val: Any):
+        self.val = val
+        self.comparisons = 0
+        self.nodes_visited = 0
+
+    def __eq__(self, other: Any) -> bool:
+        self.comparisons += 1
+        self.nodes_visited += 1
+        return self.val == other
+
+    def __lt__(self, other: Any) -> bool:
+        self.comparisons += 1
+        return self.val < other
+
+    def __gt__(self, other: Any) -> bool:
+        self.comparisons += 1
+        return other < self.val
+
+    def __hash__(self) -> int:
+        return hash(self.val)
+
+
+class _UnwrappingCache:
+    """
+    Stands in for the search cache of an instrumented CachedAvlTree. The tree hands its cache the value
+    it was called with, which is a _Probe during an instrumented operation. This passes the value on
+    instead, so the cache never keeps a probe and its lookups are not counted as comparisons
+    """
+
+    __slots__ = ("cache",)
+
+    def __init__(self, cache: Any):
+        self.cache = cache
+
+    def get(self, val: Any, default: Any = None) -> Any:
+        return self.cache.get(_unwrap(val), default)
+
+    def put(self, val: Any, found: Any) -> None:
+        self.cache.put(_unwrap(val), found)
+
+    def discard(self, val: Any) -> None:
+        self.cache.discard(_unwrap(val))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.cache, name)
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def __contains__(self, val: Any) -> bool:
+        return _unwrap(val) in self.cache
+
+
+def _unwrap(val: Any) -> Any:
+    return val.val if type(val) is _Probe else val
+
+
+def _unwrapping_node_type(node_type: type) -> Callable[..., Any]:
+    def create(probe: _Probe, **kwargs: Any) -> Any:
+        return node_type(probe.val, **kwargs)
+
+    return create
+
+
+class _InstrumentedAvl:
+    def _apply_rotation(self, node: Any) -> Any:
+        balance = node.balance()
+        if balance > 1:
+            self._count_rotation(node.right is not None and node.right.balance() < 0)
+        elif balance < -1:
+            self._count_rotation(node.left is not None and node.left.balance() > 0)
+        return self._uninstrumented_type._apply_rotation(node)
+
+    def _count_rotation(self, double: bool) -> None:
+        if double:
+            self._stats.double_rotations += 1
+        else:
+            self._stats.single_rotations += 1
+
+
+class _InstrumentedRedBlack:
+    _node_types: dict[type, type]
+
+    def _left_rotate(self, node: Any) -> None:
+        self._stats.single_rotations += 1
+        self._uninstrumented_type._left_rotate(self, node)
+
+    def _right_rotate(self, node: Any) -> None:
+        self._stats.single_rotations += 1
+        self._uninstrumented_type._right_rotate(self, node)
+
+
+_instrumented_types: dict[type, type] = {}
+
+
+def _is_instrumented(tree: Any) -> bool:
+    return "_uninstrumented_type" in vars(type(tree))
+
+
+def _instrumented_type(tree_type: type) -> type:
+    """
+    The instrumented subclass of {tree_type}, created on first use
+    """
+    instrumented = _instrumented_types.get(tree_type)
+    if instrumented is None:
+        namespace = {"_uninstrumented_type": tree_type}
+        extra = (
+            _InstrumentedRedBlack
+            if issubclass(tree_type, RedBlackTree)
+            else _InstrumentedAvl
+        )
+        for methods in (_Instrumented, extra):
+            namespace.update(
+                (name, value)
+                for name, value in vars(methods).items()
+                if isfunction(value)
+            )
+        instrumented = type(
+            f"Instrumented{tree_type.__name__}", (tree_type,), namespace
+        )
+        _instrumented_types[tree_type] = instrumented
+    return instrumented
+
+
+def _count_colors_of_nodes(tree: RedBlackTree) -> None:
+    """
+    Gives every node of {tree} the counting node type of {tree}. Nodes that came from another
+    instrumented tree stop counting into that tree's stats
+    """
+    tree._node_types = {}
+    for node in bst.iter_nodes(tree.root):
+        node_type = type(node)
+        node.__class__ = _counting_node_type(
+            tree, vars(node_type).get("_counted_type", node_type)
+        )
+
+
+def _counting_node_type(tree: RedBlackTree, node_type: type) -> type:
+    """
+    A subclass of {node_type} that counts color changes into the stats of {tree}. One per tree and node type,
+    as a node has no reference to its tree
+    """
+    counting = tree._node_types.get(node_type)
+    if counting is None:
+        stats = tree._stats
+
+        def get_color(node):
+            return _color_slot.__get__(node)
+
+        def set_color(node, color):
+            try:
+                if _color_slot.__get__(node) is not color:
+                    stats.recolorings += 1
+            except AttributeError:
+                # The first color a node gets in __init__ is not a change
+                pass
+            _color_slot.__set__(node, color)
+
+        counting = type(
+            node_type.__name__,
+            (node_type,),
+            {
+                "__slots__": (),
+                "color": property(get_color, set_color),
+                "_counted_type": node_type,
+            },
+        )
+        tree._node_types[node_type] = counting
+    return counting
@@ -0,0 +1,222 @@
+"""Sorted maps on top of AvlTree and RedBlackTree.
+
+The trees only store values. Using them as a map used to mean putting (key, payload) tuples in the tree
+and keeping a dict next to it for the payloads, which doubles both the memory and the lookups.
+AvlMap and RedBlackMap store the payload on the node instead. A lookup is a single descent that
+ends on the node holding the payload.
+
+Keys are ordered by themselves, or by key(k) if a key function is given. The key function runs once
+when a key is inserted and the result is stored on the node as its val, which is what the tree
+compares. Two keys with equal key(k) are the same map key.
+
+The maps wrap a tree rather than subclass it, since the tree's value based API (insert(val),
+from_sorted(), union(), ...) does not make sense for a map. They reuse the tree's node level
+operations, _find_or_insert() and _delete(), which keep node identities stable, so a payload never has
+to move between nodes.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+import bst
+from avltree import AvlTree, AvlTreeNode
+from rbtree import RedBlackTree, RedBlackTreeNode
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+_MISSING: Any = object()
+_get_key = attrgetter("key")
+_get_value = attrgetter("value")
+_get_item = attrgetter("key", "value")
+
+
+class AvlMapNode(AvlTreeNode):
+    """
+    An AvlTreeNode that also holds the original key and its payload. val is the sort key
+    """
+
+    __slots__ = ("key", "value")
+
+
+class RedBlackMapNode(RedBlackTreeNode):
+    """
+    A RedBlackTreeNode that also holds the original key and its payload. val is the sort key
+    """
+
+    __slots__ = ("key", "value")
+
+
+class _TreeMap(Generic[K, V]):
+    """
+    The map logic shared by AvlMap and RedBlackMap. Subclasses pick the tree and node types
+    """
+
+    _tree_type: type
+    _node_type: type
+
+    def __init__(self, key: Callable[[K], Any] | None = None):
+        self._tree = self._tree_type()
+        self._key = key
+
+    def _sort_key(self, key: K) -> Any:
+        return self._key(key) if self._key is not None else key
+
+    def _find(self, key: K) -> Any:
+        val = self._sort_key(key)
+        node = self._tree.root
+        while node is not None:
+            node_val = node.val
+            if node_val == val:
+                return node
+            node = node.left if val < node_val else node.right
+        return None
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def __contains__(self, key: K) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: K) -> V:
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Returns the payload of {key}, or {default} if it is not in the map
+        """
+        node = self._find(key)
+        return node.value if node is not None else default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """
+        Sets the payload of {key}. Like a dict, a key that is already in the map keeps its original
+        form, even if {key} differs from it and only has the same sort key
+        """
+        node, inserted = self._tree._find_or_insert(
+            self._sort_key(key), self._node_type
+        )
+        if inserted:
+            node.key = key
+        node.value = value
+
+    def setdefault(self, key: K, default: V | None = None) -> V | None:
+        """
+        Returns the payload of {key}. If it is not in the map, inserts it with {default} first
+        """
+        node, inserted = self._tree._find_or_insert(
+            self._sort_key(key), self._node_type
+        )
+        if inserted:
+            node.key = key
+            node.value = default
+        return node.value
+
+    def __delitem__(self, key: K) -> None:
+        if self._tree._delete(self._sort_key(key)) is None:
+            raise KeyError(key)
+
+    def pop(self, key: K, default: V = _MISSING) -> V:
+        """
+        Removes {key} and returns its payload. If it is not in the map, returns {default} if given
+        and raises KeyError otherwise
+        """
+        node = self._tree._delete(self._sort_key(key))
+        if node is not None:
+            return node.value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def __iter__(self) -> Iterator[K]:
+        return map(_get_key, bst.iter_nodes(self._tree.root))
+
+    def __reversed__(self) -> Iterator[K]:
+        return map(_get_key, bst.iter_nodes(self._tree.root, reverse=True))
+
+    def keys(self) -> Iterator[K]:
+        """
+        Yields the keys in order
+        """
+        return iter(self)
+
+    def values(self) -> Iterator[V]:
+        """
+        Yields the payloads in the order of their keys
+        """
+        return map(_get_value, bst.iter_nodes(self._tree.root))
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Yields (key, payload) pairs in order
+        """
+        return map(_get_item, bst.iter_nodes(self._tree.root))
+
+    def irange(
+        self,
+        lo: K | None = None,
+        hi: K | None = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[K]:
+        """
+        Yields the keys {k} with lo <= k <= hi in order, see AvlTree.irange()
+        """
+        lo_val = self._sort_key(lo) if lo is not None else None
+        hi_val = self._sort_key(hi) if hi is not None else None
+        nodes = bst.irange_nodes(self._tree.root, lo_val, hi_val, inclusive, reverse)
+        return map(_get_key, nodes)
+
+    def _item(self, node: Any) -> tuple[K, V] | None:
+        return (node.key, node.value) if node is not None else None
+
+    def floor(self, key: K) -> tuple[K, V] | None:
+        """
+        Returns the (key, payload) pair with the largest key <= {key}, or None if there is none
+        """
+        return self._item(bst.floor_node(self._tree.root, self._sort_key(key)))
+
+    def ceiling(self, key: K) -> tuple[K, V] | None:
+        """
+        Returns the (key, payload) pair with the smallest key >= {key}, or None if there is none
+        """
+        return self._item(bst.ceiling_node(self._tree.root, self._sort_key(key)))
+
+    def predecessor(self, key: K) -> tuple[K, V] | None:
+        """
+        Returns the (key, payload) pair with the largest key < {key}, or None if there is none
+        """
+        val = self._sort_key(key)
+        return self._item(bst.floor_node(self._tree.root, val, inclusive=False))
+
+    def successor(self, key: K) -> tuple[K, V] | None:
+        """
+        Returns the (key, payload) pair with the smallest key > {key}, or None if there is none
+        """
+        val = self._sort_key(key)
+        return self._item(bst.ceiling_node(self._tree.root, val, inclusive=False))
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({{{items}}})"
+
+
+class AvlMap(_TreeMap[K, V]):
+    """
+    A sorted map backed by an AvlTree
+    """
+
+    _tree_type = AvlTree
+    _node_type = AvlMapNode
+
+
+class RedBlackMap(_TreeMap[K, V]):
+    """
+    A sorted map backed by a RedBlackTree
+    """
+
+    _tree_type = RedBlackTree
+    _node_type = RedBlackMapNode
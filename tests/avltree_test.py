@@ -0,0 +1,243 @@
+import random
+
+import pytest
+from avltree import AvlTree, AvlTreeNode
+
+
+def assert_avl(node: AvlTreeNode | None) -> int:
+    """Checks heights, balance and ordering of a subtree and returns its height"""
+    if node is None:
+        return 0
+    left_height = assert_avl(node.left)
+    right_height = assert_avl(node.right)
+    if node.left:
+        assert node.left.val < node.val
+    if node.right:
+        assert node.right.val > node.val
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.size == 1 + (node.left.size if node.left else 0) + (
+        node.right.size if node.right else 0
+    )
+    return node.height
+
+
+def in_order(node: AvlTreeNode | None) -> list:
+    if node is None:
+        return []
+    return in_order(node.left) + [node.val] + in_order(node.right)
+
+
+def test_from_sorted_empty():
+    tree = AvlTree.from_sorted([])
+    assert tree.is_empty()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 100, 1023, 1024])
+def test_from_sorted_is_balanced(n: int):
+    tree = AvlTree.from_sorted(range(n))
+    assert_avl(tree.root)
+    assert in_order(tree.root) == list(range(n))
+
+
+def test_from_sorted_accepts_generator_and_drops_duplicates():
+    tree = AvlTree.from_sorted(x // 2 for x in range(20))
+    assert_avl(tree.root)
+    assert in_order(tree.root) == list(range(10))
+
+
+def test_from_sorted_rejects_unsorted():
+    with pytest.raises(ValueError):
+        AvlTree.from_sorted([1, 3, 2])
+
+
+def test_from_iterable():
+    tree = AvlTree.from_iterable([5, 3, 9, 3, 1, 5, 7])
+    assert_avl(tree.root)
+    assert in_order(tree.root) == [1, 3, 5, 7, 9]
+    tree.insert(4)
+    tree.delete(9)
+    assert_avl(tree.root)
+    assert in_order(tree.root) == [1, 3, 4, 5, 7]
+
+
+def test_nodes_have_no_instance_dict():
+    node = AvlTreeNode(1)
+    assert not hasattr(node, "__dict__")
+
+
+def test_ascending_inserts_stay_balanced():
+    tree = AvlTree()
+    for i in range(1000):
+        tree.insert(i)
+    assert assert_avl(tree.root) <= 11
+    assert in_order(tree.root) == list(range(1000))
+
+
+def test_delete_node_with_two_children():
+    tree = AvlTree.from_sorted(range(7))
+    root_val = tree.root.val
+    tree.delete(root_val)
+    assert not tree.search(root_val)
+    assert_avl(tree.root)
+    assert in_order(tree.root) == [i for i in range(7) if i != root_val]
+
+
+def test_random_operations_match_set():
+    rng = random.Random(7)
+    tree = AvlTree()
+    expected = set()
+    for _ in range(5000):
+        val = rng.randrange(500)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+    assert_avl(tree.root)
+    assert in_order(tree.root) == sorted(expected)
+    assert all(tree.search(val) == (val in expected) for val in range(500))
+
+
+def test_rebalancing_stops_once_heights_settle(monkeypatch):
+    rng = random.Random(8)
+    tree = AvlTree.from_iterable(rng.sample(range(10**6), 10_000))
+    calls = 0
+    fix_height = AvlTree._fix_height
+
+    def counting_fix_height(node: AvlTreeNode) -> None:
+        nonlocal calls
+        calls += 1
+        fix_height(node)
+
+    monkeypatch.setattr(AvlTree, "_fix_height", staticmethod(counting_fix_height))
+    vals = rng.sample(range(10**6), 1000)
+    for val in vals:
+        tree.insert(val)
+    for val in vals:
+        tree.delete(val)
+    # The paths are about 14 nodes long, but the heights settle within a few levels on average
+    assert calls < 2000 * 5
+    monkeypatch.undo()
+    assert_avl(tree.root)
+
+
+def test_order_statistics():
+    rng = random.Random(3)
+    tree = AvlTree()
+    expected = set()
+    for _ in range(2000):
+        val = rng.randrange(400)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+    assert_avl(tree.root)
+    values = sorted(expected)
+    assert len(tree) == len(values)
+    assert [tree.select(k) for k in range(len(values))] == values
+    for val in range(-1, 402):
+        assert tree.rank(val) == sum(1 for v in values if v < val)
+    assert tree.count_range(100, 199) == sum(1 for v in values if 100 <= v <= 199)
+    assert tree.count_range(5, 4) == 0
+
+
+def test_select_out_of_range():
+    tree = AvlTree.from_sorted(range(3))
+    with pytest.raises(IndexError):
+        tree.select(3)
+    with pytest.raises(IndexError):
+        AvlTree().select(0)
+    assert len(AvlTree()) == 0
+
+
+@pytest.mark.parametrize("fraction", [0.0, float("inf")])
+def test_batch_operations(fraction: float):
+    rng = random.Random(11)
+    tree = AvlTree.from_sorted(range(0, 200, 2))
+    # 0 forces the merge and rebuild path, inf forces per-key operations
+    tree.BATCH_REBUILD_FRACTION = fraction
+    tree.BATCH_SCAN_FRACTION = fraction
+    expected = set(range(0, 200, 2))
+    for _ in range(20):
+        batch = [rng.randrange(250) for _ in range(rng.randrange(60))]
+        if rng.random() < 0.5:
+            tree.insert_many(batch)
+            expected.update(batch)
+        else:
+            tree.delete_many(batch)
+            expected.difference_update(batch)
+        assert_avl(tree.root)
+        assert list(tree) == sorted(expected)
+    queries = [rng.randrange(-5, 260) for _ in range(100)]
+    assert tree.contains_many(queries) == [q in expected for q in queries]
+
+
+def test_batch_operations_on_empty_tree():
+    tree = AvlTree()
+    tree.insert_many([3, 1, 2, 3])
+    assert list(tree) == [1, 2, 3]
+    assert tree.contains_many([]) == []
+    tree.delete_many([1, 2, 3, 4])
+    assert tree.is_empty()
+
+
+def random_tree(rng: random.Random, count: int, key_space: int) -> tuple[AvlTree, set]:
+    values = {rng.randrange(key_space) for _ in range(count)}
+    tree = AvlTree()
+    for val in values:
+        tree.insert(val)
+    return tree, values
+
+
+@pytest.mark.parametrize(
+    "left_size,right_size", [(0, 0), (0, 50), (50, 0), (1, 300), (300, 1), (40, 60)]
+)
+def test_join(left_size: int, right_size: int):
+    left = AvlTree.from_sorted(range(left_size))
+    right = AvlTree.from_sorted(range(left_size + 1, left_size + 1 + right_size))
+    joined = AvlTree.join(left, left_size, right)
+    assert_avl(joined.root)
+    assert list(joined) == list(range(left_size + right_size + 1))
+    assert left.is_empty() and right.is_empty()
+
+
+def test_join_rejects_overlapping_trees():
+    with pytest.raises(ValueError):
+        AvlTree.join(AvlTree.from_sorted([1, 5]), 3, AvlTree())
+    with pytest.raises(ValueError):
+        AvlTree.join(AvlTree(), 3, AvlTree.from_sorted([2, 5]))
+
+
+@pytest.mark.parametrize("val", [-1, 0, 37, 38, 150, 299, 400])
+def test_split(val: int):
+    tree = AvlTree.from_sorted(range(0, 300, 2))
+    smaller, found, larger = tree.split(val)
+    assert tree.is_empty()
+    assert_avl(smaller.root)
+    assert_avl(larger.root)
+    assert found == (val % 2 == 0 and 0 <= val < 300)
+    assert list(smaller) == [v for v in range(0, 300, 2) if v < val]
+    assert list(larger) == [v for v in range(0, 300, 2) if v > val]
+
+
+@pytest.mark.parametrize("fraction", [0.0, float("inf")])
+@pytest.mark.parametrize("sizes", [(0, 30), (30, 0), (5, 500), (500, 5), (200, 200)])
+def test_set_operations(sizes: tuple[int, int], fraction: float, monkeypatch):
+    # 0 forces the join based algorithms, inf forces per-key operations
+    monkeypatch.setattr(AvlTree, "SET_OPERATION_FRACTION", fraction)
+    rng = random.Random(sum(sizes))
+    for operation, expected in (
+        ("union", set.union),
+        ("intersection", set.intersection),
+        ("difference", set.difference),
+    ):
+        first, first_values = random_tree(rng, sizes[0], 1000)
+        second, second_values = random_tree(rng, sizes[1], 1000)
+        result = getattr(first, operation)(second)
+        assert_avl(result.root)
+        assert list(result) == sorted(expected(first_values, second_values))
+        assert first.is_empty() and second.is_empty()
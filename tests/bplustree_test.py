@@ -0,0 +1,96 @@
+import random
+
+import pytest
+from bplustree import BPlusTree
+
+
+def test_empty():
+    tree = BPlusTree()
+    assert tree.is_empty() and len(tree) == 0
+    assert not tree.search(1)
+    tree.delete(1)
+    assert (
+        list(tree) == []
+        and list(reversed(tree)) == []
+        and list(tree.irange(0, 10)) == []
+    )
+    assert tree.check_invariants() == 0
+
+
+@pytest.mark.parametrize("order", [4, 5, 8, 64])
+@pytest.mark.parametrize("seed", range(3))
+def test_random_operations_match_set(order: int, seed: int):
+    rng = random.Random(seed)
+    tree = BPlusTree(order)
+    expected = set()
+    for step in range(3000):
+        val = rng.randrange(500)
+        if rng.random() < 0.55:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+        assert tree.search(val) == (val in expected)
+        if step % 100 == 0:
+            tree.check_invariants()
+    tree.check_invariants()
+    assert list(tree) == sorted(expected) and len(tree) == len(expected)
+    assert list(reversed(tree)) == sorted(expected, reverse=True)
+
+
+@pytest.mark.parametrize("order", [4, 5, 64])
+def test_insert_and_delete_everything(order: int):
+    tree = BPlusTree(order)
+    for val in range(1000):
+        tree.insert(val)
+    assert tree.check_invariants() >= 1
+    for val in range(0, 1000, 2):
+        tree.delete(val)
+    tree.check_invariants()
+    for val in reversed(range(1, 1000, 2)):
+        tree.delete(val)
+    assert tree.is_empty() and tree.check_invariants() == 0
+
+
+@pytest.mark.parametrize("n", [0, 1, 4, 5, 17, 64, 65, 1000, 5000])
+@pytest.mark.parametrize("order", [4, 7, 64])
+def test_from_sorted(n: int, order: int):
+    tree = BPlusTree.from_sorted((x // 2 for x in range(2 * n)), order)
+    tree.check_invariants()
+    assert list(tree) == list(range(n)) and len(tree) == n
+    tree.insert(n)
+    tree.delete(0)
+    tree.check_invariants()
+
+
+def test_from_sorted_rejects_unsorted_and_bad_orders():
+    with pytest.raises(ValueError):
+        BPlusTree.from_sorted([1, 3, 2])
+    with pytest.raises(ValueError):
+        BPlusTree(3)
+    assert list(BPlusTree.from_iterable([5, 3, 9, 3, 1], 4)) == [1, 3, 5, 9]
+
+
+def test_irange():
+    values = list(range(0, 300, 3))
+    tree = BPlusTree.from_sorted(values, 4)
+    for lo, hi in [
+        (None, None),
+        (10, 100),
+        (9, 99),
+        (-5, 5),
+        (297, 400),
+        (50, 40),
+        (None, 30),
+        (30, None),
+    ]:
+        for inclusive in [(True, True), (False, False), (True, False), (False, True)]:
+            expected = [
+                v
+                for v in values
+                if (lo is None or (lo <= v if inclusive[0] else lo < v))
+                and (hi is None or (v <= hi if inclusive[1] else v < hi))
+            ]
+            assert list(tree.irange(lo, hi, inclusive)) == expected
+            assert list(tree.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+from avltree import AvlTree
+from rbtree import RedBlackTree
+
+VALUES = list(range(0, 100, 3))
+
+
+def make_trees() -> list:
+    rb = RedBlackTree()
+    for val in random.Random(1).sample(VALUES, len(VALUES)):
+        rb.insert(val)
+    return [AvlTree.from_sorted(VALUES), rb]
+
+
+@pytest.mark.parametrize("tree", make_trees())
+def test_iteration(tree):
+    assert list(tree) == VALUES
+    assert list(reversed(tree)) == VALUES[::-1]
+
+
+def test_iteration_of_empty_trees():
+    assert list(AvlTree()) == []
+    assert list(reversed(RedBlackTree())) == []
+
+
+@pytest.mark.parametrize("tree", make_trees())
+@pytest.mark.parametrize(
+    "inclusive", [(True, True), (True, False), (False, True), (False, False)]
+)
+@pytest.mark.parametrize(
+    "lo,hi",
+    [(None, None), (9, 30), (10, 29), (None, 50), (50, None), (200, 300), (30, 9)],
+)
+def test_irange(tree, inclusive, lo, hi):
+    def inside(val):
+        above = lo is None or lo < val or (inclusive[0] and val == lo)
+        below = hi is None or val < hi or (inclusive[1] and val == hi)
+        return above and below
+
+    expected = [val for val in VALUES if inside(val)]
+    assert list(tree.irange(lo, hi, inclusive)) == expected
+    assert list(tree.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
+
+
+@pytest.mark.parametrize("tree", make_trees())
+def test_cursor_steps_both_ways(tree):
+    cursor = tree.cursor()
+    assert not cursor.valid
+    assert cursor.seek(10)
+    assert cursor.value == 12
+    assert cursor.prev() and cursor.value == 9
+    assert cursor.next() and cursor.next() and cursor.value == 15
+    assert cursor.seek(12) and cursor.value == 12
+    assert not cursor.seek(100)
+    with pytest.raises(IndexError):
+        cursor.value
+    assert cursor.seek_last() and cursor.value == 99
+    assert not cursor.next()
+    assert not cursor.prev()
+    assert cursor.seek_first() and cursor.value == 0
+    assert not cursor.prev()
+
+
+@pytest.mark.parametrize("tree", make_trees())
+def test_cursor_pages(tree):
+    cursor = tree.cursor()
+    cursor.seek_first()
+    pages = []
+    while cursor.valid:
+        page = []
+        while cursor.valid and len(page) < 5:
+            page.append(cursor.value)
+            cursor.next()
+        pages.append(page)
+    assert sum(pages, []) == VALUES
+    cursor.seek(50)
+    assert list(cursor) == [val for val in VALUES if val >= 50]
+
+
+@pytest.mark.parametrize("tree", make_trees())
+def test_cursor_walks_backwards(tree):
+    cursor = tree.cursor()
+    cursor.seek_last()
+    seen = []
+    while cursor.valid:
+        seen.append(cursor.value)
+        cursor.prev()
+    assert seen == VALUES[::-1]
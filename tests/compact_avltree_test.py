@@ -0,0 +1,65 @@
+import random
+from compact_avltree import NIL, CompactAvlTree
+
+
+def assert_avl(tree: CompactAvlTree, index: int) -> int:
+    """Checks heights, balance and ordering of a subtree and returns its height"""
+    if index == NIL:
+        return 0
+    left, right = tree.left[index], tree.right[index]
+    left_height = assert_avl(tree, left)
+    right_height = assert_avl(tree, right)
+    if left != NIL:
+        assert tree.keys[left] < tree.keys[index]
+    if right != NIL:
+        assert tree.keys[right] > tree.keys[index]
+    assert abs(left_height - right_height) <= 1
+    assert tree.height[index] == 1 + max(left_height, right_height)
+    return tree.height[index]
+
+
+def test_empty():
+    tree = CompactAvlTree()
+    assert tree.is_empty()
+    assert not tree.search(1)
+    tree.delete(1)
+    assert tree.is_empty()
+
+
+def test_ascending_inserts_stay_balanced():
+    tree = CompactAvlTree()
+    for i in range(1000):
+        tree.insert(i)
+    assert assert_avl(tree, tree.root) <= 11
+    assert len(tree) == 1000
+    assert all(tree.search(i) for i in range(1000))
+    assert not tree.search(1000)
+
+
+def test_random_operations_match_set():
+    rng = random.Random(7)
+    tree = CompactAvlTree()
+    expected = set()
+    for _ in range(5000):
+        val = rng.randrange(500)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+    assert_avl(tree, tree.root)
+    assert len(tree) == len(expected)
+    assert all(tree.search(val) == (val in expected) for val in range(500))
+
+
+def test_deleted_slots_are_reused():
+    tree = CompactAvlTree()
+    for i in range(100):
+        tree.insert(i)
+    for i in range(50):
+        tree.delete(i)
+    for i in range(100, 150):
+        tree.insert(i)
+    assert len(tree.keys) == 100
+    assert_avl(tree, tree.root)
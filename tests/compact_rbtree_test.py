@@ -0,0 +1,87 @@
+import random
+from compact_rbtree import BLACK, NIL, RED, CompactRedBlackTree
+
+
+def assert_rb(tree: CompactRedBlackTree, index: int) -> int:
+    """Checks parent links, colors and ordering of a subtree and returns its black height"""
+    if index == NIL:
+        return 1
+    left, right = tree.left[index], tree.right[index]
+    for child in (left, right):
+        if child != NIL:
+            assert tree.parent[child] == index
+            assert not (tree.color[index] == RED and tree.color[child] == RED)
+    if left != NIL:
+        assert tree.keys[left] < tree.keys[index]
+    if right != NIL:
+        assert tree.keys[right] > tree.keys[index]
+    black_height = assert_rb(tree, left)
+    assert black_height == assert_rb(tree, right)
+    return black_height + (1 if tree.color[index] == BLACK else 0)
+
+
+def assert_valid(tree: CompactRedBlackTree) -> None:
+    if tree.root != NIL:
+        assert tree.color[tree.root] == BLACK and tree.parent[tree.root] == NIL
+    assert_rb(tree, tree.root)
+
+
+def test_empty():
+    tree = CompactRedBlackTree()
+    assert tree.is_empty()
+    assert not tree.search(1)
+    tree.delete(1)
+    assert tree.is_empty()
+
+
+def test_ascending_inserts_stay_balanced():
+    tree = CompactRedBlackTree()
+    for i in range(1000):
+        tree.insert(i)
+    assert_valid(tree)
+    assert len(tree) == 1000
+    assert all(tree.search(i) for i in range(1000))
+    assert not tree.search(1000)
+
+
+def test_random_operations_match_set():
+    rng = random.Random(7)
+    tree = CompactRedBlackTree()
+    expected = set()
+    for _ in range(5000):
+        val = rng.randrange(500)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+        if rng.random() < 0.05:
+            assert_valid(tree)
+    assert_valid(tree)
+    assert len(tree) == len(expected)
+    assert all(tree.search(val) == (val in expected) for val in range(500))
+
+
+def test_delete_everything():
+    tree = CompactRedBlackTree()
+    vals = list(range(200))
+    random.Random(3).shuffle(vals)
+    for val in vals:
+        tree.insert(val)
+    for val in vals:
+        tree.delete(val)
+        assert_valid(tree)
+    assert tree.is_empty() and len(tree) == 0
+
+
+def test_deleted_slots_are_reused():
+    tree = CompactRedBlackTree()
+    for i in range(100):
+        tree.insert(i)
+    for i in range(50):
+        tree.delete(i)
+    for i in range(100, 150):
+        tree.insert(i)
+    assert len(tree.keys) == 100
+    assert_valid(tree)
@@ -0,0 +1,204 @@
+import random
+import threading
+
+import pytest
+from avltree import AvlTree
+from concurrent_tree import (
+    ConcurrentAvlTree,
+    ConcurrentRedBlackTree,
+    ConcurrentTree,
+    RWLock,
+    StripedConcurrentTree,
+)
+from rbtree import RedBlackTree
+
+
+def test_rwlock_lets_readers_share_and_writers_exclude():
+    lock = RWLock()
+    both_reading = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.read():
+            both_reading.wait()
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    assert not both_reading.broken
+
+    events = []
+    lock.acquire_write()
+    reader = threading.Thread(
+        target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read())
+    )
+    reader.start()
+    reader.join(0.05)
+    events.append("write done")
+    lock.release_write()
+    reader.join()
+    assert events == ["write done", "read"]
+
+
+def test_batches_keep_the_last_operation_per_value():
+    tree = ConcurrentAvlTree()
+    tree._pending = [(True, 1), (True, 2), (False, 1), (True, 3), (False, 3), (True, 3)]
+    tree._enqueued = len(tree._pending)
+    tree._combine(1, tree._enqueued)
+    assert list(tree) == [2, 3] and tree.batches == 1 and tree.batched_operations == 6
+    tree.insert(1)
+    tree.delete_many([2, 3])
+    tree.insert_many([5, 4])
+    assert list(tree) == [1, 4, 5] and len(tree) == 3
+    assert tree.contains_many([1, 2, 4]) == [True, False, True]
+
+
+@pytest.mark.parametrize(
+    "make_tree",
+    [
+        ConcurrentAvlTree,
+        ConcurrentRedBlackTree,
+        lambda: StripedConcurrentTree([1000, 2000, 3000]),
+        lambda: StripedConcurrentTree([1500], RedBlackTree),
+    ],
+)
+def test_stress(make_tree):
+    tree = make_tree()
+    writers, keys_per_writer = 4, 1000
+    done = threading.Event()
+    published = [set() for _ in range(writers)]
+    errors = []
+
+    def write(index: int):
+        rng = random.Random(index)
+        keys = list(range(index, writers * keys_per_writer, writers))
+        rng.shuffle(keys)
+        for key in keys:
+            tree.insert(key)
+            published[index].add(key)
+        for key in keys[::2]:
+            published[index].discard(key)
+            tree.delete(key)
+
+    def read(seed: int):
+        rng = random.Random(seed)
+        while not done.is_set():
+            index = rng.randrange(writers)
+            known = list(published[index])
+            for key in rng.sample(known, min(10, len(known))):
+                # A key is published after its insert returned and unpublished before its delete starts,
+                # so one that is published both before and after the search must be found
+                if (
+                    key in published[index]
+                    and not tree.search(key)
+                    and key in published[index]
+                ):
+                    errors.append(key)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    readers = [threading.Thread(target=read, args=(i,)) for i in range(3)]
+    for thread in threads + readers:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    expected = sorted(set().union(*published))
+    assert (
+        list(tree) == expected
+        and len(tree) == len(expected) == writers * keys_per_writer // 2
+    )
+    stripes = tree.stripes if isinstance(tree, StripedConcurrentTree) else [tree]
+    for stripe in stripes:
+        if isinstance(stripe.tree, RedBlackTree):
+            stripe.tree.check_invariants()
+
+
+def test_failed_operation_only_fails_its_writer():
+    tree = ConcurrentAvlTree()
+    tree._pending = [(True, 5), (True, "x"), (True, 7)]
+    tree._enqueued = 3
+    # The combiner's own operation went in, so it returns normally, and so does the third writer
+    tree._combine(1, 1)
+    assert list(tree) == [5, 7] and tree._applied == 3
+    with pytest.raises(TypeError):
+        tree._combine(2, 2)
+    tree._combine(3, 3)
+    assert not tree._errors
+    with pytest.raises(TypeError):
+        tree.insert_many([1, "y", 2])
+    assert list(tree) == [1, 2, 5, 7]
+
+
+class InterruptedOnceAvlTree(AvlTree):
+    interrupt = True
+
+    def insert_many(self, vals):
+        if self.interrupt:
+            self.interrupt = False
+            raise KeyboardInterrupt
+        super().insert_many(vals)
+
+
+def test_interrupted_batch_is_not_lost():
+    tree = ConcurrentTree(InterruptedOnceAvlTree.from_sorted([1, 2]))
+    tree._pending = [(False, 1), (True, 5), (True, 3)]
+    tree._enqueued = 3
+    with pytest.raises(KeyboardInterrupt):
+        tree._combine(1, 1)
+    assert tree._applied == 0 and tree._pending == [(False, 1), (True, 5), (True, 3)]
+    # The next writer applies the batch instead of finding nothing queued
+    tree._combine(2, 2)
+    assert list(tree) == [2, 3, 5] and tree._applied == 3 and not tree._pending
+
+
+def test_stress_with_a_writer_of_bad_values():
+    # Seeded with an int, so every string fails to compare
+    tree = ConcurrentAvlTree.from_sorted([-1])
+    writers, keys_per_writer = 4, 500
+    failures = []
+
+    def write(index: int):
+        for key in range(index, writers * keys_per_writer, writers):
+            tree.insert(key)
+
+    def write_bad_values():
+        for i in range(200):
+            try:
+                tree.insert(str(i))
+            except TypeError:
+                failures.append(i)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    threads.append(threading.Thread(target=write_bad_values))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(failures) == 200
+    assert list(tree) == list(range(-1, writers * keys_per_writer))
+    assert not tree._errors
+
+
+def test_striped_from_sorted():
+    values = list(range(0, 1000, 3))
+    tree = StripedConcurrentTree.from_sorted(values, stripes=4)
+    assert len(tree.stripes) == 4 and list(tree) == values
+    assert [len(stripe) for stripe in tree.stripes] == [83, 84, 83, 84]
+    assert 999 in tree and 998 not in tree
+    tree.insert(-5)
+    tree.insert(5000)
+    assert [len(stripe) for stripe in tree.stripes] == [84, 84, 83, 85]
+    assert list(tree) == [-5] + values + [5000]
+    assert list(StripedConcurrentTree.from_sorted([1, 1, 1, 2], stripes=3)) == [1, 2]
+    with pytest.raises(ValueError):
+        StripedConcurrentTree([2, 1])
+
+
+def test_concurrent_tree_wraps_a_given_tree():
+    tree = ConcurrentTree(RedBlackTree.from_sorted([1, 2, 3]))
+    tree.delete(2)
+    assert list(tree) == [1, 3] and 3 in tree
@@ -0,0 +1,103 @@
+import io
+import random
+from array import array
+
+import pytest
+from external_sort import _read_run, sort_file
+
+
+def write_numbers(path, dtype: str, values) -> None:
+    with open(path, "wb") as out:
+        array(dtype, values).tofile(out)
+
+
+def read_numbers(path, dtype: str) -> list:
+    numbers = array(dtype)
+    with open(path, "rb") as source:
+        numbers.frombytes(source.read())
+    return numbers.tolist()
+
+
+@pytest.mark.parametrize(
+    "dtype,memory_limit", [("q", 800), ("d", 8000), ("i", 10**6), ("B", 1)]
+)
+def test_sort_file(tmp_path, dtype: str, memory_limit: int):
+    rng = random.Random(0)
+    if dtype == "d":
+        values = [rng.uniform(-1, 1) for _ in range(3000)]
+    elif dtype == "B":
+        values = [rng.randrange(256) for _ in range(300)]
+    else:
+        values = [rng.randrange(-(2**31), 2**31) for _ in range(3000)]
+    write_numbers(tmp_path / "in.bin", dtype, values)
+    calls = []
+    stats = sort_file(
+        tmp_path / "in.bin",
+        tmp_path / "out.bin",
+        dtype,
+        memory_limit,
+        lambda *call: calls.append(call),
+    )
+    assert read_numbers(tmp_path / "out.bin", dtype) == sorted(values)
+    assert read_numbers(tmp_path / "in.bin", dtype) == values
+    itemsize = array(dtype).itemsize
+    assert stats.items == len(values)
+    assert stats.runs == -(
+        -len(values) * itemsize // (memory_limit // itemsize * itemsize)
+    )
+    assert set(stats.phase_seconds) == {"runs", "merge"}
+    assert calls[-1] == (
+        "runs" if stats.runs == 1 else "merge",
+        len(values) * itemsize,
+        len(values) * itemsize,
+    )
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["in.bin", "out.bin"]
+
+
+def test_sort_empty_file(tmp_path):
+    (tmp_path / "in.bin").write_bytes(b"")
+    stats = sort_file(tmp_path / "in.bin", tmp_path / "out.bin")
+    assert (stats.items, stats.runs) == (0, 0)
+    assert (tmp_path / "out.bin").read_bytes() == b""
+
+
+def test_sort_file_rejects_bad_arguments(tmp_path):
+    (tmp_path / "in.bin").write_bytes(b"\x00" * 12)
+    with pytest.raises(ValueError):
+        sort_file(tmp_path / "in.bin", tmp_path / "out.bin", "q")
+    with pytest.raises(ValueError):
+        sort_file(tmp_path / "in.bin", tmp_path / "out.bin", "u")
+    with pytest.raises(ValueError):
+        sort_file(tmp_path / "in.bin", tmp_path / "out.bin", "i", memory_limit=3)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["in.bin"]
+
+
+@pytest.mark.parametrize("memory_limit", [80, 10**6])
+def test_sorted_file_gets_the_default_mode(tmp_path, memory_limit: int):
+    write_numbers(tmp_path / "in.bin", "q", range(100, 0, -1))
+    (tmp_path / "default.bin").touch()
+    stats = sort_file(tmp_path / "in.bin", tmp_path / "out.bin", "q", memory_limit)
+    assert (stats.runs > 1) == (memory_limit == 80)
+    assert (tmp_path / "out.bin").stat().st_mode == (
+        tmp_path / "default.bin"
+    ).stat().st_mode
+
+
+class ShortReads(io.BytesIO):
+    """
+    A file whose reads return at most 3 bytes, like an unbuffered read may
+    """
+
+    def read(self, size: int = -1) -> bytes:
+        return super().read(min(size, 3))
+
+
+def test_read_run_completes_short_reads():
+    data = array("q", range(10)).tobytes()
+    assert list(_read_run(ShortReads(data), 16, 80, "q", 24)) == list(range(2, 10))
+
+
+def test_read_run_raises_on_a_truncated_file():
+    data = array("q", range(10)).tobytes()
+    with pytest.raises(EOFError):
+        list(_read_run(ShortReads(data[:-4]), 0, 80, "q", 24))
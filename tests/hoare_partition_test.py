@@ -1,4 +1,12 @@
-from hoare_partition import hoare_partition_var1, hoare_partition_var2
+import random
+
+import pytest
+from hoare_partition import (
+    dual_pivot_partition,
+    hoare_partition_var1,
+    hoare_partition_var2,
+    partition_3way,
+)
 
 
 def test_hoare_partition_var1():
@@ -142,3 +150,71 @@ def test_hoare_partition_var2_pivot_complex():
     assert nums[5] == 3  # pivot value was 3. But we are returning value 2 at index 2
     assert nums[:5] == [1, 2, -1, 2, 3]  # All values in [0..j] <= 3
     assert nums[6:] == [9, 4, 5]  # All values in [j..right] >= 3
+
+
+def random_ranges(count: int):
+    rng = random.Random(0)
+    for _ in range(count):
+        nums = [
+            rng.randrange(rng.choice([1, 2, 5, 1000]))
+            for _ in range(rng.randrange(1, 40))
+        ]
+        left = rng.randrange(len(nums))
+        right = rng.randrange(left, len(nums))
+        yield rng, nums, left, right
+
+
+def test_partition_3way_dups():
+    nums = [1] * 50
+    assert partition_3way(nums, 0, 49, 7) == (0, 49)
+    assert nums == [1] * 50
+
+
+def test_partition_3way_random():
+    for rng, nums, left, right in random_ranges(500):
+        original = list(nums)
+        pivot = nums[rng.randrange(left, right + 1)]
+        lt, gt = partition_3way(nums, left, right, nums.index(pivot, left, right + 1))
+        assert (
+            nums[:left] == original[:left]
+            and nums[right + 1 :] == original[right + 1 :]
+        )
+        assert sorted(nums) == sorted(original)
+        assert left <= lt <= gt <= right
+        assert all(value < pivot for value in nums[left:lt])
+        assert all(value == pivot for value in nums[lt : gt + 1])
+        assert all(value > pivot for value in nums[gt + 1 : right + 1])
+
+
+def test_dual_pivot_partition_random():
+    for rng, nums, left, right in random_ranges(500):
+        if left == right:
+            continue
+        original = list(nums)
+        pivot1_index, pivot2_index = rng.sample(range(left, right + 1), 2)
+        p, q = sorted((nums[pivot1_index], nums[pivot2_index]))
+        lt, gt = dual_pivot_partition(nums, left, right, pivot1_index, pivot2_index)
+        assert (
+            nums[:left] == original[:left]
+            and nums[right + 1 :] == original[right + 1 :]
+        )
+        assert sorted(nums) == sorted(original)
+        assert left <= lt < gt <= right
+        assert (nums[lt], nums[gt]) == (p, q)
+        assert all(value < p for value in nums[left:lt])
+        assert all(p <= value <= q for value in nums[lt + 1 : gt])
+        assert all(value > q for value in nums[gt + 1 : right + 1])
+
+
+def test_partition_bounds_validation():
+    nums = [3, 1, 2]
+    with pytest.raises(ValueError):
+        partition_3way(nums, 2, 1, 1)
+    with pytest.raises(ValueError):
+        partition_3way(nums, 0, 3, 1)
+    with pytest.raises(IndexError):
+        partition_3way(nums, 0, 1, 2)
+    with pytest.raises(IndexError):
+        dual_pivot_partition(nums, 0, 1, 0, 2)
+    with pytest.raises(ValueError):
+        dual_pivot_partition(nums, 0, 2, 1, 1)
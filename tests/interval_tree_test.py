@@ -0,0 +1,126 @@
+import random
+
+import pytest
+from interval_tree import IntervalTree, IntervalTreeNode
+
+
+def assert_interval_tree(node: IntervalTreeNode | None) -> int:
+    """Checks heights, balance, ordering and max_hi of a subtree and returns its height"""
+    if node is None:
+        return 0
+    left_height = assert_interval_tree(node.left)
+    right_height = assert_interval_tree(node.right)
+    if node.left:
+        assert node.left.val < node.val
+    if node.right:
+        assert node.right.val > node.val
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.max_hi == max(
+        [node.val[1]]
+        + [child.max_hi for child in (node.left, node.right) if child is not None]
+    )
+    return node.height
+
+
+def random_interval(rng: random.Random, space: int = 1000) -> tuple[int, int]:
+    lo = rng.randrange(space)
+    return lo, lo + rng.randrange(space // 10)
+
+
+def brute_force(intervals, lo, hi) -> list:
+    return sorted(val for val in intervals if val[0] <= hi and lo <= val[1])
+
+
+def test_empty():
+    tree = IntervalTree()
+    assert list(tree.overlapping(0, 10)) == [] and tree.stab(3) == []
+    assert tree.stab_many([1, 2]) == [[], []] and tree.stab_many([]) == []
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_operations_match_brute_force(seed: int):
+    rng = random.Random(seed)
+    tree = IntervalTree()
+    expected = set()
+    for step in range(2000):
+        val = random_interval(rng)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            # Deleting a present interval exercises the two children case much more than a random one would
+            if expected and rng.random() < 0.7:
+                val = rng.choice(sorted(expected))
+            tree.delete(val)
+            expected.discard(val)
+        if step % 50 == 0:
+            assert_interval_tree(tree.root)
+            lo = rng.randrange(1100)
+            hi = lo + rng.randrange(100)
+            assert list(tree.overlapping(lo, hi)) == brute_force(expected, lo, hi)
+    assert_interval_tree(tree.root)
+    assert list(tree) == sorted(expected) and len(tree) == len(expected)
+
+
+def test_overlapping_bounds_are_closed():
+    tree = IntervalTree.from_iterable([(1, 3), (3, 5), (6, 6), (7, 9), (0, 20)])
+    assert list(tree.overlapping(5, 6)) == [(0, 20), (3, 5), (6, 6)]
+    assert list(tree.overlapping(21, 30)) == []
+    assert tree.stab(3) == [(0, 20), (1, 3), (3, 5)]
+    assert tree.stab(-1) == []
+
+
+def test_stab_many_matches_stab():
+    rng = random.Random(7)
+    tree = IntervalTree.from_iterable(random_interval(rng) for _ in range(500))
+    points = [rng.randrange(-10, 1200) for _ in range(300)] + [5, 5]
+    assert tree.stab_many(points) == [tree.stab(point) for point in points]
+
+
+def test_rejects_invalid_intervals():
+    tree = IntervalTree.from_sorted([(1, 2), (4, 8)])
+    with pytest.raises(ValueError):
+        tree.insert((5, 4))
+    with pytest.raises(ValueError):
+        tree.insert((1, 2, 3))
+    with pytest.raises(ValueError):
+        tree.insert_many([(0, 1), (3, 2)])
+    assert list(tree) == [(1, 2), (4, 8)]
+    with pytest.raises(ValueError):
+        IntervalTree.from_sorted([(1, 2), (4, 3)])
+
+
+def test_bulk_operations_keep_max_hi():
+    rng = random.Random(3)
+    first = sorted({random_interval(rng) for _ in range(400)})
+    second = sorted({random_interval(rng) for _ in range(300)})
+    tree = IntervalTree.from_sorted(first)
+    assert_interval_tree(tree.root)
+    tree.insert_many(second)
+    assert_interval_tree(tree.root)
+    tree.delete_many(second[::2])
+    assert_interval_tree(tree.root)
+    expected = set(first) | set(second[1::2])
+    assert list(tree.overlapping(100, 200)) == brute_force(expected, 100, 200)
+
+    # The set operations reuse the nodes of both trees, so each one gets fresh copies
+    for operation, values in [
+        (IntervalTree.union, expected | set(second)),
+        (IntervalTree.intersection, expected & set(second)),
+        (IntervalTree.difference, expected - set(second)),
+    ]:
+        combined = operation(
+            IntervalTree.from_sorted(sorted(expected)), IntervalTree.from_sorted(second)
+        )
+        assert isinstance(combined, IntervalTree)
+        assert_interval_tree(combined.root)
+        assert list(combined.overlapping(300, 400)) == brute_force(values, 300, 400)
+
+    smaller, found, larger = IntervalTree.from_sorted(first).split(first[200])
+    assert found
+    assert_interval_tree(smaller.root)
+    assert_interval_tree(larger.root)
+    joined = IntervalTree.join(smaller, first[200], larger)
+    assert_interval_tree(joined.root)
+    assert list(joined) == first
@@ -0,0 +1,100 @@
+from array import array
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hoare_partition import hoare_partition_var1, hoare_partition_var2  # noqa: E402
+from numpy_backend import as_ndarray, block_partition  # noqa: E402
+from quickselect import multiselect, quantiles, top_k  # noqa: E402
+from quicksort import quicksort  # noqa: E402
+
+
+def test_as_ndarray_shares_memory():
+    nums = array("q", [3, 1, 2])
+    as_ndarray(nums)[0] = 7
+    assert nums[0] == 7
+    buffer = memoryview(array("d", [1.5, 0.5]))
+    as_ndarray(buffer).sort()
+    assert buffer.tolist() == [0.5, 1.5]
+    arr = np.arange(4)
+    assert as_ndarray(arr) is arr
+
+
+def test_as_ndarray_rejects_what_it_cannot_view():
+    assert as_ndarray([1, 2, 3]) is None
+    assert as_ndarray(memoryview(b"abc")) is None  # read only
+    assert as_ndarray(array("u", "abc")) is None
+    assert as_ndarray(np.array(["a", "b"])) is None
+    assert as_ndarray(np.zeros((2, 2))) is None
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 8, 64])
+@pytest.mark.parametrize("dtype", [np.int64, np.float64, np.uint8])
+def test_block_partition(block_size: int, dtype):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(1, 300))
+        arr = rng.integers(0, int(rng.choice([1, 3, 1000])), n).astype(dtype)
+        original = arr.copy()
+        left = int(rng.integers(0, n))
+        right = int(rng.integers(left, n))
+        pivot_index = int(rng.integers(left, right + 1))
+        pivot = arr[pivot_index]
+        j = block_partition(arr, left, right, pivot_index, block_size)
+        assert (arr[:left] == original[:left]).all() and (
+            arr[right + 1 :] == original[right + 1 :]
+        ).all()
+        assert (np.sort(arr) == np.sort(original)).all()
+        assert left <= j <= right and arr[j] == pivot
+        assert (arr[left:j] <= pivot).all() and (arr[j + 1 : right + 1] >= pivot).all()
+
+
+def test_block_partition_splits_duplicates_evenly():
+    arr = np.ones(100_000)
+    j = block_partition(arr, 0, len(arr) - 1, 0)
+    assert 40_000 < j < 60_000
+
+
+def test_hoare_partitions_of_buffers():
+    nums = array("d", [4.0, 5.0, 3.0, 7.0, 2.0])
+    assert hoare_partition_var2(nums, 0, 4, 2) == 1
+    assert nums[1] == 3.0
+    # var1 returns the same index for a buffer as for a list of the same values
+    nums = array("q", [4, 5, 3, 7, 2])
+    as_list = nums.tolist()
+    assert hoare_partition_var1(nums, 0, 4, 2) == hoare_partition_var1(as_list, 0, 4, 2)
+    assert nums.tolist() == as_list
+    with pytest.raises(IndexError):
+        hoare_partition_var2(nums, 0, 4, 5)
+
+
+def test_quicksort_and_select_in_place():
+    rng = np.random.default_rng(1)
+    arr = rng.random(10_000)
+    expected = np.sort(arr)
+    view = arr[:]
+    quicksort(view)
+    assert (arr == expected).all()
+    arr = rng.integers(0, 100, 10_000)
+    expected = np.sort(arr)
+    assert multiselect(arr, [0, 5000, 9999]) == [
+        expected[0],
+        expected[5000],
+        expected[9999],
+    ]
+    assert top_k(arr, 3) == list(expected[::-1][:3])
+
+
+def test_quantiles_of_an_ndarray():
+    assert quantiles(np.array([3.0, 1.0, 2.0]), [0.5]) == [2.0]
+    arr = np.random.default_rng(2).integers(0, 1000, 1001)
+    expected = np.sort(arr)
+    assert quantiles(arr, [0, 0.5, 0.99, 1]) == [
+        expected[0],
+        expected[500],
+        expected[990],
+        expected[1000],
+    ]
+    with pytest.raises(ValueError):
+        quantiles(np.array([]), [0.5])
@@ -0,0 +1,92 @@
+import random
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+import parallel_sort as parallel_sort_module
+from parallel_sort import (
+    _select_task,
+    _sort_task,
+    _split,
+    parallel_multiselect,
+    parallel_sort,
+)
+from quicksort import PARTITION_SCHEMES
+
+
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+def test_parallel_sort_list(partition: str):
+    rng = random.Random(0)
+    nums = [rng.randrange(-(10**12), 10**12) for _ in range(5000)]
+    expected = sorted(nums)
+    parallel_sort(nums, workers=2, cutoff=100, partition=partition)
+    assert nums == expected
+
+
+def test_parallel_sort_buffers_and_floats():
+    rng = random.Random(1)
+    floats = [rng.random() for _ in range(3000)]
+    parallel_sort(floats, workers=3, cutoff=100)
+    assert floats == sorted(floats)
+    assert all(type(value) is float for value in floats)
+    ints = array("i", [rng.randrange(-50, 50) for _ in range(3000)])
+    parallel_sort(ints, workers=2, cutoff=100)
+    assert list(ints) == sorted(ints)
+
+
+def test_parallel_sort_falls_back_for_values_that_cannot_be_shared():
+    words = ["pear", "fig", "apple"] * 100
+    parallel_sort(words, workers=2, cutoff=10)
+    assert words == sorted(words)
+    huge = [2**70, 1, 2**65] * 100
+    parallel_sort(huge, workers=2, cutoff=10)
+    assert huge == sorted(huge)
+    parallel_sort([], workers=2, cutoff=0)
+
+
+def test_parallel_sort_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        parallel_sort([2, 1], workers=0)
+    with pytest.raises(ValueError):
+        parallel_sort([2, 1], partition="lomuto")
+
+
+def test_split_keeps_ranges_with_ranks():
+    nums = list(range(1000))
+    random.Random(2).shuffle(nums)
+    ranges = _split(nums, [(0, 999, [10, 500, 501])], [10, 500, 501], 8, 20)
+    covered = sorted(k for _, _, ranks in ranges for k in ranks)
+    assert set(covered) <= {10, 500, 501}
+    for left, right, ranks in ranges:
+        assert all(left <= k <= right for k in ranks)
+        assert sorted(nums[left : right + 1]) == list(range(left, right + 1))
+
+
+def test_parallel_multiselect():
+    rng = random.Random(3)
+    nums = [rng.randrange(100) for _ in range(4000)]
+    expected = sorted(nums)
+    ks = list(range(0, 4000, 97)) + [3999]
+    assert parallel_multiselect(nums, ks, workers=2, cutoff=100) == [
+        expected[k] for k in ks
+    ]
+    assert sorted(nums) == expected
+    with pytest.raises(IndexError):
+        parallel_multiselect(nums, [4000], workers=2)
+
+
+def test_worker_tasks_raise_their_own_exception(monkeypatch):
+    shm = SharedMemory(create=True, size=8 * 10)
+    try:
+        with pytest.raises(IndexError):
+            _select_task(shm.name, "q", 0, 4, [7])
+
+        def failing_introsort(*args):
+            raise RuntimeError("sort failed")
+
+        monkeypatch.setattr(parallel_sort_module, "_introsort", failing_introsort)
+        with pytest.raises(RuntimeError, match="sort failed"):
+            _sort_task(shm.name, "q", 0, 9, "hoare")
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,124 @@
+import random
+import threading
+
+import bst
+import pytest
+from avltree import AvlTreeNode
+from persistent_avltree import PersistentAvlTree
+
+
+def assert_avl(node: AvlTreeNode | None) -> int:
+    """Checks heights, balance and ordering of a subtree and returns its height"""
+    if node is None:
+        return 0
+    left_height = assert_avl(node.left)
+    right_height = assert_avl(node.right)
+    if node.left:
+        assert node.left.val < node.val
+    if node.right:
+        assert node.right.val > node.val
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.size == 1 + (node.left.size if node.left else 0) + (
+        node.right.size if node.right else 0
+    )
+    return node.height
+
+
+def node_states(tree: PersistentAvlTree) -> list[tuple]:
+    return [
+        (id(node), node.val, id(node.left), id(node.right), node.height, node.size)
+        for node in bst.iter_nodes(tree.root)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_match_set(seed: int):
+    rng = random.Random(seed)
+    tree = PersistentAvlTree()
+    expected = set()
+    for _ in range(2000):
+        val = rng.randrange(300)
+        if rng.random() < 0.55:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+        assert tree.search(val) == (val in expected)
+    assert_avl(tree.root)
+    assert list(tree) == sorted(expected)
+    assert list(reversed(tree)) == sorted(expected, reverse=True)
+
+
+def test_snapshots_never_change():
+    rng = random.Random(0)
+    tree = PersistentAvlTree.from_sorted(range(0, 400, 2))
+    snapshots = []
+    for _ in range(300):
+        if rng.random() < 0.1:
+            snapshot = tree.snapshot()
+            snapshots.append((snapshot, list(snapshot), node_states(snapshot)))
+        val = rng.randrange(400)
+        if rng.random() < 0.5:
+            tree.insert(val)
+        else:
+            tree.delete(val)
+    assert len(snapshots) > 10
+    for snapshot, values, states in snapshots:
+        assert list(snapshot) == values and node_states(snapshot) == states
+        assert_avl(snapshot.root)
+
+
+def test_updates_copy_only_their_path():
+    tree = PersistentAvlTree.from_sorted(range(1023))
+    before = tree.snapshot()
+    old_nodes = {id(node) for node in bst.iter_nodes(before.root)}
+    tree.delete(500)
+    new_nodes = [
+        node for node in bst.iter_nodes(tree.root) if id(node) not in old_nodes
+    ]
+    assert len(new_nodes) <= tree.root.height + 2
+    tree.insert(500)
+    tree.insert(500)
+    tree.delete(2000)
+    assert list(tree) == list(before)
+
+
+def test_snapshots_fork():
+    tree = PersistentAvlTree.from_iterable([5, 1, 3])
+    fork = tree.snapshot()
+    fork.insert(4)
+    tree.delete(1)
+    assert list(tree) == [3, 5] and list(fork) == [1, 3, 4, 5]
+    assert fork.rank(4) == 2 and fork.select(0) == 1
+    assert list(fork.irange(2, 4)) == [3, 4]
+
+
+def test_readers_iterate_while_a_writer_updates():
+    tree = PersistentAvlTree.from_sorted(range(2000))
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            snapshot = tree.snapshot()
+            values = list(snapshot)
+            if values != sorted(set(values)) or len(values) != len(snapshot):
+                errors.append(values)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    rng = random.Random(1)
+    for _ in range(5000):
+        val = rng.randrange(4000)
+        if rng.random() < 0.5:
+            tree.insert(val)
+        else:
+            tree.delete(val)
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert_avl(tree.root)
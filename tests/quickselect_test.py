@@ -0,0 +1,107 @@
+import random
+
+import pytest
+from quickselect import (
+    _median_of_medians,
+    _select_in_range,
+    multiselect,
+    nth_element,
+    partial_sort,
+    quantiles,
+    select,
+    top_k,
+)
+from quicksort import PARTITION_SCHEMES
+
+
+def shapes() -> list[list[int]]:
+    rng = random.Random(0)
+    return [
+        [rng.randrange(1000) for _ in range(1000)],
+        list(range(500)),
+        list(range(500, 0, -1)),
+        [rng.randrange(3) for _ in range(700)],
+        [4] * 300,
+        [1],
+    ]
+
+
+@pytest.mark.parametrize("nums", shapes())
+def test_nth_element(nums: list[int]):
+    expected = sorted(nums)
+    for k in {0, len(nums) // 3, len(nums) - 1}:
+        copy = list(nums)
+        nth_element(copy, k)
+        assert copy[k] == expected[k]
+        assert all(value <= copy[k] for value in copy[:k])
+        assert all(value >= copy[k] for value in copy[k + 1 :])
+        assert sorted(copy) == expected
+
+
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+@pytest.mark.parametrize("nums", shapes())
+def test_multiselect(nums: list[int], partition: str):
+    expected = sorted(nums)
+    ks = [len(nums) - 1, 0, len(nums) // 2, len(nums) // 2, len(nums) // 7]
+    copy = list(nums)
+    assert multiselect(copy, ks, partition) == [expected[k] for k in ks]
+    assert sorted(copy) == expected
+
+
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+def test_top_k_and_partial_sort_with_partition(partition: str):
+    nums = [random.Random(6).randrange(4) for _ in range(300)]
+    assert top_k(list(nums), 50, partition) == sorted(nums, reverse=True)[:50]
+    partial_sort(nums, 40, partition)
+    assert nums[:40] == [0] * 40
+    with pytest.raises(ValueError):
+        select(nums, 0, "lomuto")
+
+
+def test_select_rejects_bad_rank():
+    with pytest.raises(IndexError):
+        select([1, 2, 3], 3)
+    with pytest.raises(IndexError):
+        select([], 0)
+
+
+def test_quantiles():
+    nums = list(range(101))
+    random.Random(1).shuffle(nums)
+    assert quantiles(nums, [0.5, 0.99, 0, 1]) == [50, 99, 0, 100]
+    with pytest.raises(ValueError):
+        quantiles(nums, [1.5])
+    with pytest.raises(ValueError):
+        quantiles([], [0.5])
+
+
+def test_partial_sort():
+    nums = list(range(200))
+    random.Random(2).shuffle(nums)
+    partial_sort(nums, 10)
+    assert nums[:10] == list(range(10))
+    assert sorted(nums) == list(range(200))
+    partial_sort(nums, 0)
+
+
+def test_top_k():
+    nums = list(range(200))
+    random.Random(3).shuffle(nums)
+    assert top_k(nums, 5) == [199, 198, 197, 196, 195]
+    assert top_k(nums, 0) == []
+    with pytest.raises(IndexError):
+        top_k(nums, 201)
+
+
+def test_median_of_medians_pivot_is_central():
+    nums = list(range(1000))
+    random.Random(4).shuffle(nums)
+    pivot = nums[_median_of_medians(nums, 0, len(nums) - 1)]
+    assert 300 <= pivot <= 700
+
+
+def test_select_in_range_with_median_of_medians_only():
+    nums = [random.Random(5).randrange(100) for _ in range(500)]
+    expected = sorted(nums)
+    _select_in_range(nums, 0, len(nums) - 1, 123)
+    assert nums[123] == expected[123]
@@ -0,0 +1,62 @@
+import random
+from array import array
+
+import pytest
+from quicksort import PARTITION_SCHEMES, _heapsort, _introsort, quicksort
+
+
+def inputs() -> dict[str, list[int]]:
+    rng = random.Random(0)
+    n = 2000
+    return {
+        "empty": [],
+        "single": [7],
+        "random": [rng.randrange(10**6) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "sawtooth": [i % 37 for i in range(n)],
+        "few_distinct": [rng.randrange(3) for _ in range(n)],
+        "all_equal": [5] * n,
+        "organ_pipe": list(range(n // 2)) + list(range(n // 2, 0, -1)),
+    }
+
+
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+@pytest.mark.parametrize("name,nums", list(inputs().items()))
+def test_quicksort(name: str, nums: list[int], partition: str):
+    expected = sorted(nums)
+    quicksort(nums, partition=partition)
+    assert nums == expected
+
+
+def test_quicksort_rejects_unknown_partition():
+    with pytest.raises(ValueError):
+        quicksort([2, 1], partition="lomuto")
+
+
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+def test_quicksort_with_key_is_stable(partition: str):
+    records = [(i % 5, i) for i in range(200)]
+    random.Random(1).shuffle(records)
+    expected = sorted(records, key=lambda record: record[0])
+    quicksort(records, key=lambda record: record[0], partition=partition)
+    assert records == expected
+
+
+def test_quicksort_array():
+    nums = array("q", [5, -3, 9, 0, 2] * 20)
+    quicksort(nums)
+    assert list(nums) == sorted([5, -3, 9, 0, 2] * 20)
+
+
+def test_depth_limit_falls_back_to_heapsort():
+    nums = [random.Random(2).randrange(100) for _ in range(500)]
+    expected = sorted(nums)
+    _introsort(nums, 0, len(nums) - 1, 0)
+    assert nums == expected
+
+
+def test_heapsort_subrange():
+    nums = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+    _heapsort(nums, 2, 6)
+    assert nums == [9, 8, 3, 4, 5, 6, 7, 2, 1]
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+from rbtree import RedBlackTree, RedBlackTreeColor, RedBlackTreeNode
+
+
+def in_order(node: RedBlackTreeNode | None) -> list:
+    if node is None:
+        return []
+    return in_order(node.left) + [node.val] + in_order(node.right)
+
+
+def test_empty():
+    tree = RedBlackTree()
+    assert tree.is_empty()
+    assert not tree.search(1)
+    tree.delete(1)
+    assert tree.check_invariants() == 1
+
+
+def test_right_rotate_at_root_updates_root():
+    tree = RedBlackTree()
+    for val in (3, 2, 1):
+        tree.insert(val)
+    assert tree.root.val == 2
+    assert tree.root.parent is None
+    tree.check_invariants()
+
+
+def test_ascending_inserts():
+    tree = RedBlackTree()
+    for i in range(1000):
+        tree.insert(i)
+        tree.check_invariants()
+    assert in_order(tree.root) == list(range(1000))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_random_operations_match_set(seed: int):
+    rng = random.Random(seed)
+    tree = RedBlackTree()
+    expected = set()
+    for _ in range(3000):
+        val = rng.randrange(300)
+        if rng.random() < 0.55:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+        tree.check_invariants()
+    assert in_order(tree.root) == sorted(expected)
+    assert all(tree.search(val) == (val in expected) for val in range(300))
+
+
+def test_delete_everything():
+    tree = RedBlackTree()
+    for i in range(100):
+        tree.insert(i)
+    for i in range(0, 100, 3):
+        tree.delete(i)
+    for i in range(100):
+        tree.delete(i)
+        tree.check_invariants()
+    assert tree.is_empty()
+
+
+def test_check_invariants_detects_violations():
+    tree = RedBlackTree()
+    for i in range(10):
+        tree.insert(i)
+    tree.root.color = RedBlackTreeColor.RED
+    with pytest.raises(AssertionError):
+        tree.check_invariants()
+
+
+def test_check_invariants_detects_values_out_of_order_below_a_child():
+    tree = RedBlackTree.from_sorted(range(7))
+    tree.check_invariants()
+    # 10 is greater than its parent 1, but it is in the left subtree of the root 3
+    tree.root.left.right.val = 10
+    with pytest.raises(AssertionError, match="not less than its ancestor 3"):
+        tree.check_invariants()
+
+
+def test_order_statistics():
+    rng = random.Random(3)
+    tree = RedBlackTree()
+    expected = set()
+    for _ in range(2000):
+        val = rng.randrange(400)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+    tree.check_invariants()
+    values = sorted(expected)
+    assert len(tree) == len(values)
+    assert [tree.select(k) for k in range(len(values))] == values
+    for val in range(-1, 402):
+        assert tree.rank(val) == sum(1 for v in values if v < val)
+    assert tree.count_range(100, 199) == sum(1 for v in values if 100 <= v <= 199)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 8, 100, 1023, 1024])
+def test_from_sorted_is_valid(n: int):
+    tree = RedBlackTree.from_sorted(x // 2 for x in range(2 * n))
+    tree.check_invariants()
+    assert in_order(tree.root) == list(range(n))
+    for val in range(0, n, 3):
+        tree.delete(val)
+    tree.insert(n)
+    tree.check_invariants()
+    with pytest.raises(ValueError):
+        RedBlackTree.from_sorted([1, 3, 2])
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+from avltree import AvlTree, AvlTreeNode
+from search_cache import CACHE_POLICIES, CachedAvlTree, ClockCache, LruCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LruCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b", "missing") == "missing"
+    assert cache.info() == (3, 1, 2, 2)
+
+
+def test_clock_gives_referenced_keys_a_second_chance():
+    cache = ClockCache(3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    cache.put("d", "D")  # a is referenced, b is not
+    assert "b" not in cache and all(key in cache for key in "acd")
+    # The hand clears c's bit and stops at a, whose bit it cleared for d
+    cache.put("e", "E")
+    assert "a" not in cache and all(key in cache for key in "cde")
+
+
+def test_clock_reuses_discarded_slots():
+    cache = ClockCache(2)
+    cache.put(1, True)
+    cache.put(2, False)
+    cache.discard(1)
+    cache.discard(7)
+    cache.put(3, True)
+    assert 2 in cache and 3 in cache and len(cache) == 2
+    cache.put(3, False)
+    assert cache.get(3) is False
+    cache.clear()
+    assert len(cache) == 0 and cache.info().hits == 1
+
+
+@pytest.mark.parametrize("cache_type", [LruCache, ClockCache])
+def test_caches_reject_empty_capacity(cache_type: type):
+    with pytest.raises(ValueError):
+        cache_type(0)
+
+
+@pytest.mark.parametrize("policy", CACHE_POLICIES)
+def test_cached_tree_matches_avl_tree(policy: str):
+    rng = random.Random(0)
+    cached = CachedAvlTree(capacity=16, policy=policy)
+    plain = AvlTree()
+    for _ in range(5000):
+        val = rng.randrange(60)
+        operation = rng.random()
+        if operation < 0.2:
+            cached.insert(val)
+            plain.insert(val)
+        elif operation < 0.4:
+            cached.delete(val)
+            plain.delete(val)
+        else:
+            assert cached.search(val) == plain.search(val)
+    assert list(cached) == list(plain)
+    info = cached.cache_info()
+    assert info.hits > 0 and info.misses > 0 and info.size <= 16
+
+
+def test_cached_tree_forgets_missing_values_on_insert():
+    tree = CachedAvlTree.from_sorted(range(10))
+    assert not tree.search(20)
+    tree.insert(20)
+    assert tree.search(20)
+    tree.delete(20)
+    assert not tree.search(20)
+
+
+def test_cached_tree_clears_when_the_root_is_replaced():
+    tree = CachedAvlTree.from_sorted(range(100))
+    assert tree.search(5) and not tree.search(500)
+    tree.insert_many(range(400, 600))
+    assert len(tree.cache) == 0 and tree.search(500)
+    smaller, found, larger = tree.split(50)
+    assert found and not tree.search(5) and smaller.search(5)
+    other = CachedAvlTree.from_sorted(range(3))
+    assert other.search(2)
+    union = smaller.union(other)
+    assert not other.search(2) and union.search(2)
+    assert tree.cache_info().hits == 0
+
+
+def test_cached_tree_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        CachedAvlTree(policy="fifo")
+
+
+def test_cached_tree_inserts_nodes_of_its_node_type():
+    class TaggedNode(AvlTreeNode):
+        __slots__ = ()
+
+    class TaggedCachedAvlTree(CachedAvlTree):
+        _node_type = TaggedNode
+
+    tree = TaggedCachedAvlTree.from_sorted([1, 3])
+    tree.insert(2)
+    assert list(tree) == [1, 2, 3]
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        assert type(node) is TaggedNode
+        stack.extend(node.children())
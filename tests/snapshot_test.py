@@ -0,0 +1,146 @@
+import gc
+import random
+import struct
+import sys
+from array import array
+
+import pytest
+from avltree import AvlTree
+from rbtree import RedBlackTree
+from snapshot import _HEADER, paused_gc, read_snapshot, write_snapshot
+
+
+@pytest.mark.parametrize("tree_type", [AvlTree, RedBlackTree])
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [5],
+        list(range(-1000, 1000, 3)),
+        [0.5 * i for i in range(500)],
+        [2**70, 2**80],
+        [f"key{i:04}" for i in range(5000)],
+        [(1, "a"), (1, "b"), (2, "a")],
+    ],
+)
+def test_save_and_load_round_trip(tmp_path, tree_type: type, values: list):
+    path = tmp_path / "tree.bin"
+    tree = tree_type.from_iterable(values)
+    tree.save(path)
+    loaded = tree_type.load(path)
+    assert type(loaded) is tree_type and list(loaded) == list(tree)
+    assert [type(val) for val in loaded] == [type(val) for val in tree]
+    if tree_type is RedBlackTree:
+        loaded.check_invariants()
+    else:
+        assert loaded.root is None or loaded.root.height <= len(values).bit_length()
+
+
+def test_numeric_snapshots_are_raw_arrays(tmp_path):
+    path = tmp_path / "tree.bin"
+    AvlTree.from_sorted([1, 2, 3]).save(path)
+    data = path.read_bytes()
+    assert data[:4] == b"DSZT" and data[5:6] == b"q"
+    assert data[_HEADER.size :] == array("q", [1, 2, 3]).tobytes()
+    AvlTree.from_sorted([1.5, 2.5]).save(path)
+    assert path.read_bytes()[5:6] == b"d"
+    AvlTree.from_sorted([False, True]).save(path)
+    assert path.read_bytes()[5:6] == b"O"
+
+
+def test_snapshots_move_between_tree_types(tmp_path):
+    path = tmp_path / "tree.bin"
+    rng = random.Random(0)
+    values = rng.sample(range(10**6), 3000)
+    AvlTree.from_iterable(values).save(path)
+    tree = RedBlackTree.load(path)
+    tree.check_invariants()
+    for val in values[:100]:
+        tree.delete(val)
+    tree.check_invariants()
+    assert len(tree) == 2900
+
+
+def test_load_reads_the_other_byte_order(tmp_path):
+    path = tmp_path / "tree.bin"
+    other = 1 if sys.byteorder == "little" else 0
+    payload = array("q", [1, 2, 300])
+    payload.byteswap()
+    path.write_bytes(_HEADER.pack(b"DSZT", 1, b"q", other, 3) + payload.tobytes())
+    assert list(AvlTree.load(path)) == [1, 2, 300]
+
+
+def test_load_rejects_broken_files(tmp_path):
+    path = tmp_path / "tree.bin"
+    path.write_bytes(b"DSZ")
+    with pytest.raises(ValueError, match="too short"):
+        AvlTree.load(path)
+    path.write_bytes(b"\0" * 16)
+    with pytest.raises(ValueError, match="not a snapshot"):
+        AvlTree.load(path)
+    path.write_bytes(_HEADER.pack(b"DSZT", 99, b"q", 0, 0))
+    with pytest.raises(ValueError, match="version 99"):
+        AvlTree.load(path)
+    path.write_bytes(_HEADER.pack(b"DSZT", 0, b"q", 0, 0))
+    with pytest.raises(ValueError, match="version 0"):
+        AvlTree.load(path)
+    path.write_bytes(_HEADER.pack(b"DSZT", 1, b"q", 2, 0))
+    with pytest.raises(ValueError, match="not a snapshot"):
+        AvlTree.load(path)
+    AvlTree.from_sorted(range(10)).save(path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="should hold 10 values"):
+        RedBlackTree.load(path)
+    AvlTree.from_iterable(str(i) for i in range(10_000)).save(path)
+    path.write_bytes(path.read_bytes()[: _HEADER.size + 100])
+    with pytest.raises(ValueError):
+        AvlTree.load(path)
+
+
+def test_load_rejects_unsorted_values(tmp_path):
+    path = tmp_path / "tree.bin"
+    write_snapshot(path, [3, 1, 2])
+    with pytest.raises(ValueError, match="ascending"):
+        AvlTree.load(path)
+    # The memory map was closed when the failed load dropped the generator, so the file can be replaced
+    write_snapshot(path, [1, 2, 3])
+    values = read_snapshot(path)
+    assert next(values) == 1
+    values.close()
+    assert struct.unpack("<q", path.read_bytes()[-8:]) == (3,)
+
+
+def test_failed_save_keeps_the_old_snapshot(tmp_path):
+    path = tmp_path / "tree.bin"
+    write_snapshot(path, [1, 2])
+
+    def broken():
+        yield 3
+        raise RuntimeError("disk on fire")
+
+    with pytest.raises(RuntimeError):
+        write_snapshot(path, broken())
+    assert list(read_snapshot(path)) == [1, 2]
+    assert [file.name for file in tmp_path.iterdir()] == ["tree.bin"]
+
+
+def test_paused_gc_restores_the_collector():
+    assert gc.isenabled()
+    with paused_gc():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        with paused_gc():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_saved_snapshot_gets_the_default_mode(tmp_path):
+    (tmp_path / "default.bin").touch()
+    AvlTree.from_sorted(range(10)).save(tmp_path / "tree.bin")
+    assert (tmp_path / "tree.bin").stat().st_mode == (
+        tmp_path / "default.bin"
+    ).stat().st_mode
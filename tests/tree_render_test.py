@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+from avltree import AvlTree
+from rbtree import RedBlackTree
+from tree_render import render_dot, render_text
+
+
+def test_render_text():
+    tree = AvlTree.from_sorted([1, 3, 4, 5, 8])
+    assert list(render_text(tree.root)) == [
+        "4\n",
+        "├── L: 3\n",
+        "│   └── L: 1\n",
+        "└── R: 8\n",
+        "    └── L: 5\n",
+    ]
+
+
+def test_render_text_empty():
+    assert list(render_text(None)) == ["Empty-Tree\n"]
+
+
+def test_render_dot():
+    tree = AvlTree.from_sorted([1, 2, 3])
+    lines = list(render_dot(tree.root))
+    assert lines[0] == "digraph Tree {\n"
+    assert lines[-1] == "}\n"
+    assert '    n0 [label="2"];\n' in lines
+    assert "    n0 -> n1;\n" in lines
+    assert "    n0 -> n2;\n" in lines
+
+
+def test_render_dot_colors_red_black_nodes():
+    tree = RedBlackTree()
+    for val in (1, 2, 3):
+        tree.insert(val)
+    dot = "".join(render_dot(tree.root))
+    assert "fillcolor=black" in dot
+    assert "fillcolor=red" in dot
+
+
+def test_pretty_printer_is_imported_lazily():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    code = (
+        "import sys, avltree, rbtree\n"
+        "avltree.AvlTree(); rbtree.RedBlackTree()\n"
+        "assert 'PrettyPrint' not in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={**os.environ, "PYTHONPATH": src},
+    )
+
+
+def test_str_shares_one_pretty_printer():
+    first = AvlTree.from_sorted([1, 2, 3])
+    second = AvlTree.from_sorted([4])
+    assert "2" in str(first)
+    assert "4" in str(second)
+    assert first.pretty_printer is second.pretty_printer
+    assert str(AvlTree()) == "Empty-Tree"
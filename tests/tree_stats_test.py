@@ -0,0 +1,188 @@
+import random
+
+import bst
+import pytest
+from avltree import AvlTree
+from rbtree import RedBlackTree, RedBlackTreeNode
+from search_cache import CachedAvlTree
+from tree_stats import instrument, uninstrument
+from treemap import RedBlackMap
+
+
+@pytest.mark.parametrize("tree_type", [AvlTree, RedBlackTree])
+def test_instrument_counts_and_restores(tree_type: type):
+    tree = tree_type()
+    calls = []
+    stats = instrument(tree, lambda name, val, ns: calls.append((name, val)))
+    assert type(tree) is not tree_type and isinstance(tree, tree_type)
+    for val in range(100):
+        tree.insert(val)
+    tree.delete(50)
+    assert tree.search(7) and not tree.search(50)
+    assert stats.operations == {"insert": 100, "delete": 1, "search": 2}
+    assert len(calls) == 103 and calls[-1] == ("search", 50)
+    assert stats.single_rotations > 0
+    assert stats.nodes_visited == sum(
+        depth * count for depth, count in stats.depth_histogram.items()
+    )
+    assert stats.comparisons >= stats.nodes_visited
+    assert sum(stats.size_histogram.values()) == 103
+    assert uninstrument(tree) is stats
+    assert type(tree) is tree_type and not hasattr(tree, "_stats")
+    assert list(tree) == [val for val in range(100) if val != 50]
+    tree.insert(1000)
+    assert stats.operations["insert"] == 100
+    assert uninstrument(tree) is None
+
+
+def test_avl_single_and_double_rotations():
+    tree = AvlTree()
+    stats = instrument(tree)
+    for val in (1, 2, 3):
+        tree.insert(val)
+    assert (stats.single_rotations, stats.double_rotations) == (1, 0)
+    for val in (10, 5):
+        tree.insert(val)
+    assert (stats.single_rotations, stats.double_rotations) == (1, 1)
+    assert stats.height_histogram == {1: 1, 2: 2, 3: 2}
+
+
+def test_comparisons_of_a_search():
+    tree = AvlTree.from_sorted([1, 2, 3])
+    stats = instrument(tree)
+    tree.search(3)  # 2 != 3, 2 < 3, 3 == 3
+    assert (stats.comparisons, stats.nodes_visited) == (3, 2)
+    # As above, plus 3 < 4 at the end of the path and the side the leaf goes on
+    tree.insert(4)
+    assert (stats.comparisons, stats.nodes_visited) == (3 + 5, 2 + 2)
+    # 2 == 2 at the root, the walk down to its replacement compares nothing
+    tree.delete(2)
+    assert (stats.comparisons, stats.nodes_visited) == (8 + 1, 4 + 1)
+
+
+class _CountedKey:
+    """
+    An int that counts the comparisons made with it
+    """
+
+    comparisons = 0
+
+    def __init__(self, val: int):
+        self.val = val
+
+    def __eq__(self, other):
+        if not isinstance(other, _CountedKey):
+            return NotImplemented
+        _CountedKey.comparisons += 1
+        return self.val == other.val
+
+    def __lt__(self, other):
+        if not isinstance(other, _CountedKey):
+            return NotImplemented
+        _CountedKey.comparisons += 1
+        return self.val < other.val
+
+    def __hash__(self):
+        return hash(self.val)
+
+
+@pytest.mark.parametrize("tree_type", [AvlTree, RedBlackTree])
+def test_comparisons_are_the_ones_the_operations_make(tree_type: type):
+    rng = random.Random(1)
+    tree = tree_type.from_sorted(_CountedKey(val) for val in range(0, 200, 2))
+    stats = instrument(tree)
+    _CountedKey.comparisons = 0
+    for _ in range(300):
+        key = _CountedKey(rng.randrange(200))
+        rng.choice([tree.search, tree.insert, tree.delete])(key)
+    assert stats.comparisons == _CountedKey.comparisons
+    assert all(type(node.val) is _CountedKey for node in bst.iter_nodes(tree.root))
+
+
+def test_red_black_recolorings():
+    tree = RedBlackTree()
+    for val in range(20):
+        tree.insert(val)
+    stats = instrument(tree)
+    for val in range(20, 200):
+        tree.insert(val)
+    for val in random.Random(0).sample(range(200), 100):
+        tree.delete(val)
+    assert stats.recolorings > 0
+    tree.check_invariants()
+    uninstrument(tree)
+    assert all(type(node) is RedBlackTreeNode for node in bst.iter_nodes(tree.root))
+    tree.check_invariants()
+
+
+def test_instrument_map_tree_keeps_node_types():
+    tree_map = RedBlackMap()
+    for key in range(50):
+        tree_map[key] = str(key)
+    stats = instrument(tree_map._tree)
+    for key in range(50, 80):
+        tree_map[key] = str(key)
+    assert stats.recolorings > 0
+    uninstrument(tree_map._tree)
+    assert tree_map[79] == "79" and len(tree_map) == 80
+
+
+def test_trees_built_by_an_instrumented_tree_are_instrumented():
+    tree = AvlTree.from_sorted(range(100))
+    stats = instrument(tree)
+    smaller, found, larger = tree.split(50)
+    assert found
+    for part in (smaller, larger):
+        part.insert(1000)
+        part.delete(0)
+        assert part._stats is not stats and part._stats.operations == {
+            "insert": 1,
+            "delete": 1,
+        }
+    assert stats.operations == {}
+
+    for operation, expected in [
+        (AvlTree.union, set(range(0, 100, 2)) | set(range(0, 100, 3))),
+        (AvlTree.intersection, set(range(0, 100, 2)) & set(range(0, 100, 3))),
+        (AvlTree.difference, set(range(0, 100, 2)) - set(range(0, 100, 3))),
+    ]:
+        first = AvlTree.from_sorted(range(0, 100, 2))
+        instrument(first)
+        result = operation(first, AvlTree.from_sorted(range(0, 100, 3)))
+        result.insert(-1)
+        assert result.search(-1) and result._stats.operations == {
+            "insert": 1,
+            "search": 1,
+        }
+        assert list(result) == sorted(expected | {-1})
+        uninstrument(result)
+        assert type(result) is AvlTree
+
+
+def test_instrumented_red_black_from_sorted_counts_into_its_own_stats():
+    tree = RedBlackTree()
+    stats = instrument(tree)
+    built = type(tree).from_sorted(range(50))
+    for val in range(50, 100):
+        built.insert(val)
+    assert built._stats.recolorings > 0 and stats.recolorings == 0
+    built.check_invariants()
+    uninstrument(built)
+    assert all(type(node) is RedBlackTreeNode for node in bst.iter_nodes(built.root))
+
+
+@pytest.mark.parametrize("policy", ["clock", "lru"])
+def test_instrumented_cached_tree_caches_values(policy: str):
+    tree = CachedAvlTree(policy=policy)
+    tree.insert_many(range(10))
+    cache = tree.cache
+    stats = instrument(tree)
+    assert tree.search(3) and tree.search(3) and not tree.search(20) and tree.search(9)
+    # The second search of 3 is a cache hit, it compares nothing
+    assert stats.depth_histogram[0] == 1 and tree.cache_info().hits == 1
+    tree.delete(9)
+    assert 9 not in tree.cache and len(tree.cache) == 2
+    assert uninstrument(tree) is stats and tree.cache is cache
+    keys = cache._slots if policy == "clock" else cache._entries
+    assert sorted(keys) == [3, 20] and all(type(key) is int for key in keys)
+    assert tree.search(3) and tree.cache_info().hits == 2
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+from treemap import AvlMap, RedBlackMap
+
+MAP_TYPES = [AvlMap, RedBlackMap]
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_get_set_delete(map_type):
+    tree_map = map_type()
+    tree_map["b"] = 2
+    tree_map["a"] = 1
+    tree_map["c"] = 3
+    tree_map["b"] = 20
+    assert len(tree_map) == 3
+    assert tree_map["b"] == 20
+    assert "a" in tree_map and "z" not in tree_map
+    assert tree_map.get("z") is None
+    assert tree_map.get("z", 0) == 0
+    with pytest.raises(KeyError):
+        tree_map["z"]
+    del tree_map["a"]
+    with pytest.raises(KeyError):
+        del tree_map["a"]
+    assert list(tree_map.items()) == [("b", 20), ("c", 3)]
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_pop_and_setdefault(map_type):
+    tree_map = map_type()
+    assert tree_map.setdefault(1, "one") == "one"
+    assert tree_map.setdefault(1, "uno") == "one"
+    assert tree_map.pop(1) == "one"
+    assert tree_map.pop(1, None) is None
+    with pytest.raises(KeyError):
+        tree_map.pop(1)
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_random_operations_match_dict(map_type):
+    rng = random.Random(5)
+    tree_map = map_type()
+    expected = {}
+    for i in range(3000):
+        key = rng.randrange(200)
+        if rng.random() < 0.6:
+            tree_map[key] = i
+            expected[key] = i
+        else:
+            assert tree_map.pop(key, None) == expected.pop(key, None)
+    assert list(tree_map.items()) == sorted(expected.items())
+    assert list(tree_map.values()) == [expected[key] for key in sorted(expected)]
+    assert list(reversed(tree_map)) == sorted(expected, reverse=True)
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_key_function_is_called_once_per_insert(map_type):
+    calls = []
+
+    def key(record):
+        calls.append(record)
+        return record[0]
+
+    tree_map = map_type(key=key)
+    for record in [(3, "c"), (1, "a"), (2, "b")]:
+        tree_map[record] = record[1]
+    assert len(calls) == 3
+    assert list(tree_map) == [(1, "a"), (2, "b"), (3, "c")]
+    assert tree_map[(2, "anything")] == "b"
+    assert list(tree_map.irange((2,), (3,))) == [(2, "b"), (3, "c")]
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_setting_an_existing_key_keeps_the_stored_key(map_type):
+    tree_map = map_type(key=str.lower)
+    tree_map["A"] = 1
+    tree_map["a"] = 2
+    assert list(tree_map.items()) == [("A", 2)]
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_neighbour_lookups(map_type):
+    tree_map = map_type()
+    for key in range(0, 50, 10):
+        tree_map[key] = str(key)
+    assert tree_map.floor(25) == (20, "20")
+    assert tree_map.floor(20) == (20, "20")
+    assert tree_map.floor(-1) is None
+    assert tree_map.ceiling(25) == (30, "30")
+    assert tree_map.ceiling(41) is None
+    assert tree_map.predecessor(20) == (10, "10")
+    assert tree_map.predecessor(0) is None
+    assert tree_map.successor(20) == (30, "30")
+    assert tree_map.successor(40) is None
+    assert repr(map_type()) == f"{map_type.__name__}({{}})"